@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User
+from .models import User, Skill
+from .skills import sync_user_skills
 
 
 @admin.register(User)
@@ -29,6 +30,11 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if 'skills' in form.changed_data:
+            sync_user_skills(obj)
+
     add_fieldsets = (
         (None, {
             'classes': ('wide',),
@@ -38,3 +44,10 @@ class UserAdmin(BaseUserAdmin):
             ),
         }),
     )
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'created_at')
+    search_fields = ('name', 'slug')
+    readonly_fields = ('id', 'created_at')
@@ -0,0 +1,109 @@
+'''
+JWT authentication that trusts the user snapshot in the token.
+
+Most requests only need the user's id and role (permission classes,
+ownership filters), so SnapshotJWTAuthentication returns a SnapshotUser
+built from the token claims and the full User row is only loaded when a
+view reads any other field.
+'''
+from django.db.models import Model
+from django.utils.functional import SimpleLazyObject, empty
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .models import User
+from .tokens import ACTIVE_CLAIM, ROLE_CLAIM, VERSION_CLAIM, token_version
+
+
+def _snapshot_field(name):
+    def get(self):
+        if self._wrapped is empty:
+            return self.__dict__['_snapshot'][name]
+        return getattr(self._wrapped, name)
+    return property(get)
+
+
+class SnapshotUser(SimpleLazyObject):
+    '''
+    A User that answers `pk`, `id`, `role` and `is_active` from the token and
+    loads the row on first access to anything else. It passes isinstance
+    checks and can be used in ORM filters (`freelancer=request.user`)
+    without being loaded.
+    '''
+    is_authenticated = True
+    is_anonymous = False
+    _meta = User._meta
+
+    pk = _snapshot_field('pk')
+    id = _snapshot_field('pk')
+    role = _snapshot_field('role')
+    is_active = _snapshot_field('is_active')
+
+    def __init__(self, user_id, role, is_active):
+        user_id = User._meta.pk.to_python(user_id)
+        super().__init__(lambda: User.objects.get(pk=user_id))
+        self.__dict__['_snapshot'] = {'pk': user_id, 'role': role, 'is_active': is_active}
+
+    @property
+    def __class__(self):
+        return User
+
+    @property
+    def is_loaded(self):
+        return self._wrapped is not empty
+
+    def __getattr__(self, name):
+        # Probes for attributes a User never has (e.g. the ORM's
+        # hasattr(value, 'resolve_expression')) should not load the row
+        if self._wrapped is empty and name != '_state' and not hasattr(User, name):
+            raise AttributeError(name)
+        return super().__getattr__(name)
+
+    # Used by the ORM when the user is a lookup value
+    def _is_pk_set(self, meta=None):
+        return True
+
+    def _get_pk_val(self, meta=None):
+        return self.pk
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if isinstance(other, Model):
+            return other._meta.concrete_model is User and other.pk == self.pk
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+class SnapshotJWTAuthentication(JWTAuthentication):
+    '''
+    JWTAuthentication that skips the user lookup for tokens carrying a user
+    snapshot (UserRefreshToken). Tokens without one are authenticated the
+    usual way.
+    '''
+
+    def get_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        if token_version(user_id) != validated_token[VERSION_CLAIM]:
+            raise AuthenticationFailed(_('Token has been revoked'), code='token_revoked')
+        if not validated_token.get(ACTIVE_CLAIM):
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        return SnapshotUser(user_id, validated_token[ROLE_CLAIM], validated_token[ACTIVE_CLAIM])
+
+
+class SnapshotJWTScheme(SimpleJWTScheme):
+    '''Documents SnapshotJWTAuthentication as the usual Bearer JWT scheme.'''
+    target_class = 'accounts.authentication.SnapshotJWTAuthentication'
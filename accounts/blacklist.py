@@ -0,0 +1,166 @@
+'''
+In-memory pre-check for the refresh token blacklist.
+
+With ROTATE_REFRESH_TOKENS and BLACKLIST_AFTER_ROTATION every refresh and
+logout validates the token against BlacklistedToken. Almost no presented
+token is blacklisted, so a per-process Bloom filter of the blacklisted jtis
+answers "definitely not blacklisted" without a query; only possible matches
+(the blacklisted ones plus about TOKEN_BLACKLIST_FILTER_ERROR_RATE of the
+rest) fall through to the database check.
+
+The filter is built from the unexpired blacklisted tokens on first use and
+kept current incrementally: blacklisting a token bumps a version key in
+the cache, and a process that sees a new version (or has not synced for
+TOKEN_BLACKLIST_SYNC_INTERVAL seconds) adds the recently blacklisted jtis.
+The version key only reaches other processes through a shared cache, so
+with a per-process cache (LocMem, the default) the filter is not used and
+every check goes to the database: otherwise a token blacklisted by one
+worker would still be accepted by the others until their next sync.
+'''
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from freelance_arena.utils import cache_is_shared
+
+VERSION_KEY = 'accounts:token-blacklist:version'
+
+# Rows committed this long before a sync are re-read, so a blacklisting that
+# commits after a later one is not missed
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class BloomFilter:
+    '''Fixed-size Bloom filter of strings.'''
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        step = int.from_bytes(digest[8:], 'big') | 1
+        return [(first + i * step) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        '''Add `item`; returns False if it (or a collision) was already present.'''
+        added = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                added = True
+        self.count += added
+        return added
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position // 8] & (1 << position % 8)
+            for position in self._positions(item)
+        )
+
+
+class TokenBlacklistFilter:
+    '''Process-wide Bloom filter of blacklisted refresh token jtis.'''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._version = None
+        self._synced_at = None
+        self._next_sync = 0.0
+
+    def might_be_blacklisted(self, jti):
+        '''False only if `jti` is certainly not blacklisted.'''
+        if not cache_is_shared():
+            return True
+        with self._lock:
+            self._sync()
+            return jti in self._bloom
+
+    def add(self, jti):
+        '''
+        Record a newly blacklisted jti here at once, and in other processes
+        once the blacklisting commits.
+        '''
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+        transaction.on_commit(bump_blacklist_version)
+
+    def _sync(self):
+        version = cache.get(VERSION_KEY)
+        if self._bloom is None:
+            self._rebuild(settings.TOKEN_BLACKLIST_FILTER_CAPACITY)
+        elif self._bloom.count > self._bloom.capacity:
+            # Too full for its error rate: start over at twice the size
+            self._rebuild(self._bloom.capacity * 2)
+        elif version != self._version or time.monotonic() >= self._next_sync:
+            self._load(since=self._synced_at - SYNC_OVERLAP)
+        else:
+            return
+        self._version = version
+        self._next_sync = time.monotonic() + settings.TOKEN_BLACKLIST_SYNC_INTERVAL
+
+    def _rebuild(self, capacity):
+        self._bloom = BloomFilter(capacity, settings.TOKEN_BLACKLIST_FILTER_ERROR_RATE)
+        self._load()
+
+    def _load(self, since=None):
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+        synced_at = timezone.now()
+        # Expired tokens fail validation anyway, so they are left out
+        rows = BlacklistedToken.objects.filter(token__expires_at__gt=synced_at)
+        if since is not None:
+            rows = rows.filter(blacklisted_at__gte=since)
+        for jti in rows.values_list('token__jti', flat=True).iterator(chunk_size=5000):
+            self._bloom.add(jti)
+        self._synced_at = synced_at
+
+
+def prune_expired_tokens(batch_size=1000, max_runtime=None, now=None):
+    """
+    Delete expired OutstandingToken rows (and, by cascade, their
+    BlacklistedToken rows) `batch_size` at a time, oldest first, each batch
+    in its own short transaction. Stops starting new batches after
+    `max_runtime` seconds. Returns the number of tokens deleted.
+    """
+    from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+    now = now or timezone.now()
+    started = time.monotonic()
+    deleted = 0
+    while max_runtime is None or time.monotonic() - started < max_runtime:
+        # expires_at is not indexed; expired tokens are the oldest, so walking
+        # the primary key finds them first
+        batch_ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=now)
+            .order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch_ids:
+            break
+        with transaction.atomic():
+            OutstandingToken.objects.filter(pk__in=batch_ids).delete()
+        deleted += len(batch_ids)
+    return deleted
+
+
+def bump_blacklist_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+blacklist_filter = TokenBlacklistFilter()
@@ -0,0 +1,40 @@
+'''
+Password hashers whose cost comes from settings.
+
+They keep the algorithm names of Django's own hashers, so existing hashes
+still verify. When the configured cost (or PASSWORD_HASHER) changes,
+Django's `must_update` check rehashes a user's password with the new
+parameters the next time they log in.
+'''
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    '''Requires argon2-cffi.'''
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    '''Requires bcrypt.'''
+
+    @property
+    def rounds(self):
+        return settings.PASSWORD_BCRYPT_ROUNDS
@@ -0,0 +1,119 @@
+'''
+Buffered `User.last_seen` writes.
+
+Requests only record a touch in memory; a daemon thread writes the
+buffered times every LAST_SEEN_FLUSH_INTERVAL seconds with one
+`UPDATE ... SET last_seen = CASE id WHEN ...` per batch. A user is touched
+at most once per LAST_SEEN_INTERVAL, so `last_seen` stays within that
+interval (plus one flush) of the user's latest request. Touches still
+buffered when the process exits are lost, which only makes `last_seen`
+that much older.
+
+The buffer is per process. Set LAST_SEEN_SYNC_WRITES to write each touch
+synchronously instead (as the tests do); a failed write is then logged and
+retried with the next touch, never raised into the request.
+'''
+import logging
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+
+logger = logging.getLogger('freelance_arena')
+
+
+class LastSeenBuffer:
+    '''Coalesces last_seen touches per user until the next flush.'''
+
+    def __init__(self, batch_size=500):
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending = {}
+        # Times already written, kept for LAST_SEEN_INTERVAL to debounce touches
+        self._written = {}
+        self._thread = None
+
+    def touch(self, user_id, last_seen=None, now=None):
+        '''
+        Record that `user_id` was seen at `now`. `last_seen` is the value the
+        caller already has, if any; touches within LAST_SEEN_INTERVAL of the
+        latest known time are dropped.
+        '''
+        now = now or timezone.now()
+        interval = timedelta(seconds=settings.LAST_SEEN_INTERVAL)
+        with self._lock:
+            known = [t for t in (last_seen, self._pending.get(user_id), self._written.get(user_id)) if t]
+            if known and now - max(known) <= interval:
+                return False
+            self._pending[user_id] = now
+
+        if settings.LAST_SEEN_SYNC_WRITES:
+            try:
+                self.flush()
+            except Exception:
+                # The response is already built; the touch stays pending
+                logger.exception('Failed to write last_seen updates')
+        else:
+            self._ensure_flusher()
+        return True
+
+    def flush(self):
+        '''Write every pending touch. Returns the number of users updated.'''
+        from .models import User
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        items = list(pending.items())
+        try:
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start:start + self.batch_size]
+                User.objects.filter(pk__in=[user_id for user_id, _ in batch]).update(
+                    last_seen=Case(
+                        *(When(pk=user_id, then=Value(seen)) for user_id, seen in batch),
+                        output_field=DateTimeField(),
+                    )
+                )
+        except Exception:
+            # Put the touches back (unless newer ones arrived) for the next flush
+            with self._lock:
+                for user_id, seen in pending.items():
+                    self._pending.setdefault(user_id, seen)
+            raise
+
+        cutoff = timezone.now() - timedelta(seconds=settings.LAST_SEEN_INTERVAL)
+        with self._lock:
+            self._written.update(pending)
+            self._written = {
+                user_id: seen for user_id, seen in self._written.items() if seen > cutoff
+            }
+        return len(items)
+
+    def _ensure_flusher(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='last-seen-flusher', daemon=True,
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(settings.LAST_SEEN_FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Failed to flush last_seen updates')
+            finally:
+                # This thread outlives requests, so it manages its own connection
+                close_old_connections()
+
+
+last_seen_buffer = LastSeenBuffer()
@@ -0,0 +1,125 @@
+import math
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from accounts.hashers import Argon2PasswordHasher, BCryptSHA256PasswordHasher, PBKDF2PasswordHasher
+
+PASSWORD = 'benchmark-password-123'
+
+HASHERS = {
+    'argon2': Argon2PasswordHasher,
+    'bcrypt': BCryptSHA256PasswordHasher,
+    'pbkdf2': PBKDF2PasswordHasher,
+}
+
+COST_OPTIONS = {
+    'pbkdf2_iterations': 'PASSWORD_PBKDF2_ITERATIONS',
+    'argon2_time_cost': 'PASSWORD_ARGON2_TIME_COST',
+    'argon2_memory_cost': 'PASSWORD_ARGON2_MEMORY_COST',
+    'argon2_parallelism': 'PASSWORD_ARGON2_PARALLELISM',
+    'bcrypt_rounds': 'PASSWORD_BCRYPT_ROUNDS',
+}
+
+
+def _verify_for(hasher_class, encoded, duration):
+    '''Verify `encoded` repeatedly for `duration` seconds; returns the count.'''
+    hasher = hasher_class()
+    deadline = time.perf_counter() + duration
+    count = 0
+    while time.perf_counter() < deadline:
+        hasher.verify(PASSWORD, encoded)
+        count += 1
+    return count
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure password checks (the CPU cost of a login) per second per core '
+        'for the configured hasher, or another algorithm and cost.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hasher', choices=sorted(HASHERS), default=None,
+            help='Algorithm to measure (default: the configured PASSWORD_HASHERS[0]).',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Parallel worker processes (default: one per CPU).',
+        )
+        parser.add_argument(
+            '--duration', type=float, default=5.0,
+            help='Seconds each worker spends verifying (default: 5).',
+        )
+        parser.add_argument(
+            '--samples', type=int, default=20,
+            help='Single-process checks timed for the latency figures (default: 20).',
+        )
+        parser.add_argument(
+            '--target-rate', type=float, default=None,
+            help='Logins per second to size for; prints the cores needed.',
+        )
+        for option, setting in COST_OPTIONS.items():
+            parser.add_argument(
+                '--' + option.replace('_', '-'), type=int, default=None, dest=option,
+                help=f'Override {setting}.',
+            )
+
+    def handle(self, *args, **options):
+        overrides = {
+            setting: options[option]
+            for option, setting in COST_OPTIONS.items()
+            if options[option] is not None
+        }
+        with override_settings(**overrides):
+            hasher = HASHERS[options['hasher']]() if options['hasher'] else get_hasher()
+            try:
+                encoded = hasher.encode(PASSWORD, hasher.salt())
+            except ValueError as exc:
+                # Argon2 and bcrypt need their libraries installed
+                raise CommandError(str(exc))
+
+        params = {
+            key: value for key, value in hasher.safe_summary(encoded).items()
+            if key not in ('algorithm', 'salt', 'hash', 'checksum')
+        }
+        self.stdout.write(
+            f'Hasher: {hasher.algorithm} ('
+            + ', '.join(f'{key}={value}' for key, value in params.items()) + ')'
+        )
+
+        timings = []
+        for _ in range(max(1, options['samples'])):
+            started = time.perf_counter()
+            hasher.verify(PASSWORD, encoded)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, math.ceil(len(timings) * 0.95) - 1)]
+        self.stdout.write(
+            f'Single check: mean {statistics.mean(timings):.1f} ms, '
+            f'p50 {statistics.median(timings):.1f} ms, p95 {p95:.1f} ms'
+        )
+
+        workers = max(1, options['workers'])
+        duration = options['duration']
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = list(pool.map(
+                _verify_for, [type(hasher)] * workers, [encoded] * workers, [duration] * workers,
+            ))
+        rate = sum(counts) / duration
+        per_core = rate / min(workers, os.cpu_count() or workers)
+        self.stdout.write(self.style.SUCCESS(
+            f'{workers} worker(s) on {os.cpu_count()} CPU(s): '
+            f'{rate:.1f} logins/s total, {per_core:.1f} logins/s per core'
+        ))
+        if options['target_rate'] and per_core:
+            self.stdout.write(
+                f'Cores needed for {options["target_rate"]:g} logins/s: '
+                f'{math.ceil(options["target_rate"] / per_core)}'
+            )
+        if hasher.algorithm != get_hasher().algorithm:
+            self.stdout.write('Note: this is not the hasher new passwords currently use.')
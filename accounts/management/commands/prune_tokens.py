@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from accounts.blacklist import prune_expired_tokens
+
+
+class Command(BaseCommand):
+    help = 'Delete expired outstanding (and blacklisted) refresh tokens in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Tokens deleted per transaction (default: 1000).',
+        )
+        parser.add_argument(
+            '--max-runtime', type=float, default=None,
+            help='Stop starting new batches after this many seconds.',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report how many tokens would be deleted without changing anything.',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = OutstandingToken.objects.filter(expires_at__lte=timezone.now()).count()
+            self.stdout.write(f'{count} expired token(s) would be deleted.')
+            return
+
+        count = prune_expired_tokens(
+            batch_size=max(1, options['batch_size']),
+            max_runtime=options['max_runtime'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Deleted {count} expired token(s).'))
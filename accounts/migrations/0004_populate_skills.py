@@ -0,0 +1,64 @@
+from django.db import migrations
+from django.utils.text import slugify
+
+
+# Frozen copy of parse_skills() as it was when this migration was written;
+# importing the live one would let later changes alter this backfill
+def parse_skills(text, max_length=50):
+    skills = {}
+    for raw in (text or "").split(","):
+        name = " ".join(raw.split())[:max_length]
+        slug = slugify(name)[:max_length]
+        if slug and slug not in skills:
+            skills[slug] = name
+    return skills
+
+
+def populate_skills(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    Skill = apps.get_model("accounts", "Skill")
+    UserSkill = apps.get_model("accounts", "UserSkill")
+
+    parsed = {
+        user_id: parse_skills(skills)
+        for user_id, skills in User.objects.exclude(skills__isnull=True)
+        .exclude(skills="")
+        .values_list("id", "skills")
+        .iterator()
+    }
+    names = {}
+    for skills in parsed.values():
+        for slug, name in skills.items():
+            names.setdefault(slug, name)
+
+    Skill.objects.bulk_create(
+        [Skill(slug=slug, name=name) for slug, name in names.items()],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    skill_ids = dict(Skill.objects.values_list("slug", "id"))
+    UserSkill.objects.bulk_create(
+        [
+            UserSkill(user_id=user_id, skill_id=skill_ids[slug])
+            for user_id, skills in parsed.items()
+            for slug in skills
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+def clear_skills(apps, schema_editor):
+    apps.get_model("accounts", "UserSkill").objects.all().delete()
+    apps.get_model("accounts", "Skill").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_skills"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_skills, clear_skills),
+    ]
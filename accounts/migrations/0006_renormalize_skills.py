@@ -0,0 +1,81 @@
+# Generated by Django 5.2.11 on 2026-10-18 11:14
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+# Frozen copies of normalize_label() and parse_comma_separated() as they
+# were when this migration was written; importing the live ones would let
+# later changes alter this rebuild
+def normalize_label(text):
+    text = "".join(
+        char
+        for char in unicodedata.normalize("NFKC", text)
+        if not unicodedata.category(char).startswith("C") or char.isspace()
+    )
+    return " ".join(text.split()).casefold()
+
+
+def parse_skills(text, max_length=50):
+    labels = {}
+    for raw in (text or "").split(","):
+        if not raw.strip():
+            continue
+        slug = normalize_label(raw)[:max_length]
+        if slug and slug not in labels:
+            labels[slug] = " ".join(raw.split())[:max_length]
+    return labels
+
+
+# Slugs keep punctuation and non-ASCII letters now; rebuild the skills from the text
+def rebuild_skills(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    Skill = apps.get_model("accounts", "Skill")
+    UserSkill = apps.get_model("accounts", "UserSkill")
+
+    UserSkill.objects.all().delete()
+    Skill.objects.all().delete()
+    parsed = {
+        user_id: parse_skills(skills)
+        for user_id, skills in User.objects.exclude(skills__isnull=True)
+        .exclude(skills="")
+        .values_list("id", "skills")
+        .iterator()
+    }
+    names = {}
+    for skills in parsed.values():
+        for slug, name in skills.items():
+            names.setdefault(slug, name)
+
+    Skill.objects.bulk_create(
+        [Skill(slug=slug, name=name) for slug, name in names.items()],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    skill_ids = dict(Skill.objects.values_list("slug", "id"))
+    UserSkill.objects.bulk_create(
+        [
+            UserSkill(user_id=user_id, skill_id=skill_ids[slug])
+            for user_id, skills in parsed.items()
+            for slug in skills
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_user_token_version"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="skill",
+            name="slug",
+            field=models.CharField(max_length=50, unique=True),
+        ),
+        migrations.RunPython(rebuild_skills, migrations.RunPython.noop),
+    ]
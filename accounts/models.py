@@ -60,6 +60,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     date_joined = models.DateTimeField(auto_now_add=True)
     last_seen = models.DateTimeField(null=True, blank=True)
     email_verified = models.BooleanField(default=False)
+    # Embedded in JWTs; bumped on deactivation or role change to revoke them
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     objects = UserManager()
 
@@ -69,6 +71,10 @@ class User(AbstractBaseUser, PermissionsMixin):
     class Meta:
         db_table = 'accounts_user'
         ordering = ['-date_joined']
+        indexes = [
+            # Admin user list, newest first (keyset pagination on date_joined, id)
+            models.Index(fields=['-date_joined', '-id'], name='user_date_joined_idx'),
+        ]
 
     def __str__(self):
         return f'{self.username} ({self.email})'
@@ -76,3 +82,63 @@ class User(AbstractBaseUser, PermissionsMixin):
     @property
     def full_name(self):
         return f'{self.first_name} {self.last_name}'.strip()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._token_claims = instance.token_claims_state()
+        return instance
+
+    def token_claims_state(self):
+        '''The fields copied into JWT claims, as last loaded or saved.'''
+        return (self.__dict__.get('role'), self.__dict__.get('is_active'))
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, '_token_claims', None)
+        revoke = loaded is not None and loaded != self.token_claims_state()
+        if revoke:
+            # Tokens issued with the old role or active flag stop validating
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self._token_claims = self.token_claims_state()
+        if revoke:
+            from .tokens import forget_token_version
+            forget_token_version(self.pk)
+
+
+class Skill(models.Model):
+    '''Normalized skill, identified by its slug (the normalize_label() form of its name).'''
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=50)
+    slug = models.CharField(max_length=50, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'accounts_skill'
+        ordering = ['slug']
+
+    def __str__(self):
+        return self.name
+
+
+class UserSkill(models.Model):
+    '''Link between a user and a skill, parsed from User.skills.'''
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='user_links')
+
+    class Meta:
+        db_table = 'accounts_userskill'
+        unique_together = ('user', 'skill')
+        indexes = [
+            # Inverted index: skill -> users
+            models.Index(fields=['skill', 'user'], name='userskill_skill_user_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id} has {self.skill_id}'
@@ -1,7 +1,11 @@
 from django.contrib.auth import authenticate
+from django.db import transaction
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from .models import User
+from .skills import parse_skills, sync_user_skills
+from .tokens import VERSION_CLAIM, UserRefreshToken, token_version
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -74,7 +78,18 @@ class UserLoginSerializer(serializers.Serializer):
         return data
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class SkillIndexMixin:
+    """Keep the user's UserSkill rows in step with `skills` on update."""
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            user = super().update(instance, validated_data)
+            if 'skills' in validated_data:
+                sync_user_skills(user)
+        return user
+
+
+class UserProfileSerializer(SkillIndexMixin, serializers.ModelSerializer):
     """Serializer for user profile view and update."""
 
     full_name = serializers.ReadOnlyField()
@@ -104,6 +119,10 @@ class UserProfileSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError(
                     'Skills must be a comma-separated list with no empty entries.'
                 )
+            try:
+                parse_skills(value, strict=True)
+            except ValueError as exc:
+                raise serializers.ValidationError(str(exc))
         return value
 
 
@@ -128,7 +147,40 @@ class ChangePasswordSerializer(serializers.Serializer):
         return data
 
 
-class AdminUserSerializer(serializers.ModelSerializer):
+class TokenRefreshSerializer(serializers.Serializer):
+    """
+    Exchange a refresh token for a new access token (and, with rotation, a
+    new refresh token). Revocation is checked against the cached
+    token_version instead of loading the user. Raises TokenError for an
+    invalid, expired or blacklisted token.
+    """
+
+    refresh = serializers.CharField()
+
+    def validate(self, attrs):
+        refresh = UserRefreshToken(attrs['refresh'])
+        user_id = refresh.payload.get(jwt_settings.USER_ID_CLAIM)
+        if VERSION_CLAIM in refresh.payload:
+            valid = token_version(user_id) == refresh[VERSION_CLAIM]
+        else:
+            # Issued before tokens carried a version
+            valid = User.objects.filter(pk=user_id, is_active=True).exists()
+        if not valid:
+            raise AuthenticationFailed('Token has been revoked.', 'token_revoked')
+
+        data = {'access': str(refresh.access_token)}
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+        return data
+
+
+class AdminUserSerializer(SkillIndexMixin, serializers.ModelSerializer):
     """Full user serializer for admin use."""
 
     full_name = serializers.ReadOnlyField()
@@ -148,10 +200,15 @@ class FreelancerSearchSerializer(serializers.ModelSerializer):
     """Lightweight serializer for freelancer search results."""
 
     full_name = serializers.ReadOnlyField()
+    matched_skills = serializers.SerializerMethodField()
 
     class Meta:
         model = User
         fields = [
             'id', 'username', 'first_name', 'last_name', 'full_name',
-            'bio', 'profile_picture', 'skills', 'hourly_rate',
+            'bio', 'profile_picture', 'skills', 'hourly_rate', 'matched_skills',
         ]
+
+    def get_matched_skills(self, obj):
+        # Only set when searching by skills
+        return getattr(obj, 'matched_skills', None)
@@ -0,0 +1,102 @@
+'''
+Normalized freelancer skills and ranked skill search.
+
+`User.skills` stays the comma-separated text users edit; serializer writes
+parse it into Skill/UserSkill rows so searches are served from the
+(skill, user) index instead of scanning every profile with LIKE.
+'''
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F
+from freelance_arena.utils import cache_is_shared, parse_comma_separated
+
+SEARCH_VERSION_KEY = 'accounts:freelancer-search:version'
+
+
+def parse_skills(text, strict=False):
+    '''
+    Return {slug: name} for a comma-separated skills string, in input order.
+    With `strict`, a skill that normalizes to nothing raises ValueError.
+    '''
+    return parse_comma_separated(text, strict=strict)
+
+
+def sync_user_skills(user):
+    '''Make the user's UserSkill rows match their `skills` text.'''
+    from .models import Skill, UserSkill
+
+    wanted = parse_skills(user.skills)
+    current = dict(
+        UserSkill.objects.filter(user=user).values_list('skill__slug', 'pk')
+    )
+    removed = [pk for slug, pk in current.items() if slug not in wanted]
+    added = [slug for slug in wanted if slug not in current]
+    if not removed and not added:
+        return False
+
+    if removed:
+        UserSkill.objects.filter(pk__in=removed).delete()
+    if added:
+        Skill.objects.bulk_create(
+            [Skill(slug=slug, name=wanted[slug]) for slug in added],
+            ignore_conflicts=True,
+        )
+        skill_ids = Skill.objects.filter(slug__in=added).values_list('pk', flat=True)
+        UserSkill.objects.bulk_create(
+            [UserSkill(user=user, skill_id=skill_id) for skill_id in skill_ids],
+            ignore_conflicts=True,
+        )
+    invalidate_freelancer_search()
+    return True
+
+
+def invalidate_freelancer_search():
+    '''Drop every cached ranking by moving to a new version.'''
+    if not cache_is_shared():
+        return
+    try:
+        cache.incr(SEARCH_VERSION_KEY)
+    except ValueError:
+        cache.set(SEARCH_VERSION_KEY, 1, None)
+
+
+def rank_by_skills(queryset, slugs):
+    '''
+    Restrict `queryset` to users with at least one of `slugs` and order them
+    by matched skill count, then average rating, then hourly rate (lowest
+    first). Runs as a single grouped query; each row gets `matched_skills`.
+    '''
+    return queryset.filter(
+        skill_links__skill__slug__in=slugs
+    ).annotate(
+        matched_skills=Count('skill_links')
+    ).order_by(
+        '-matched_skills',
+        F('rating__average_rating').desc(nulls_last=True),
+        F('hourly_rate').asc(nulls_last=True),
+        'id',
+    )
+
+
+def cached_ranking(queryset, slugs):
+    '''
+    Return (total, [(user_id, matched_skills), ...]) for a skill search,
+    cached per skill combination (only with a shared cache, which every
+    process invalidates). Only the first FREELANCER_SEARCH_CACHE_SIZE ids
+    are kept; `total` is the full count.
+    '''
+    def rank():
+        ranked = rank_by_skills(queryset, slugs)
+        rows = list(ranked.values_list('id', 'matched_skills')[:settings.FREELANCER_SEARCH_CACHE_SIZE])
+        total = len(rows) if len(rows) < settings.FREELANCER_SEARCH_CACHE_SIZE else ranked.count()
+        return total, rows
+
+    if not cache_is_shared():
+        return rank()
+    version = cache.get_or_set(SEARCH_VERSION_KEY, 1, None)
+    key = 'accounts:freelancer-search:' + ','.join(sorted(slugs))
+    ranking = cache.get(key, version=version)
+    if ranking is None:
+        ranking = rank()
+        cache.set(key, ranking, settings.FREELANCER_SEARCH_CACHE_TIMEOUT, version=version)
+    return ranking
@@ -1,9 +1,11 @@
 from django.test import TestCase
 from rest_framework.test import APIClient
 from rest_framework import status
+from freelance_arena.testing import shared_cache, sync_last_seen
 from .models import User
 
 
+@sync_last_seen
 class AccountsTestCase(TestCase):
     """Test cases for the accounts app."""
 
@@ -125,3 +127,279 @@ class AccountsTestCase(TestCase):
         # Verify new password works
         self.client_user.refresh_from_db()
         self.assertTrue(self.client_user.check_password('newpass456'))
+
+    @shared_cache()
+    def test_freelancer_search_ranks_by_matched_skills(self):
+        """Test skill search ranking, exact skill matching and the cached ranking."""
+        from decimal import Decimal
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from feedback.models import UserRating
+
+        def make_freelancer(name, skills, rating, hourly_rate):
+            user = User.objects.create_user(
+                email=f'{name}@test.com',
+                username=name,
+                password='testpass123',
+                first_name=name.title(),
+                last_name='Freelancer',
+                role='FREELANCER',
+                hourly_rate=Decimal(hourly_rate),
+            )
+            UserRating.objects.create(user=user, average_rating=Decimal(rating))
+            self.client_api.force_authenticate(user=user)
+            self.client_api.patch(self.profile_url, {'skills': skills}, format='json')
+            return user
+
+        both_low = make_freelancer('alice', 'Python, Django', '3.50', '40.00')
+        both_high = make_freelancer('bob', 'django, python, React', '4.80', '90.00')
+        one = make_freelancer('carol', 'Python', '5.00', '20.00')
+        make_freelancer('dave', 'Go', '5.00', '20.00')
+        self.client_api.force_authenticate(user=None)
+
+        url = '/api/auth/freelancers/search/'
+        response = self.client_api.get(url, {'skills': 'python,django'})
+        results = response.data['data']['results']
+        self.assertEqual(
+            [row['id'] for row in results],
+            [str(both_high.id), str(both_low.id), str(one.id)],
+        )
+        self.assertEqual([row['matched_skills'] for row in results], [2, 2, 1])
+
+        # Cached: only the page of users is loaded
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client_api.get(url, {'skills': 'django, Python'})
+        self.assertEqual(response.data['data']['count'], 3)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        # "go" is its own skill and does not match "django"
+        response = self.client_api.get(url, {'skills': 'go', 'search': 'dave'})
+        self.assertEqual([row['username'] for row in response.data['data']['results']], ['dave'])
+
+        # Editing skills drops the cached rankings
+        self.client_api.force_authenticate(user=one)
+        self.client_api.patch(self.profile_url, {'skills': 'Rust'}, format='json')
+        response = self.client_api.get(url, {'skills': 'python,django'})
+        self.assertEqual(response.data['data']['count'], 2)
+
+    def test_last_seen_is_buffered_and_flushed_in_one_update(self):
+        """Test that requests only buffer last_seen and a flush writes all users at once."""
+        from datetime import timedelta
+        from django.db import connection
+        from django.test import override_settings
+        from django.test.utils import CaptureQueriesContext
+        from unittest import mock
+        from django.db import DatabaseError
+        from django.utils import timezone
+        from .last_seen import LastSeenBuffer, last_seen_buffer
+
+        # The request path issues no last_seen UPDATE (and no flusher thread
+        # is started here, it would write outside the test transaction)
+        self.client_api.force_authenticate(user=self.client_user)
+        with override_settings(LAST_SEEN_SYNC_WRITES=False), \
+                mock.patch.object(last_seen_buffer, '_ensure_flusher') as ensure_flusher:
+            with CaptureQueriesContext(connection) as ctx:
+                self.client_api.get(self.profile_url)
+        self.assertFalse([q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')])
+        ensure_flusher.assert_called_once()
+
+        # Written synchronously, a failed flush is logged instead of failing the request
+        self.client_api.force_authenticate(user=self.freelancer_user)
+        with mock.patch.object(last_seen_buffer, 'flush', side_effect=DatabaseError('locked')), \
+                self.assertLogs('freelance_arena', level='ERROR'):
+            response = self.client_api.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        buffer = LastSeenBuffer()
+        now = timezone.now()
+        with override_settings(LAST_SEEN_SYNC_WRITES=False):
+            self.assertTrue(buffer.touch(self.client_user.pk, now=now))
+            self.assertTrue(buffer.touch(self.freelancer_user.pk, now=now))
+            # Coalesced with the pending touch
+            self.assertFalse(buffer.touch(self.client_user.pk, now=now + timedelta(seconds=5)))
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.client_user.refresh_from_db()
+        self.freelancer_user.refresh_from_db()
+        self.assertEqual(self.client_user.last_seen, now)
+        self.assertEqual(self.freelancer_user.last_seen, now)
+
+        # Debounced against the written time until LAST_SEEN_INTERVAL passes
+        self.assertFalse(buffer.touch(self.client_user.pk, now=now + timedelta(seconds=60)))
+        self.assertTrue(buffer.touch(self.client_user.pk, now=now + timedelta(seconds=301)))
+
+    def test_access_token_snapshot_skips_user_lookup_until_revoked(self):
+        """Test that snapshot tokens authenticate without a user query and are revoked by role changes."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from freelance_arena.testing import shared_cache
+
+        response = self.client_api.post(
+            self.login_url, {'email': 'freelancer@test.com', 'password': 'testpass123'}, format='json'
+        )
+        access = response.data['data']['tokens']['access']
+        self.client_api.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+        # Role check and the freelancer=request.user filter use the token claims;
+        # with a per-process cache only token_version is read, on every request
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client_api.get('/api/proposals/mine/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user_queries = [q['sql'] for q in ctx.captured_queries if 'FROM "accounts_user"' in q['sql']]
+        self.assertEqual(len(user_queries), 1)
+        self.assertTrue(user_queries[0].startswith('SELECT "accounts_user"."token_version" AS'))
+        with shared_cache():
+            self.client_api.get('/api/proposals/mine/')
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client_api.get('/api/proposals/mine/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([q for q in ctx.captured_queries if 'FROM "accounts_user"' in q['sql']])
+
+        # Views that read other fields load the user on demand
+        response = self.client_api.get(self.profile_url)
+        self.assertEqual(response.data['data']['username'], 'testfreelancer')
+
+        # Changing the role bumps token_version and revokes the token
+        self.freelancer_user.role = 'CLIENT'
+        self.freelancer_user.save()
+        self.assertEqual(self.freelancer_user.token_version, 1)
+        response = self.client_api.get('/api/proposals/mine/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Unrelated edits do not
+        self.client_api.credentials()
+        response = self.client_api.post(
+            self.login_url, {'email': 'freelancer@test.com', 'password': 'testpass123'}, format='json'
+        )
+        self.client_api.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['data']['tokens']['access']}"
+        )
+        self.client_api.patch(self.profile_url, {'bio': 'Hello'}, format='json')
+        self.assertEqual(self.client_api.get(self.profile_url).status_code, status.HTTP_200_OK)
+
+        # Deactivating the account revokes it as well
+        self.client_api.delete(self.profile_url)
+        self.assertEqual(self.client_api.get(self.profile_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_refresh_blacklist_filter_and_prune(self):
+        """Test refresh rotation, the in-memory blacklist pre-check and pruning expired tokens."""
+        from datetime import timedelta
+        from io import StringIO
+        from django.core.management import call_command
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from django.utils import timezone
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+        from freelance_arena.testing import shared_cache
+        from .blacklist import BloomFilter
+
+        bloom = BloomFilter(1000, 0.01)
+        for index in range(1000):
+            bloom.add(f'jti-{index}')
+        self.assertTrue(all(f'jti-{index}' in bloom for index in range(1000)))
+        self.assertLess(sum(f'other-{index}' in bloom for index in range(1000)), 50)
+
+        refresh_url = '/api/auth/token/refresh/'
+        response = self.client_api.post(
+            self.login_url, {'email': 'client@test.com', 'password': 'testpass123'}, format='json'
+        )
+        first = response.data['data']['tokens']['refresh']
+
+        # With a shared cache, a token that was never blacklisted skips the blacklist query
+        with shared_cache(), CaptureQueriesContext(connection) as ctx:
+            response = self.client_api.post(refresh_url, {'refresh': first}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([
+            q for q in ctx.captured_queries
+            if q['sql'].startswith('SELECT 1 AS "a" FROM "token_blacklist_blacklistedtoken"')
+        ])
+        tokens = response.data['data']['tokens']
+
+        # The rotated-out token is blacklisted
+        response = self.client_api.post(refresh_url, {'refresh': first}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Logout blacklists the current one
+        self.client_api.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = self.client_api.post('/api/auth/logout/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client_api.post(refresh_url, {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Pruning removes expired tokens and their blacklist entries only
+        past = timezone.now() - timedelta(days=1)
+        for index in range(5):
+            expired = OutstandingToken.objects.create(
+                jti=f'expired-{index}', token='x', created_at=past, expires_at=past,
+            )
+            BlacklistedToken.objects.create(token=expired)
+        live = OutstandingToken.objects.exclude(expires_at__lte=timezone.now()).count()
+        out = StringIO()
+        call_command('prune_tokens', batch_size=2, stdout=out)
+        self.assertIn('Deleted 5 expired token(s).', out.getvalue())
+        self.assertEqual(OutstandingToken.objects.count(), live)
+        self.assertFalse(BlacklistedToken.objects.filter(token__jti__startswith='expired-').exists())
+
+    def test_blacklisting_reaches_other_processes(self):
+        """Test that a token blacklisted by one process's filter is not trusted as clean by another's."""
+        from datetime import timedelta
+        from django.utils import timezone
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+        from freelance_arena.testing import shared_cache
+        from .blacklist import TokenBlacklistFilter
+
+        token = OutstandingToken.objects.create(
+            jti='rotated-out', token='x', expires_at=timezone.now() + timedelta(days=1),
+        )
+
+        def blacklist_in(blacklisting):
+            with self.captureOnCommitCallbacks(execute=True):
+                BlacklistedToken.objects.create(token=token)
+                blacklisting.add(token.jti)
+
+        # With a per-process cache the other worker never hears of it, so it always checks the database
+        worker_a, worker_b = TokenBlacklistFilter(), TokenBlacklistFilter()
+        self.assertTrue(worker_b.might_be_blacklisted('never-blacklisted'))
+        blacklist_in(worker_a)
+        self.assertTrue(worker_b.might_be_blacklisted(token.jti))
+
+        # A shared cache carries the version bump to the other worker's filter
+        BlacklistedToken.objects.all().delete()
+        with shared_cache():
+            worker_a, worker_b = TokenBlacklistFilter(), TokenBlacklistFilter()
+            self.assertFalse(worker_b.might_be_blacklisted(token.jti))
+            blacklist_in(worker_a)
+            self.assertTrue(worker_b.might_be_blacklisted(token.jti))
+
+    def test_login_rehashes_password_to_configured_cost(self):
+        """Test that logging in upgrades a hash made with another algorithm or cost."""
+        from io import StringIO
+        from django.core.management import call_command
+        from django.test import override_settings
+
+        pbkdf2 = ['accounts.hashers.PBKDF2PasswordHasher', 'django.contrib.auth.hashers.MD5PasswordHasher']
+        data = {'email': 'client@test.com', 'password': 'testpass123'}
+
+        # Created with another algorithm: rehashed with the preferred one
+        with override_settings(PASSWORD_HASHERS=pbkdf2, PASSWORD_PBKDF2_ITERATIONS=1000):
+            response = self.client_api.post(self.login_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client_user.refresh_from_db()
+        self.assertTrue(self.client_user.password.startswith('pbkdf2_sha256$1000$'))
+
+        # Cost raised: rehashed at the next login, old hash still accepted
+        with override_settings(PASSWORD_HASHERS=pbkdf2, PASSWORD_PBKDF2_ITERATIONS=2000):
+            response = self.client_api.post(self.login_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client_user.refresh_from_db()
+        self.assertTrue(self.client_user.password.startswith('pbkdf2_sha256$2000$'))
+
+        out = StringIO()
+        call_command(
+            'benchmark_logins', hasher='pbkdf2', pbkdf2_iterations=1000,
+            workers=1, duration=0.1, samples=2, stdout=out,
+        )
+        self.assertIn('iterations=1000', out.getvalue())
+        self.assertIn('logins/s per core', out.getvalue())
@@ -0,0 +1,82 @@
+'''
+JWTs that carry a snapshot of the user.
+
+Tokens issued by UserRefreshToken (and the access tokens derived from it)
+hold the user's `role`, `is_active` and `token_version`, so
+SnapshotJWTAuthentication can authenticate a request without loading the
+user. Changing a user's role or deactivating them bumps `token_version`
+(see User.save), which invalidates every token issued before the change.
+The current version is read with one indexed lookup. It is only cached
+when the cache is shared by every process: a bump clears the cached value
+in the process that saved the user, and a per-process cache elsewhere
+would keep accepting revoked tokens until it expired.
+'''
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from freelance_arena.utils import cache_is_shared
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+ROLE_CLAIM = 'role'
+ACTIVE_CLAIM = 'is_active'
+VERSION_CLAIM = 'ver'
+
+
+def _version_key(user_id):
+    return f'accounts:token-version:{user_id}'
+
+
+def token_version(user_id):
+    '''Current token_version of a user, or None if the user does not exist.'''
+    from .models import User
+
+    shared = cache_is_shared()
+    key = _version_key(user_id)
+    version = cache.get(key) if shared else None
+    if version is None:
+        version = (
+            User.objects.filter(pk=user_id).order_by()
+            .values_list('token_version', flat=True).first()
+        )
+        if version is not None and shared:
+            cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def forget_token_version(user_id):
+    '''
+    Drop the cached version after a bump. Inside a transaction it is dropped
+    again on commit, in case a concurrent request re-cached the old value.
+    '''
+    key = _version_key(user_id)
+    cache.delete(key)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: cache.delete(key))
+
+
+class UserRefreshToken(RefreshToken):
+    '''
+    Refresh token whose claims (and its access tokens' claims) snapshot the
+    user, and whose blacklist check goes through accounts.blacklist.
+    '''
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[ROLE_CLAIM] = user.role
+        token[ACTIVE_CLAIM] = user.is_active
+        token[VERSION_CLAIM] = user.token_version
+        return token
+
+    def check_blacklist(self):
+        # Most tokens are not blacklisted; the filter rules them out without a query
+        from .blacklist import blacklist_filter
+        if blacklist_filter.might_be_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        from .blacklist import blacklist_filter
+        result = super().blacklist()
+        blacklist_filter.add(self.payload[api_settings.JTI_CLAIM])
+        return result
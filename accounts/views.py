@@ -1,9 +1,9 @@
 ﻿from rest_framework import generics, status, filters
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
-from django.db.models import Q
+from freelance_arena.pagination import HybridPagination
 from freelance_arena.utils import success_response
 from .models import User
 from .serializers import (
@@ -11,10 +11,13 @@ from .serializers import (
     UserLoginSerializer,
     UserProfileSerializer,
     ChangePasswordSerializer,
+    TokenRefreshSerializer,
     AdminUserSerializer,
     FreelancerSearchSerializer,
 )
 from .permissions import IsAdminRole
+from .skills import cached_ranking, parse_skills, rank_by_skills
+from .tokens import UserRefreshToken
 
 
 class RegisterView(APIView):
@@ -27,7 +30,7 @@ class RegisterView(APIView):
         user = serializer.save()
 
         # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
 
         return success_response(
             data={
@@ -51,7 +54,7 @@ class LoginView(APIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
 
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
 
         return success_response(
             data={
@@ -79,7 +82,7 @@ class LogoutView(APIView):
                     message='Refresh token is required.',
                     status_code=status.HTTP_400_BAD_REQUEST,
                 )
-            token = RefreshToken(refresh_token)
+            token = UserRefreshToken(refresh_token)
             token.blacklist()
             return success_response(message='Logout successful.')
         except TokenError:
@@ -90,6 +93,28 @@ class LogoutView(APIView):
             )
 
 
+class TokenRefreshView(APIView):
+    '''POST - Exchange a refresh token for new tokens. The old refresh token is blacklisted.'''
+    permission_classes = [AllowAny]
+    # An expired access token in the header must not block refreshing
+    authentication_classes = []
+
+    def post(self, request):
+        serializer = TokenRefreshSerializer(data=request.data)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError:
+            return success_response(
+                data=None,
+                message='Token is invalid, expired or blacklisted.',
+                status_code=status.HTTP_401_UNAUTHORIZED,
+            )
+        return success_response(
+            data={'tokens': serializer.validated_data},
+            message='Token refreshed.',
+        )
+
+
 class ProfileView(APIView):
     '''GET/PUT/PATCH/DELETE own profile.'''
     permission_classes = [IsAuthenticated]
@@ -143,6 +168,8 @@ class UserListView(generics.ListAPIView):
     search_fields = ['username', 'email', 'first_name', 'last_name']
     ordering_fields = ['date_joined', 'username', 'email']
     ordering = ['-date_joined']
+    pagination_class = HybridPagination
+    cursor_ordering = ('-date_joined', '-id')
 
     def get_queryset(self):
         queryset = User.objects.all()
@@ -215,17 +242,63 @@ class FreelancerSearchView(generics.ListAPIView):
     search_fields = ['username', 'skills', 'first_name', 'last_name']
     ordering_fields = ['hourly_rate', 'username']
 
+    def get_skill_slugs(self):
+        try:
+            return list(parse_skills(self.request.query_params.get('skills'), strict=True))
+        except ValueError as exc:
+            raise ValidationError({'skills': str(exc)})
+
     def get_queryset(self):
         queryset = User.objects.filter(role='FREELANCER', is_active=True)
-        skills = self.request.query_params.get('skills')
-        if skills:
-            skill_list = [s.strip() for s in skills.split(',')]
-            q = Q()
-            for skill in skill_list:
-                q |= Q(skills__icontains=skill)
-            queryset = queryset.filter(q)
+        slugs = self.get_skill_slugs()
+        if slugs:
+            queryset = rank_by_skills(queryset, slugs)
         return queryset
 
     def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
+        slugs = self.get_skill_slugs()
+        response = None
+        if slugs and not any(param in request.query_params for param in ('search', 'ordering')):
+            response = self.list_cached_ranking(request, slugs)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
         return success_response(data=response.data, message='Freelancers retrieved.')
+
+    def list_cached_ranking(self, request, slugs):
+        '''
+        Serve a plain skill search from the cached ranking. Returns None when
+        the requested page lies past the cached ids, so the query runs instead.
+        '''
+        total, rows = cached_ranking(User.objects.filter(role='FREELANCER', is_active=True), slugs)
+        try:
+            page_number = int(request.query_params.get(self.paginator.page_query_param, 1))
+        except ValueError:
+            return None
+        if total > len(rows) and page_number * self.paginator.get_page_size(request) > len(rows):
+            return None
+
+        page = self.paginate_queryset(_RankedIds(total, rows))
+        users = User.objects.filter(
+            pk__in=[user_id for user_id, _ in page], is_active=True
+        ).in_bulk()
+        results = []
+        for user_id, matched_skills in page:
+            user = users.get(user_id)
+            if user is not None:
+                user.matched_skills = matched_skills
+                results.append(user)
+        return self.get_paginated_response(self.get_serializer(results, many=True).data)
+
+
+class _RankedIds:
+    '''Cached ranking exposed to the paginator: full length, first ids only.'''
+
+    def __init__(self, total, rows):
+        self.total = total
+        self.rows = rows
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, index):
+        return self.rows[index]
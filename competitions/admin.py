@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Competition, CompetitionQuestion, CompetitionBookmark
+from django.utils import timezone
+from freelance_arena.response_cache import invalidate_responses
+from .models import Competition, CompetitionQuestion, CompetitionBookmark, CompetitionStats, Tag
 
 
 @admin.register(Competition)
@@ -15,14 +17,27 @@ class CompetitionAdmin(admin.ModelAdmin):
 
     actions = ['bulk_open', 'bulk_cancel']
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_stats()
+
+    @staticmethod
+    def expire_responses(queryset):
+        # update() skips the post_save signal that normally does this
+        ids = queryset.values_list('pk', flat=True)
+        invalidate_responses('competitions', *(f'competition:{pk}' for pk in ids))
+
     @admin.action(description='Open selected competitions')
     def bulk_open(self, request, queryset):
-        updated = queryset.filter(status='DRAFT').update(status='OPEN')
+        updated = queryset.filter(status='DRAFT').update(status='OPEN', updated_at=timezone.now())
+        self.expire_responses(queryset)
         self.message_user(request, f'{updated} competition(s) opened.')
 
     @admin.action(description='Cancel selected competitions')
     def bulk_cancel(self, request, queryset):
-        updated = queryset.exclude(status__in=['CLOSED', 'CANCELLED']).update(status='CANCELLED')
+        updated = queryset.exclude(status__in=['CLOSED', 'CANCELLED']).update(
+            status='CANCELLED', updated_at=timezone.now(),
+        )
+        self.expire_responses(queryset)
         self.message_user(request, f'{updated} competition(s) cancelled.')
 
 
@@ -35,3 +50,22 @@ class CompetitionQuestionAdmin(admin.ModelAdmin):
 @admin.register(CompetitionBookmark)
 class CompetitionBookmarkAdmin(admin.ModelAdmin):
     list_display = ('user', 'competition', 'created_at')
+
+
+@admin.register(CompetitionStats)
+class CompetitionStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        'competition', 'proposal_count', 'active_proposal_count',
+        'bookmark_count', 'question_count', 'review_count', 'updated_at',
+    )
+    readonly_fields = (
+        'competition', 'proposal_count', 'active_proposal_count',
+        'bookmark_count', 'question_count', 'review_count', 'updated_at',
+    )
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'created_at')
+    search_fields = ('name', 'slug')
+    readonly_fields = ('id', 'created_at')
@@ -0,0 +1,71 @@
+"""
+Bulk competition import for clients that post many competitions at once.
+
+Competitions are validated with CompetitionCreateSerializer(many=True) and
+inserted with bulk_create, `COMPETITION_BULK_BATCH_SIZE` at a time, in one
+transaction: either every item is created or none is. Input is consumed
+batch by batch, so a lazily parsed upload (NDJSON) is never held in memory
+as a whole.
+
+bulk_create does not send post_save, so `create_competitions` repeats the
+Competition signal side effects that apply to new DRAFT competitions
+(stats row, tag links, response cache). DRAFT competitions are not
+scheduled, so no schedule change is published.
+"""
+from itertools import islice
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+from freelance_arena.response_cache import invalidate_responses
+from .models import Competition, CompetitionStats
+from .tags import link_new_competition_tags
+
+# Validation stops after the batch in which this many items have failed
+MAX_REPORTED_ERRORS = 100
+
+
+def create_competitions(competitions):
+    """Insert unsaved Competition objects and their stats and tag rows."""
+    Competition.objects.bulk_create(competitions)
+    CompetitionStats.objects.bulk_create(
+        [CompetitionStats(competition_id=competition.pk) for competition in competitions],
+        ignore_conflicts=True,
+    )
+    link_new_competition_tags(competitions)
+    invalidate_responses('competitions')
+    return competitions
+
+
+def import_competitions(items, context, batch_size=None):
+    """
+    Validate and create competitions from an iterable of dicts. Returns the
+    ids of the created competitions. Raises ValidationError with
+    `{'items': {<index>: <errors>, ...}}` (nothing is created) if any item
+    is invalid.
+    """
+    from .serializers import CompetitionCreateSerializer
+
+    batch_size = batch_size or settings.COMPETITION_BULK_BATCH_SIZE
+    items = iter(items)
+    created = []
+    errors = {}
+    offset = 0
+    with transaction.atomic():
+        while chunk := list(islice(items, batch_size)):
+            serializer = CompetitionCreateSerializer(data=chunk, many=True, context=context)
+            if not serializer.is_valid():
+                errors.update(
+                    (offset + index, item_errors)
+                    for index, item_errors in enumerate(serializer.errors)
+                    if item_errors
+                )
+                if len(errors) >= MAX_REPORTED_ERRORS:
+                    break
+            elif not errors:
+                created.extend(competition.pk for competition in serializer.save())
+            offset += len(chunk)
+
+        if errors:
+            # Raised inside the atomic block, so earlier batches roll back
+            raise serializers.ValidationError({'items': errors})
+    return created
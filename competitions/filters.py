@@ -1,5 +1,8 @@
 import django_filters
-from .models import Competition
+from django.db.models import Count
+from rest_framework.exceptions import ValidationError
+from .models import Competition, CompetitionTag
+from .tags import parse_slugs as parse_tag_slugs
 
 
 class CompetitionFilter(django_filters.FilterSet):
@@ -10,9 +13,41 @@ class CompetitionFilter(django_filters.FilterSet):
     budget_max = django_filters.NumberFilter(field_name='budget', lookup_expr='lte')
     deadline_before = django_filters.DateTimeFilter(field_name='deadline', lookup_expr='lte')
     deadline_after = django_filters.DateTimeFilter(field_name='deadline', lookup_expr='gte')
-    tags = django_filters.CharFilter(field_name='tags', lookup_expr='icontains')
+    tags = django_filters.CharFilter(method='filter_tags_any')
+    tags_all = django_filters.CharFilter(method='filter_tags_all')
 
     class Meta:
         model = Competition
         fields = ['category', 'status', 'budget_min', 'budget_max',
-                  'deadline_before', 'deadline_after', 'tags']
+                  'deadline_before', 'deadline_after', 'tags', 'tags_all']
+
+    @staticmethod
+    def parse_slugs(name, value):
+        try:
+            return parse_tag_slugs(value)
+        except ValueError as exc:
+            raise ValidationError({name: str(exc)})
+
+    def filter_tags_any(self, queryset, name, value):
+        """Competitions with at least one of the comma-separated tags."""
+        slugs = self.parse_slugs(name, value)
+        if not slugs:
+            return queryset
+        return queryset.filter(
+            id__in=CompetitionTag.objects.filter(
+                tag__slug__in=slugs
+            ).values('competition_id')
+        )
+
+    def filter_tags_all(self, queryset, name, value):
+        """Competitions with every one of the comma-separated tags."""
+        slugs = self.parse_slugs(name, value)
+        if not slugs:
+            return queryset
+        return queryset.filter(
+            id__in=CompetitionTag.objects.filter(
+                tag__slug__in=slugs
+            ).values('competition_id').annotate(
+                matched=Count('tag_id')
+            ).filter(matched=len(slugs)).values('competition_id')
+        )
@@ -0,0 +1,187 @@
+"""
+Set-based lifecycle jobs for competitions: status transitions and
+deadline reminders, shared by the management commands and the scheduler.
+
+Transitions run as plain UPDATEs over many rows, so the Competition
+post_save signals do not fire; each transition repeats the side effects
+that matter (response cache and tag cloud invalidation, notifications)
+itself.
+"""
+import time
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Case, Exists, OuterRef, Value, When
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from freelance_arena.response_cache import invalidate_responses
+from .models import Competition, CompetitionBookmark
+from .tags import invalidate_tag_cloud
+
+REMINDER_TYPE = 'COMPETITION_DEADLINE_APPROACHING'
+REMINDER_LEAD = timedelta(hours=24)
+
+
+class LifecycleError(Exception):
+    """A transition that is not allowed; views answer with `status_code`."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class CompetitionLifecycleService:
+    """Service class for moving competitions through their lifecycle."""
+
+    @staticmethod
+    def expired_open(now=None):
+        """OPEN competitions whose submission deadline has passed."""
+        return Competition.objects.filter(
+            status='OPEN', submission_deadline__lt=now or timezone.now(),
+        )
+
+    @staticmethod
+    def close_expired(batch_size=500, max_runtime=None, now=None):
+        """
+        Move expired OPEN competitions to REVIEW, `batch_size` at a time.
+        Each batch locks its rows (skipping rows locked by another run),
+        updates them with one UPDATE and queues one notification event, in
+        a single transaction. Stops starting new batches after
+        `max_runtime` seconds. Returns the number of competitions moved.
+        """
+        from notifications.utils import NotificationService
+
+        now = now or timezone.now()
+        started = time.monotonic()
+        moved = 0
+        while max_runtime is None or time.monotonic() - started < max_runtime:
+            with transaction.atomic():
+                batch_ids = list(
+                    CompetitionLifecycleService.expired_open(now)
+                    .select_for_update(skip_locked=True)
+                    .order_by('submission_deadline')
+                    .values_list('pk', flat=True)[:batch_size]
+                )
+                if not batch_ids:
+                    break
+                updated = Competition.objects.filter(
+                    pk__in=batch_ids, status='OPEN',
+                ).update(status='REVIEW', updated_at=now)
+                NotificationService.notify_competitions_in_review(batch_ids)
+                invalidate_responses('competitions', *(f'competition:{pk}' for pk in batch_ids))
+            moved += updated
+
+        if moved:
+            # REVIEW competitions drop out of the tag cloud
+            invalidate_tag_cloud()
+        return moved
+
+    @staticmethod
+    def send_deadline_reminders(now=None, batch_size=None):
+        """
+        Remind users who bookmarked an OPEN competition closing within
+        REMINDER_LEAD and have not submitted to it. Every pending
+        (user, competition) pair comes from one anti-join; the dedup key
+        makes overlapping runs skip pairs already reminded.
+        Returns (notifications sent, competitions they cover).
+        """
+        from notifications.models import Notification
+        from notifications.utils import NotificationService
+        from proposals.models import Proposal
+
+        now = now or timezone.now()
+        pending = CompetitionBookmark.objects.filter(
+            competition__status='OPEN',
+            competition__submission_deadline__gt=now,
+            competition__submission_deadline__lte=now + REMINDER_LEAD,
+        ).exclude(
+            Exists(Proposal.objects.filter(
+                competition_id=OuterRef('competition_id'),
+                freelancer_id=OuterRef('user_id'),
+            ))
+        ).exclude(
+            Exists(Notification.objects.filter(
+                notification_type=REMINDER_TYPE,
+                related_competition_id=OuterRef('competition_id'),
+                recipient_id=OuterRef('user_id'),
+            ))
+        ).values_list('user_id', 'competition_id', 'competition__title').order_by()
+
+        competition_ids = set()
+
+        def reminders():
+            for user_id, competition_id, title in pending.iterator(chunk_size=2000):
+                competition_ids.add(competition_id)
+                yield Notification(
+                    recipient_id=user_id,
+                    notification_type=REMINDER_TYPE,
+                    title='Deadline Approaching!',
+                    message=f'The competition "{title}" closes within 24 hours. Submit your proposal now!',
+                    related_competition_id=competition_id,
+                    dedup_key=Notification.dedup_key_for(REMINDER_TYPE, user_id, competition_id),
+                )
+
+        sent = NotificationService.create_bulk(
+            reminders(), batch_size=batch_size, ignore_conflicts=True,
+        )
+        return sent, len(competition_ids)
+
+    @staticmethod
+    def select_winner(competition_id, client, proposal_id):
+        """
+        Close a competition in REVIEW with `proposal_id` as the winner.
+        The competition and proposal rows are locked, so concurrent calls
+        (e.g. a double click) run one after the other and the second sees
+        the competition already CLOSED. All writes, including the payment
+        record and the queued notification events, commit together.
+        Raises LifecycleError when the transition is not allowed.
+        """
+        from notifications.utils import NotificationService
+        from payments.models import PaymentRecord
+        from proposals.models import Proposal
+
+        with transaction.atomic():
+            competition = get_object_or_404(
+                Competition.objects.select_for_update(), id=competition_id,
+            )
+            if competition.client_id != client.id:
+                raise LifecycleError('You are not the owner of this competition.', 403)
+            if competition.status != 'REVIEW':
+                raise LifecycleError('Winner can only be selected when competition is in REVIEW status.')
+
+            proposal = Proposal.objects.select_for_update().filter(
+                id=proposal_id, competition=competition,
+            ).first()
+            if proposal is None:
+                raise LifecycleError('Proposal not found for this competition.', 404)
+            if proposal.status == 'WITHDRAWN':
+                raise LifecycleError('Cannot select a withdrawn proposal.')
+
+            now = timezone.now()
+            competition.winning_proposal = proposal
+            competition.winner_id = proposal.freelancer_id
+            competition.status = 'CLOSED'
+            competition.save(update_fields=['winning_proposal', 'winner', 'status', 'updated_at'])
+
+            # Accept the winner and reject every other active proposal in one UPDATE
+            competition.proposals.exclude(status='WITHDRAWN').update(
+                status=Case(When(pk=proposal.pk, then=Value('ACCEPTED')), default=Value('REJECTED')),
+                is_winner=Case(When(pk=proposal.pk, then=Value(True)), default=Value(False)),
+                updated_at=now,
+            )
+            proposal.status = 'ACCEPTED'
+            proposal.is_winner = True
+            proposal.updated_at = now
+
+            PaymentRecord.objects.create(
+                competition=competition,
+                client_id=competition.client_id,
+                freelancer_id=proposal.freelancer_id,
+                amount=competition.budget,
+                currency=competition.currency,
+            )
+
+            # Outbox rows: delivered by the worker only once this commits
+            NotificationService.notify_winner_selected(competition, proposal)
+            NotificationService.notify_competition_closed(competition)
+        return competition
@@ -1,43 +1,34 @@
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from competitions.models import Competition
-from notifications.utils import NotificationService
-from proposals.models import Proposal
+from competitions.lifecycle import CompetitionLifecycleService
 
 
 class Command(BaseCommand):
     help = 'Close competitions whose submission deadline has passed (OPEN -> REVIEW).'
 
-    def handle(self, *args, **options):
-        now = timezone.now()
-        expired = Competition.objects.filter(
-            status='OPEN',
-            submission_deadline__lt=now,
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Competitions locked and updated per transaction (default: 500).',
+        )
+        parser.add_argument(
+            '--max-runtime', type=float, default=None,
+            help='Stop starting new batches after this many seconds.',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report how many competitions would be closed without changing anything.',
         )
 
-        count = expired.count()
-
-        for competition in expired:
-            competition.status = 'REVIEW'
-            competition.save(update_fields=['status', 'updated_at'])
-
-            # Notify participating freelancers
-            proposals = Proposal.objects.filter(
-                competition=competition
-            ).exclude(
-                status='WITHDRAWN'
-            ).select_related('freelancer')
-
-            for proposal in proposals:
-                from notifications.models import Notification
-                Notification.objects.create(
-                    recipient=proposal.freelancer,
-                    notification_type='COMPETITION_CLOSED',
-                    title='Competition Moved to Review',
-                    message=f'The competition "{competition.title}" submission period has ended and is now under review.',
-                    related_competition_id=competition.id,
-                )
-
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = CompetitionLifecycleService.expired_open().count()
+            self.stdout.write(f'{count} competition(s) would be moved from OPEN to REVIEW.')
+            return
+
+        count = CompetitionLifecycleService.close_expired(
+            batch_size=max(1, options['batch_size']),
+            max_runtime=options['max_runtime'],
+        )
         self.stdout.write(
             self.style.SUCCESS(f'{count} competition(s) moved from OPEN to REVIEW.')
         )
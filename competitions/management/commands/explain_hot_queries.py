@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from freelance_arena.query_audit import HOT_QUERIES, explain, find_full_scans
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the registered hot queries and flag any that fall back to a full table scan.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--query', action='append', dest='names', default=[],
+            help='Only explain the named query (repeatable).',
+        )
+        parser.add_argument(
+            '--show-plan', action='store_true',
+            help='Print the full plan for every query.',
+        )
+        parser.add_argument(
+            '--fail-on-scan', action='store_true',
+            help='Exit with an error if any query performs a full table scan.',
+        )
+
+    def handle(self, *args, **options):
+        names = options['names'] or sorted(HOT_QUERIES)
+        unknown = [name for name in names if name not in HOT_QUERIES]
+        if unknown:
+            raise CommandError(f"Unknown hot query: {', '.join(unknown)}")
+
+        flagged = []
+        for name in names:
+            plan = explain(HOT_QUERIES[name]())
+            scans = find_full_scans(plan, connection.vendor)
+            if scans:
+                flagged.append(name)
+                self.stdout.write(self.style.WARNING(
+                    f"{name}: FULL SCAN on {', '.join(scans)}"
+                ))
+            else:
+                self.stdout.write(f"{name}: ok")
+            if options['show_plan'] or scans:
+                self.stdout.write(plan)
+
+        summary = f"Explained {len(names)} quer{'y' if len(names) == 1 else 'ies'} on {connection.vendor}; {len(flagged)} full scan(s)."
+        if flagged and options['fail_on_scan']:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from competitions.models import Competition, CompetitionStats
+
+
+class Command(BaseCommand):
+    help = 'Recalculate denormalized competition counters from live data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of competitions recalculated per query (default: 500).',
+        )
+        parser.add_argument(
+            '--competition', action='append', dest='competition_ids', default=[],
+            help='Only rebuild the given competition id (repeatable).',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        competitions = Competition.objects.order_by('pk')
+        if options['competition_ids']:
+            competitions = competitions.filter(pk__in=options['competition_ids'])
+
+        competition_ids = list(competitions.values_list('pk', flat=True))
+        rebuilt = 0
+        drifted = 0
+
+        for start in range(0, len(competition_ids), batch_size):
+            batch_ids = competition_ids[start:start + batch_size]
+            fresh = CompetitionStats.compute(Competition.objects.filter(pk__in=batch_ids))
+            current = {
+                row['competition_id']: row
+                for row in CompetitionStats.objects.filter(
+                    competition_id__in=batch_ids
+                ).values('competition_id', *CompetitionStats.COUNTER_FIELDS)
+            }
+            for stats in fresh:
+                row = current.get(stats.competition_id)
+                if row is None or any(
+                    row[field] != getattr(stats, field)
+                    for field in CompetitionStats.COUNTER_FIELDS
+                ):
+                    drifted += 1
+
+            CompetitionStats.save_many(fresh)
+            rebuilt += len(fresh)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Rebuilt stats for {rebuilt} competition(s); '
+                f'{drifted} were missing or out of date.'
+            )
+        )
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from competitions.scheduler import DeadlineScheduler
+
+
+class Command(BaseCommand):
+    help = (
+        'Run competition lifecycle jobs (OPEN -> REVIEW, deadline reminders) '
+        'exactly when deadlines are reached. Replaces the cron jobs for '
+        'close_expired_competitions and remind_deadlines.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--horizon', type=int, default=3600,
+            help='Seconds of upcoming deadlines (beyond the reminder lead) loaded per window (default: 3600).',
+        )
+        parser.add_argument(
+            '--window-size', type=int, default=5000,
+            help='Competitions loaded per window (default: 5000).',
+        )
+        parser.add_argument(
+            '--resync-interval', type=int, default=300,
+            help='Seconds between reloads of the window from the database (default: 300).',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Competitions closed per transaction (default: 500).',
+        )
+        parser.add_argument(
+            '--max-runtime', type=float, default=None,
+            help='Exit after this many seconds instead of running until interrupted.',
+        )
+
+    def handle(self, *args, **options):
+        scheduler = DeadlineScheduler(
+            horizon=options['horizon'],
+            window_size=max(1, options['window_size']),
+            resync_interval=options['resync_interval'],
+            batch_size=max(1, options['batch_size']),
+        )
+        try:
+            scheduler.run(max_runtime=options['max_runtime'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Moved {scheduler.closed} competition(s) to REVIEW and '
+                f'sent {scheduler.reminded} deadline reminder(s).'
+            )
+        )
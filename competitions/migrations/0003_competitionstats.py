@@ -0,0 +1,39 @@
+# Generated by Django 5.2.11 on 2026-10-18 10:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("competitions", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CompetitionStats",
+            fields=[
+                (
+                    "competition",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="competitions.competition",
+                    ),
+                ),
+                ("proposal_count", models.PositiveIntegerField(default=0)),
+                ("active_proposal_count", models.PositiveIntegerField(default=0)),
+                ("bookmark_count", models.PositiveIntegerField(default=0)),
+                ("question_count", models.PositiveIntegerField(default=0)),
+                ("review_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "competition stats",
+                "db_table": "competitions_competitionstats",
+            },
+        ),
+    ]
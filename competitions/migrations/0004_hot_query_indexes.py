@@ -0,0 +1,26 @@
+# Generated by Django 5.2.11 on 2026-10-18 10:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("competitions", "0003_competitionstats"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="competition",
+            index=models.Index(
+                fields=["status", "submission_deadline"],
+                name="comp_status_deadline_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="competition",
+            index=models.Index(
+                fields=["status", "-created_at"], name="comp_status_created_idx"
+            ),
+        ),
+    ]
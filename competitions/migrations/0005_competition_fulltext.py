@@ -0,0 +1,61 @@
+from django.db import migrations
+
+# Frozen copies of the names in competitions.search; the DDL below must not
+# follow later changes to that module
+SEARCH_FIELDS = ("title", "description", "category", "tags")
+MYSQL_INDEX_NAME = "competition_fulltext_idx"
+FTS_TABLE = "competitions_competition_fts"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    columns = ", ".join(SEARCH_FIELDS)
+    if vendor == "mysql":
+        schema_editor.execute(
+            f"ALTER TABLE competitions_competition "
+            f"ADD FULLTEXT INDEX {MYSQL_INDEX_NAME} ({columns})"
+        )
+    elif vendor == "sqlite":
+        new_values = ", ".join(f"NEW.{field}" for field in SEARCH_FIELDS)
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            f"competition_id UNINDEXED, {columns})"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (competition_id, {columns}) "
+            f"SELECT id, {columns} FROM competitions_competition"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON competitions_competition BEGIN "
+            f"INSERT INTO {FTS_TABLE} (competition_id, {columns}) VALUES (NEW.id, {new_values}); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON competitions_competition BEGIN "
+            f"DELETE FROM {FTS_TABLE} WHERE competition_id = OLD.id; END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF {columns} ON competitions_competition BEGIN "
+            f"DELETE FROM {FTS_TABLE} WHERE competition_id = OLD.id; "
+            f"INSERT INTO {FTS_TABLE} (competition_id, {columns}) VALUES (NEW.id, {new_values}); END"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "mysql":
+        schema_editor.execute(f"ALTER TABLE competitions_competition DROP INDEX {MYSQL_INDEX_NAME}")
+    elif vendor == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("competitions", "0004_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
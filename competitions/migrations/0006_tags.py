@@ -0,0 +1,96 @@
+# Generated by Django 5.2.11 on 2026-10-18 10:33
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("competitions", "0005_competition_fulltext"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tag",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("name", models.CharField(max_length=50)),
+                ("slug", models.SlugField(unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "competitions_tag",
+                "ordering": ["slug"],
+            },
+        ),
+        migrations.CreateModel(
+            name="CompetitionTag",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "competition",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tag_links",
+                        to="competitions.competition",
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="competition_links",
+                        to="competitions.tag",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "competitions_competitiontag",
+            },
+        ),
+        # The through table holds the links, so there is no column to add.
+        # State-only also stops SQLite from rebuilding competitions_competition,
+        # which would drop the FTS5 triggers from 0005.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name="competition",
+                    name="normalized_tags",
+                    field=models.ManyToManyField(
+                        blank=True,
+                        related_name="competitions",
+                        through="competitions.CompetitionTag",
+                        to="competitions.tag",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="competitiontag",
+            index=models.Index(
+                fields=["tag", "competition"], name="comptag_tag_competition_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="competitiontag",
+            unique_together={("competition", "tag")},
+        ),
+    ]
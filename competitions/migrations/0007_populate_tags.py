@@ -0,0 +1,63 @@
+from django.db import migrations
+from django.utils.text import slugify
+
+
+# Frozen copy of parse_tags() as it was when this migration was written;
+# importing the live one would let later changes alter this backfill
+def parse_tags(text, max_length=50):
+    tags = {}
+    for raw in (text or "").split(","):
+        name = " ".join(raw.split())[:max_length]
+        slug = slugify(name)[:max_length]
+        if slug and slug not in tags:
+            tags[slug] = name
+    return tags
+
+
+def populate_tags(apps, schema_editor):
+    Competition = apps.get_model("competitions", "Competition")
+    Tag = apps.get_model("competitions", "Tag")
+    CompetitionTag = apps.get_model("competitions", "CompetitionTag")
+
+    parsed = {
+        competition_id: parse_tags(tags)
+        for competition_id, tags in Competition.objects.exclude(tags="")
+        .values_list("id", "tags")
+        .iterator()
+    }
+    names = {}
+    for tags in parsed.values():
+        for slug, name in tags.items():
+            names.setdefault(slug, name)
+
+    Tag.objects.bulk_create(
+        [Tag(slug=slug, name=name) for slug, name in names.items()],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    tag_ids = dict(Tag.objects.values_list("slug", "id"))
+    CompetitionTag.objects.bulk_create(
+        [
+            CompetitionTag(competition_id=competition_id, tag_id=tag_ids[slug])
+            for competition_id, tags in parsed.items()
+            for slug in tags
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+def clear_tags(apps, schema_editor):
+    apps.get_model("competitions", "CompetitionTag").objects.all().delete()
+    apps.get_model("competitions", "Tag").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("competitions", "0006_tags"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_tags, clear_tags),
+    ]
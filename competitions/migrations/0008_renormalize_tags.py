@@ -0,0 +1,80 @@
+# Generated by Django 5.2.11 on 2026-10-18 11:14
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+# Frozen copies of normalize_label() and parse_comma_separated() as they
+# were when this migration was written; importing the live ones would let
+# later changes alter this rebuild
+def normalize_label(text):
+    text = "".join(
+        char
+        for char in unicodedata.normalize("NFKC", text)
+        if not unicodedata.category(char).startswith("C") or char.isspace()
+    )
+    return " ".join(text.split()).casefold()
+
+
+def parse_tags(text, max_length=50):
+    labels = {}
+    for raw in (text or "").split(","):
+        if not raw.strip():
+            continue
+        slug = normalize_label(raw)[:max_length]
+        if slug and slug not in labels:
+            labels[slug] = " ".join(raw.split())[:max_length]
+    return labels
+
+
+# Slugs keep punctuation and non-ASCII letters now; rebuild the tags from the text
+def rebuild_tags(apps, schema_editor):
+    Competition = apps.get_model("competitions", "Competition")
+    Tag = apps.get_model("competitions", "Tag")
+    CompetitionTag = apps.get_model("competitions", "CompetitionTag")
+
+    CompetitionTag.objects.all().delete()
+    Tag.objects.all().delete()
+    parsed = {
+        competition_id: parse_tags(tags)
+        for competition_id, tags in Competition.objects.exclude(tags="")
+        .values_list("id", "tags")
+        .iterator()
+    }
+    names = {}
+    for tags in parsed.values():
+        for slug, name in tags.items():
+            names.setdefault(slug, name)
+
+    Tag.objects.bulk_create(
+        [Tag(slug=slug, name=name) for slug, name in names.items()],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    tag_ids = dict(Tag.objects.values_list("slug", "id"))
+    CompetitionTag.objects.bulk_create(
+        [
+            CompetitionTag(competition_id=competition_id, tag_id=tag_ids[slug])
+            for competition_id, tags in parsed.items()
+            for slug in tags
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("competitions", "0007_populate_tags"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="tag",
+            name="slug",
+            field=models.CharField(max_length=50, unique=True),
+        ),
+        migrations.RunPython(rebuild_tags, migrations.RunPython.noop),
+    ]
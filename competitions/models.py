@@ -1,9 +1,66 @@
 import uuid
 from django.db import models
+from django.db.models import Case, Count, F, Max, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.utils import timezone
 
 
+class CompetitionQuerySet(models.QuerySet):
+    """Custom queryset for competitions."""
+
+    def with_stats(self):
+        """
+        Annotate proposal and question counts in the same SELECT.
+        Counts are read from the CompetitionStats row; the grouped COUNT
+        subqueries only run for competitions that do not have one yet.
+        """
+        from proposals.models import Proposal
+
+        proposals = Proposal.objects.filter(competition=OuterRef('pk'))
+        questions = CompetitionQuestion.objects.filter(competition=OuterRef('pk'))
+        return self.annotate(
+            num_proposals=Coalesce(
+                'stats__proposal_count', _count_subquery(proposals),
+            ),
+            num_active_proposals=Coalesce(
+                'stats__active_proposal_count',
+                _count_subquery(proposals.exclude(status='WITHDRAWN')),
+            ),
+            num_questions=Coalesce(
+                'stats__question_count', _count_subquery(questions),
+            ),
+        )
+
+    def detail_version(self, pk):
+        """
+        Values that change whenever the public detail of competition `pk`
+        does, read in one grouped query: the row's updated_at, its proposal
+        counter, the client fields it shows and the public questions' newest
+        activity. Returns None if the competition does not exist.
+        """
+        public = Q(questions__is_public=True)
+        return self.filter(pk=pk).values(
+            'updated_at', 'submission_deadline', 'stats__proposal_count',
+            'client__username', 'client__profile_picture',
+        ).annotate(
+            public_questions=Count('questions', filter=public),
+            last_asked=Max('questions__created_at', filter=public),
+            last_answered=Max('questions__answered_at', filter=public),
+        ).order_by('updated_at').first()
+
+
+def _count_subquery(queryset):
+    """Wrap a queryset filtered on OuterRef('pk') into a COUNT subquery."""
+    counts = (
+        queryset.order_by()
+        .values('competition')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
 class Competition(models.Model):
     """Model representing a freelance competition/job posting."""
 
@@ -32,6 +89,12 @@ class Competition(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='DRAFT')
     category = models.CharField(max_length=100)
     tags = models.TextField(blank=True, default='')
+    normalized_tags = models.ManyToManyField(
+        'Tag',
+        through='CompetitionTag',
+        related_name='competitions',
+        blank=True,
+    )
     max_proposals = models.PositiveIntegerField(null=True, blank=True)
     allow_questions = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -49,20 +112,65 @@ class Competition(models.Model):
         related_name='won_for',
     )
 
+    objects = CompetitionQuerySet.as_manager()
+
     class Meta:
         db_table = 'competitions_competition'
         ordering = ['-created_at']
+        indexes = [
+            # Lifecycle commands: status='OPEN' AND submission_deadline < now
+            models.Index(fields=['status', 'submission_deadline'], name='comp_status_deadline_idx'),
+            # Public list: status='OPEN' ORDER BY created_at DESC
+            models.Index(fields=['status', '-created_at'], name='comp_status_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.client.username}"
 
+    # Fields the tag links and the tag cloud depend on (see signals.sync_competition_tags)
+    TAG_STATE_FIELDS = ('tags', 'status')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_tag_state = instance._tag_state(cls.TAG_STATE_FIELDS)
+        return instance
+
+    def _tag_state(self, fields):
+        return {field: self.__dict__.get(field) for field in fields}
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        saved = [
+            field for field in self.TAG_STATE_FIELDS
+            if update_fields is None or field in update_fields
+        ]
+        self._saved_tag_state = {
+            **getattr(self, '_saved_tag_state', {}), **self._tag_state(saved),
+        }
+
+    def tag_state_changed(self, field, update_fields=None):
+        """
+        Whether a save with `update_fields` wrote a new value of `field` (one
+        of TAG_STATE_FIELDS). Call from post_save, before save() records
+        the new state. Unknown previous values count as changed.
+        """
+        if update_fields is not None and field not in update_fields:
+            return False
+        saved = getattr(self, '_saved_tag_state', {})
+        return field not in saved or saved[field] != getattr(self, field)
+
     @property
     def is_open(self):
         return self.status == 'OPEN' and self.submission_deadline > timezone.now()
 
     @property
     def proposal_count(self):
-        return self.proposals.count()
+        # Use the with_stats() annotation when the queryset provided it
+        if hasattr(self, 'num_proposals'):
+            return self.num_proposals
+        return CompetitionStats.for_competition(self).proposal_count
 
 
 class CompetitionQuestion(models.Model):
@@ -117,3 +225,149 @@ class CompetitionBookmark(models.Model):
 
     def __str__(self):
         return f"{self.user.username} bookmarked {self.competition.title}"
+
+
+class CompetitionStats(models.Model):
+    """Denormalized per-competition counters for performance."""
+
+    COUNTER_FIELDS = (
+        'proposal_count', 'active_proposal_count', 'bookmark_count',
+        'question_count', 'review_count',
+    )
+
+    competition = models.OneToOneField(
+        Competition,
+        on_delete=models.CASCADE,
+        related_name='stats',
+        primary_key=True,
+    )
+    proposal_count = models.PositiveIntegerField(default=0)
+    active_proposal_count = models.PositiveIntegerField(default=0)
+    bookmark_count = models.PositiveIntegerField(default=0)
+    question_count = models.PositiveIntegerField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'competitions_competitionstats'
+        verbose_name_plural = 'competition stats'
+
+    def __str__(self):
+        return f"Stats for {self.competition_id}"
+
+    @classmethod
+    def adjust(cls, competition_id, **deltas):
+        """
+        Apply F() increments/decrements to the counters of a competition.
+        Runs inside the caller's transaction. Missing rows are left alone;
+        they are rebuilt from live counts on first read.
+        """
+        updates = {}
+        for field, delta in deltas.items():
+            if not delta:
+                continue
+            if delta > 0:
+                updates[field] = F(field) + delta
+            else:
+                # Never go below zero on PositiveIntegerField columns
+                updates[field] = Case(
+                    When(**{f'{field}__gte': -delta}, then=F(field) + delta),
+                    default=Value(0),
+                )
+        if updates:
+            cls.objects.filter(competition_id=competition_id).update(**updates)
+
+    @classmethod
+    def compute(cls, competitions):
+        """Build unsaved stats objects from live COUNT queries."""
+        from proposals.models import Proposal
+        from feedback.models import Review
+
+        proposals = Proposal.objects.filter(competition=OuterRef('pk'))
+        rows = competitions.order_by().annotate(
+            live_proposal_count=_count_subquery(proposals),
+            live_active_proposal_count=_count_subquery(
+                proposals.exclude(status='WITHDRAWN')
+            ),
+            live_bookmark_count=_count_subquery(
+                CompetitionBookmark.objects.filter(competition=OuterRef('pk'))
+            ),
+            live_question_count=_count_subquery(
+                CompetitionQuestion.objects.filter(competition=OuterRef('pk'))
+            ),
+            live_review_count=_count_subquery(
+                Review.objects.filter(competition=OuterRef('pk'))
+            ),
+        ).values('pk', *[f'live_{field}' for field in cls.COUNTER_FIELDS])
+
+        return [
+            cls(
+                competition_id=row['pk'],
+                **{field: row[f'live_{field}'] for field in cls.COUNTER_FIELDS},
+            )
+            for row in rows
+        ]
+
+    @classmethod
+    def save_many(cls, stats_list):
+        """Insert or overwrite stats rows in one statement."""
+        return cls.objects.bulk_create(
+            stats_list,
+            update_conflicts=True,
+            unique_fields=['competition'],
+            update_fields=[*cls.COUNTER_FIELDS, 'updated_at'],
+        )
+
+    @classmethod
+    def rebuild_for(cls, competition_id):
+        """Recalculate and save the counters for a single competition."""
+        stats_list = cls.compute(Competition.objects.filter(pk=competition_id))
+        cls.save_many(stats_list)
+        return stats_list[0] if stats_list else None
+
+    @classmethod
+    def for_competition(cls, competition):
+        """Return the stats row for a competition, rebuilding it if missing."""
+        try:
+            return competition.stats
+        except cls.DoesNotExist:
+            return cls.rebuild_for(competition.pk)
+
+
+class Tag(models.Model):
+    """Normalized tag, identified by its slug (the normalize_label() form of its name)."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=50)
+    slug = models.CharField(max_length=50, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'competitions_tag'
+        ordering = ['slug']
+
+    def __str__(self):
+        return self.name
+
+
+class CompetitionTag(models.Model):
+    """Link between a competition and a tag, parsed from Competition.tags."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    competition = models.ForeignKey(
+        Competition, on_delete=models.CASCADE, related_name='tag_links'
+    )
+    tag = models.ForeignKey(
+        Tag, on_delete=models.CASCADE, related_name='competition_links'
+    )
+
+    class Meta:
+        db_table = 'competitions_competitiontag'
+        unique_together = ('competition', 'tag')
+        indexes = [
+            # Inverted index: tag -> competitions
+            models.Index(fields=['tag', 'competition'], name='comptag_tag_competition_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.competition_id} tagged {self.tag_id}"
@@ -0,0 +1,201 @@
+"""
+In-process scheduler for competition lifecycle jobs, run by `run_scheduler`.
+
+Upcoming submission deadlines are kept in a min-heap, so the scheduler
+sleeps until exactly the next deadline (or reminder time) instead of
+scanning the table on a timer. Deadlines are loaded one window at a time
+through the (status, submission_deadline) index, and saved competitions
+are published on SCHEDULE_CHANNEL so a running scheduler picks up new or
+moved deadlines from the web servers as soon as the broker relays them
+(within NOTIFICATION_BROKER_POLL_INTERVAL with the DatabaseBroker). The
+periodic resync catches anything a broker outage dropped.
+
+The jobs themselves are the set-based CompetitionLifecycleService calls,
+so a stale or duplicate wake-up does no harm.
+"""
+import asyncio
+import heapq
+import queue
+import threading
+from datetime import timedelta
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from notifications.pubsub import get_broker
+from .lifecycle import REMINDER_LEAD, CompetitionLifecycleService
+from .models import Competition
+
+SCHEDULE_CHANNEL = 'competitions:schedule'
+
+CLOSE = 'close'
+REMIND = 'remind'
+
+
+def publish_schedule_change(competition):
+    """Tell running schedulers that a competition's status or deadline may have changed."""
+    get_broker().publish(SCHEDULE_CHANNEL, {
+        'id': str(competition.pk),
+        'status': competition.status,
+        'submission_deadline': competition.submission_deadline.isoformat(),
+    })
+
+
+class DeadlineScheduler:
+    """
+    Min-heap of (when, job, competition id) entries. Entries are not
+    removed when a competition changes; `deadlines` holds the current
+    deadline of every scheduled competition and stale entries are skipped
+    when they reach the top.
+    """
+
+    def __init__(self, horizon=3600, window_size=5000, resync_interval=300, batch_size=500):
+        self.horizon = timedelta(seconds=horizon)
+        self.window_size = window_size
+        self.resync_interval = timedelta(seconds=resync_interval)
+        self.batch_size = batch_size
+        self.heap = []
+        self.deadlines = {}
+        self.loaded_until = None
+        self.next_resync = None
+        self.changes = queue.Queue()
+        self.closed = 0
+        self.reminded = 0
+
+    # ─── Heap ─────────────────────────────────────────────────────────────────
+
+    def schedule(self, competition_id, deadline, now):
+        """(Re)schedule the close and reminder jobs of an OPEN competition."""
+        if self.deadlines.get(competition_id) == deadline:
+            return
+        self.deadlines[competition_id] = deadline
+        heapq.heappush(self.heap, (deadline, CLOSE, competition_id, deadline))
+        remind_at = deadline - REMINDER_LEAD
+        if remind_at > now:
+            heapq.heappush(self.heap, (remind_at, REMIND, competition_id, deadline))
+
+    def unschedule(self, competition_id):
+        self.deadlines.pop(competition_id, None)
+
+    def apply_change(self, message, now):
+        """Update the heap from a SCHEDULE_CHANNEL message."""
+        competition_id = message['id']
+        deadline = parse_datetime(message['submission_deadline'])
+        if message['status'] != 'OPEN':
+            self.unschedule(competition_id)
+        elif self.loaded_until is None or deadline <= self.loaded_until:
+            self.schedule(competition_id, deadline, now)
+        else:
+            # Beyond the loaded window; the load that reaches it picks it up
+            self.unschedule(competition_id)
+
+    def next_run_at(self):
+        """Time of the next live heap entry, or None."""
+        while self.heap:
+            when, job, competition_id, deadline = self.heap[0]
+            if self.deadlines.get(competition_id) == deadline:
+                return when
+            heapq.heappop(self.heap)
+        return None
+
+    def pop_due(self, now):
+        """Remove and return the set of jobs due at `now`."""
+        due = set()
+        while (when := self.next_run_at()) is not None and when <= now:
+            _, job, competition_id, _ = heapq.heappop(self.heap)
+            due.add(job)
+            if job == CLOSE:
+                self.deadlines.pop(competition_id, None)
+        return due
+
+    # ─── Database ─────────────────────────────────────────────────────────────
+
+    def load(self, now):
+        """
+        Rebuild the heap from OPEN competitions whose close or reminder
+        falls within the horizon, at most `window_size` of them.
+        """
+        until = now + REMINDER_LEAD + self.horizon
+        rows = list(
+            Competition.objects.filter(
+                status='OPEN', submission_deadline__lte=until,
+            ).order_by('submission_deadline').values_list(
+                'pk', 'submission_deadline',
+            )[:self.window_size]
+        )
+        if len(rows) == self.window_size:
+            # Window full: only trust it up to the last deadline it holds
+            until = rows[-1][1]
+        self.heap = []
+        self.deadlines = {}
+        for pk, deadline in rows:
+            self.schedule(str(pk), deadline, now)
+        self.loaded_until = until
+        self.next_resync = now + self.resync_interval
+
+    def run_due(self, now):
+        """Run the jobs that are due and reload the window when needed."""
+        due = self.pop_due(now)
+        if CLOSE in due:
+            self.closed += CompetitionLifecycleService.close_expired(batch_size=self.batch_size)
+        if REMIND in due or now >= self.next_resync:
+            # The resync also reminds users who bookmarked since the last reminder run
+            self.reminded += CompetitionLifecycleService.send_deadline_reminders()[0]
+        if now >= self.next_resync or now >= self.loaded_until:
+            self.load(now)
+
+    # ─── Loop ─────────────────────────────────────────────────────────────────
+
+    def seconds_until_next(self, now):
+        wake_at = min(filter(None, (self.next_run_at(), self.next_resync, self.loaded_until)))
+        return max(0.0, (wake_at - now).total_seconds())
+
+    def wait_for_changes(self, timeout):
+        """Block up to `timeout` seconds for a change, then apply every queued one."""
+        try:
+            message = self.changes.get(timeout=timeout)
+        except queue.Empty:
+            return
+        while True:
+            self.apply_change(message, timezone.now())
+            try:
+                message = self.changes.get_nowait()
+            except queue.Empty:
+                return
+
+    def run(self, max_runtime=None):
+        """Run until interrupted, or for `max_runtime` seconds."""
+        stop = threading.Event()
+        listening = threading.Event()
+        listener = threading.Thread(target=self._listen, args=(stop, listening), daemon=True)
+        listener.start()
+        listening.wait(timeout=5)
+
+        started = timezone.now()
+        deadline = started + timedelta(seconds=max_runtime) if max_runtime is not None else None
+        try:
+            now = started
+            # Catch up on anything that came due while no scheduler was running
+            self.closed += CompetitionLifecycleService.close_expired(batch_size=self.batch_size)
+            self.reminded += CompetitionLifecycleService.send_deadline_reminders()[0]
+            self.load(now)
+            while deadline is None or now < deadline:
+                timeout = self.seconds_until_next(now)
+                if deadline is not None:
+                    timeout = min(timeout, (deadline - now).total_seconds())
+                self.wait_for_changes(timeout)
+                now = timezone.now()
+                self.run_due(now)
+        finally:
+            stop.set()
+            listener.join(timeout=5)
+
+    def _listen(self, stop, listening):
+        """Forward SCHEDULE_CHANNEL messages to `changes` from a private event loop."""
+        async def forward():
+            with get_broker().subscribe(SCHEDULE_CHANNEL) as subscription:
+                listening.set()
+                while not stop.is_set():
+                    message = await subscription.get(timeout=0.5)
+                    if message is not None:
+                        self.changes.put(message)
+
+        asyncio.run(forward())
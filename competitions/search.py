@@ -0,0 +1,179 @@
+"""
+Full-text search over competitions.
+
+MySQL uses a FULLTEXT index on (title, description, category, tags) with
+MATCH ... AGAINST. SQLite (tests, local development) uses an FTS5 table
+kept in sync by triggers. Both are created by migration
+0005_competition_fulltext. Other databases fall back to icontains.
+
+SQLite drops the triggers when it rebuilds competitions_competition, which
+it does for most ALTERs; a migration that alters that table must drop and
+recreate them around the change, with its own copy of the DDL in 0005.
+
+Queries are parsed into terms once (parse_search_terms) and translated
+to each backend's syntax, so both accept the same input and match the same
+way: words and "exact phrases", optionally +required, -excluded or
+prefix*. `+` and `-` are only operators at the start of a term; words
+joined by hyphens or dots (e-commerce, node.js) are searched as phrases. With required terms a competition must match all of them;
+otherwise it must match any term. Anything else in the query (stray
+quotes, @, parentheses, ...) is ignored rather than passed to the engine,
+which would reject it as a syntax error.
+"""
+import re
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+
+SEARCH_FIELDS = ('title', 'description', 'category', 'tags')
+FTS_TABLE = 'competitions_competition_fts'
+
+# An operator only counts at the start of the query or after whitespace,
+# so the hyphen in `e-commerce` does not exclude `commerce`
+_TERM = re.compile(r'(?:(?:^|(?<=\s))([+-]))?("[^"]+"|\w+(?:[-.]\w+)*\*?)')
+_WORD = re.compile(r'\w+')
+
+
+# ─── Queries ──────────────────────────────────────────────────────────────────
+
+def parse_search_terms(query):
+    """
+    Split a search string into (required, optional, excluded) lists of
+    (words, prefix) terms, where `words` is a tuple of one word or a
+    phrase's words. Returns None if nothing positive is left to match.
+    Optional terms are dropped when there are required ones: they would
+    not narrow the match.
+    """
+    required, optional, excluded = [], [], []
+    for operator, term in _TERM.findall(query):
+        words = tuple(_WORD.findall(term))
+        if not words:
+            continue
+        # Prefix matching applies to single words only
+        prefix = term.endswith('*') and len(words) == 1
+        {'+': required, '-': excluded}.get(operator, optional).append((words, prefix))
+
+    if required:
+        optional = []
+    elif not optional:
+        return None
+    return required, optional, excluded
+
+
+def _fts5_query(terms):
+    """FTS5 MATCH expression for parsed terms, quoting every term."""
+    required, optional, excluded = terms
+
+    def token(words, prefix):
+        return '"' + ' '.join(words) + '"' + ('*' if prefix else '')
+
+    if required:
+        expression = ' AND '.join(token(*term) for term in required)
+    else:
+        expression = ' OR '.join(token(*term) for term in optional)
+    if excluded:
+        # NOT binds tighter than AND and OR: exclude from the whole match, as MySQL does
+        expression = f'({expression})'
+    for term in excluded:
+        expression = f'{expression} NOT {token(*term)}'
+    return expression
+
+
+def _mysql_boolean_query(terms):
+    """MySQL boolean-mode AGAINST expression for parsed terms."""
+    required, optional, excluded = terms
+
+    def token(words, prefix):
+        if len(words) > 1:
+            return '"' + ' '.join(words) + '"'
+        return words[0] + ('*' if prefix else '')
+
+    return ' '.join(
+        [f'+{token(*term)}' for term in required]
+        + [token(*term) for term in optional]
+        + [f'-{token(*term)}' for term in excluded]
+    )
+
+
+def search_competitions(queryset, query):
+    """
+    Filter `queryset` to competitions matching `query` and annotate each
+    row with a `relevance` score (higher is better).
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    vendor = connection.vendor
+    table = queryset.model._meta.db_table
+
+    if vendor in ('mysql', 'sqlite'):
+        terms = parse_search_terms(query)
+        if terms is None:
+            return queryset.none()
+
+    if vendor == 'mysql':
+        columns = ', '.join(f'{table}.{field}' for field in SEARCH_FIELDS)
+        match = f'MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE)'
+        against = _mysql_boolean_query(terms)
+        return queryset.filter(
+            RawSQL(match, [against], output_field=BooleanField())
+        ).annotate(
+            relevance=RawSQL(match, [against], output_field=FloatField())
+        )
+
+    if vendor == 'sqlite':
+        fts_query = _fts5_query(terms)
+        return queryset.filter(
+            pk__in=RawSQL(
+                f'SELECT competition_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+                [fts_query],
+            )
+        ).annotate(
+            # bm25() is lower for better matches
+            relevance=RawSQL(
+                f'SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND competition_id = {table}.id',
+                [fts_query],
+                output_field=FloatField(),
+            )
+        )
+
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f'{field}__icontains': query})
+    return queryset.filter(condition).annotate(relevance=Value(0.0, output_field=FloatField()))
+
+
+class CompetitionSearchFilter(BaseFilterBackend):
+    """
+    Full-text search on `?q=` (or the older `?search=`). Results are ordered
+    by relevance unless the client passes `ordering`. List it after
+    OrderingFilter so the relevance ordering is not replaced by the default.
+    """
+    search_params = ('q', 'search')
+
+    def get_search_query(self, request):
+        for param in self.search_params:
+            value = request.query_params.get(param, '').strip()
+            if value:
+                return value
+        return ''
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_search_query(request)
+        if not query:
+            return queryset
+        queryset = search_competitions(queryset, query)
+        if not request.query_params.get('ordering'):
+            queryset = queryset.order_by('-relevance', '-created_at')
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': 'q',
+            'required': False,
+            'in': 'query',
+            'description': 'Full-text search over title, description, category and tags, ranked by relevance.',
+            'schema': {'type': 'string'},
+        }]
@@ -1,6 +1,12 @@
 from rest_framework import serializers
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
 from django.utils import timezone
-from .models import Competition, CompetitionQuestion, CompetitionBookmark
+from freelance_arena.mixins import EagerLoadingSerializerMixin
+from freelance_arena.pagination import HybridPagination
+from .models import Competition, CompetitionQuestion, CompetitionBookmark, Tag
+from .tags import parse_tags
 
 
 class CompetitionQuestionReadSerializer(serializers.ModelSerializer):
@@ -18,8 +24,10 @@ class CompetitionQuestionReadSerializer(serializers.ModelSerializer):
         ]
 
 
-class CompetitionListSerializer(serializers.ModelSerializer):
+class CompetitionListSerializer(EagerLoadingSerializerMixin, serializers.ModelSerializer):
     """Lightweight serializer for competition list views."""
+    select_related_fields = ('client',)
+
     client_username = serializers.CharField(source='client.username', read_only=True)
     proposal_count = serializers.ReadOnlyField()
     is_open = serializers.ReadOnlyField()
@@ -33,15 +41,35 @@ class CompetitionListSerializer(serializers.ModelSerializer):
         ]
 
 
-class CompetitionDetailSerializer(serializers.ModelSerializer):
-    """Full detail serializer for a single competition."""
+class TagSerializer(serializers.ModelSerializer):
+    """Normalized tag."""
+
+    class Meta:
+        model = Tag
+        fields = ['name', 'slug']
+
+
+QUESTION_ORDERING = ('-created_at', '-id')
+
+
+class CompetitionDetailSerializer(EagerLoadingSerializerMixin, serializers.ModelSerializer):
+    """
+    Full detail serializer for a single competition. Embeds the newest
+    COMPETITION_DETAIL_QUESTION_LIMIT public questions; `questions_cursor`
+    fetches the next page from the question list.
+    """
+    select_related_fields = ('client',)
+    prefetch_related_fields = ('normalized_tags',)
+
     client_username = serializers.CharField(source='client.username', read_only=True)
     client_profile_picture = serializers.ImageField(
         source='client.profile_picture', read_only=True
     )
     proposal_count = serializers.ReadOnlyField()
     is_open = serializers.ReadOnlyField()
+    tag_list = TagSerializer(source='normalized_tags', many=True, read_only=True)
     questions = serializers.SerializerMethodField()
+    questions_cursor = serializers.SerializerMethodField()
 
     class Meta:
         model = Competition
@@ -49,14 +77,55 @@ class CompetitionDetailSerializer(serializers.ModelSerializer):
             'id', 'client', 'client_username', 'client_profile_picture',
             'title', 'description', 'requirements', 'budget', 'currency',
             'deadline', 'submission_deadline', 'status', 'category', 'tags',
-            'max_proposals', 'allow_questions', 'proposal_count', 'is_open',
+            'tag_list', 'max_proposals', 'allow_questions', 'proposal_count', 'is_open',
             'winner', 'winning_proposal',
-            'created_at', 'updated_at', 'questions',
+            'created_at', 'updated_at', 'questions', 'questions_cursor',
         ]
 
+    @staticmethod
+    def questions_prefetch():
+        """First page of public questions (plus one to detect more) with both users joined."""
+        limit = settings.COMPETITION_DETAIL_QUESTION_LIMIT
+        return Prefetch(
+            'questions',
+            queryset=CompetitionQuestion.objects.filter(is_public=True)
+            .select_related('asked_by', 'answered_by')
+            .order_by(*QUESTION_ORDERING)[:limit + 1],
+            to_attr='public_question_page',
+        )
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return super().setup_eager_loading(queryset).prefetch_related(cls.questions_prefetch())
+
+    def _question_page(self, obj):
+        # Instances from create/update views were not loaded through setup_eager_loading
+        if not hasattr(obj, 'public_question_page'):
+            prefetch_related_objects([obj], self.questions_prefetch())
+        return obj.public_question_page
+
     def get_questions(self, obj):
-        public_questions = obj.questions.filter(is_public=True)
-        return CompetitionQuestionReadSerializer(public_questions, many=True).data
+        page = self._question_page(obj)[:settings.COMPETITION_DETAIL_QUESTION_LIMIT]
+        return CompetitionQuestionReadSerializer(page, many=True).data
+
+    def get_questions_cursor(self, obj):
+        page = self._question_page(obj)
+        limit = settings.COMPETITION_DETAIL_QUESTION_LIMIT
+        if len(page) <= limit:
+            return None
+        return HybridPagination.encode_cursor(page[limit - 1], QUESTION_ORDERING)
+
+
+class CompetitionBulkCreateSerializer(serializers.ListSerializer):
+    """Creates a list of competitions with bulk inserts (see competitions.bulk)."""
+
+    def create(self, validated_data):
+        from .bulk import create_competitions
+        client = self.context['request'].user
+        return create_competitions([
+            Competition(**attrs, client_id=client.pk, status='DRAFT')
+            for attrs in validated_data
+        ])
 
 
 class CompetitionCreateSerializer(serializers.ModelSerializer):
@@ -64,6 +133,7 @@ class CompetitionCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Competition
+        list_serializer_class = CompetitionBulkCreateSerializer
         fields = [
             'id', 'title', 'description', 'requirements', 'budget',
             'currency', 'deadline', 'submission_deadline', 'category',
@@ -91,6 +161,13 @@ class CompetitionCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('Max proposals must be a positive number.')
         return value
 
+    def validate_tags(self, value):
+        try:
+            parse_tags(value, strict=True)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+        return value
+
     def validate(self, data):
         submission_deadline = data.get('submission_deadline')
         deadline = data.get('deadline')
@@ -137,6 +214,13 @@ class CompetitionUpdateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('Max proposals must be a positive number.')
         return value
 
+    def validate_tags(self, value):
+        try:
+            parse_tags(value, strict=True)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+        return value
+
     def validate(self, data):
         instance = self.instance
         submission_deadline = data.get('submission_deadline', instance.submission_deadline if instance else None)
@@ -199,7 +283,8 @@ class CompetitionQuestionSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data['asked_by'] = self.context['request'].user
         validated_data['competition'] = self.context['competition']
-        return super().create(validated_data)
+        with transaction.atomic():
+            return super().create(validated_data)
 
 
 class CompetitionAnswerSerializer(serializers.Serializer):
@@ -1,6 +1,8 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import Competition
+from freelance_arena.response_cache import invalidate_responses
+from .models import Competition, CompetitionBookmark, CompetitionQuestion, CompetitionStats
 
 
 @receiver(post_save, sender=Competition)
@@ -8,15 +10,73 @@ def competition_status_changed(sender, instance, created, **kwargs):
     """When competition status changes to OPEN, notify bookmarked users."""
     if not created and instance.status == 'OPEN':
         from notifications.utils import NotificationService
-        from .models import CompetitionBookmark
-
-        bookmarks = CompetitionBookmark.objects.filter(competition=instance)
-        for bookmark in bookmarks:
-            from notifications.models import Notification
-            Notification.objects.create(
-                recipient=bookmark.user,
-                notification_type='COMPETITION_OPENED',
-                title=f'Competition Now Open: {instance.title}',
-                message=f'The competition "{instance.title}" you bookmarked is now open for submissions.',
-                related_competition_id=instance.id,
-            )
+        NotificationService.notify_competition_opened(instance)
+
+
+@receiver(post_save, sender=Competition)
+def create_competition_stats(sender, instance, created, **kwargs):
+    """Create the counters row alongside a new competition."""
+    if created:
+        CompetitionStats.objects.get_or_create(competition=instance)
+
+
+@receiver(post_save, sender=Competition)
+def sync_competition_tags(sender, instance, created, update_fields=None, **kwargs):
+    """Keep the normalized tag links in step with the `tags` text."""
+    from .tags import invalidate_tag_cloud, sync_competition_tags as sync_tags
+    if created:
+        if instance.tags:
+            sync_tags(instance)
+        return
+
+    synced = instance.tag_state_changed('tags', update_fields) and sync_tags(instance)
+    if not synced and instance.tags and instance.tag_state_changed('status', update_fields):
+        # The competition moves in or out of the tag cloud (OPEN competitions only)
+        invalidate_tag_cloud()
+
+
+@receiver(post_save, sender=Competition)
+def publish_competition_schedule(sender, instance, **kwargs):
+    """Let a running scheduler pick up new or moved deadlines and status changes."""
+    from .scheduler import publish_schedule_change
+    transaction.on_commit(lambda: publish_schedule_change(instance), robust=True)
+
+
+@receiver(post_save, sender=Competition)
+@receiver(post_delete, sender=Competition)
+def expire_competition_responses(sender, instance, **kwargs):
+    """Drop cached public list/detail responses that include this competition."""
+    invalidate_responses('competitions', f'competition:{instance.pk}')
+
+
+@receiver(post_save, sender=CompetitionQuestion)
+@receiver(post_delete, sender=CompetitionQuestion)
+def expire_question_responses(sender, instance, **kwargs):
+    """Drop the cached detail and question list of the question's competition."""
+    invalidate_responses(f'competition:{instance.competition_id}')
+
+
+@receiver(post_save, sender=CompetitionBookmark)
+def bookmark_created(sender, instance, created, **kwargs):
+    """Count a new bookmark."""
+    if created:
+        CompetitionStats.adjust(instance.competition_id, bookmark_count=1)
+
+
+@receiver(post_delete, sender=CompetitionBookmark)
+def bookmark_deleted(sender, instance, **kwargs):
+    """Uncount a removed bookmark."""
+    CompetitionStats.adjust(instance.competition_id, bookmark_count=-1)
+
+
+@receiver(post_save, sender=CompetitionQuestion)
+def question_created(sender, instance, created, **kwargs):
+    """Count a new question."""
+    if created:
+        CompetitionStats.adjust(instance.competition_id, question_count=1)
+
+
+@receiver(post_delete, sender=CompetitionQuestion)
+def question_deleted(sender, instance, **kwargs):
+    """Uncount a removed question."""
+    CompetitionStats.adjust(instance.competition_id, question_count=-1)
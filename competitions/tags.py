@@ -0,0 +1,127 @@
+"""
+Normalized competition tags.
+
+`Competition.tags` stays the comma-separated text clients send; it is
+parsed into Tag/CompetitionTag rows whenever a competition is saved, so
+tag filters and the tag cloud are served from the (tag, competition) index.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from freelance_arena.utils import cache_is_shared, parse_comma_separated
+
+TAG_CLOUD_CACHE_KEY = 'competitions:tag-cloud:{limit}'
+TAG_CLOUD_VERSION_KEY = 'competitions:tag-cloud:version'
+
+
+def parse_tags(text, strict=False):
+    """
+    Return {slug: name} for a comma-separated tag string, in input order.
+    With `strict`, a tag that normalizes to nothing raises ValueError.
+    """
+    return parse_comma_separated(text, strict=strict)
+
+
+def parse_slugs(value):
+    """Slugs from a comma-separated filter value; raises ValueError for an invalid tag."""
+    return list(parse_tags(value, strict=True))
+
+
+def sync_competition_tags(competition):
+    """Make the competition's CompetitionTag rows match its `tags` text."""
+    from .models import CompetitionTag, Tag
+
+    wanted = parse_tags(competition.tags)
+    current = dict(
+        CompetitionTag.objects.filter(
+            competition=competition
+        ).values_list('tag__slug', 'pk')
+    )
+    removed = [pk for slug, pk in current.items() if slug not in wanted]
+    added = [slug for slug in wanted if slug not in current]
+    if not removed and not added:
+        return False
+
+    if removed:
+        CompetitionTag.objects.filter(pk__in=removed).delete()
+    if added:
+        Tag.objects.bulk_create(
+            [Tag(slug=slug, name=wanted[slug]) for slug in added],
+            ignore_conflicts=True,
+        )
+        tag_ids = Tag.objects.filter(slug__in=added).values_list('pk', flat=True)
+        CompetitionTag.objects.bulk_create(
+            [CompetitionTag(competition=competition, tag_id=tag_id) for tag_id in tag_ids],
+            ignore_conflicts=True,
+        )
+    invalidate_tag_cloud()
+    return True
+
+
+def link_new_competition_tags(competitions):
+    """
+    Create the CompetitionTag rows of newly inserted competitions (which
+    have none yet) with one Tag and one CompetitionTag bulk insert.
+    """
+    from .models import CompetitionTag, Tag
+
+    wanted = {competition.pk: parse_tags(competition.tags) for competition in competitions}
+    names = {}
+    for labels in wanted.values():
+        for slug, name in labels.items():
+            names.setdefault(slug, name)
+    if not names:
+        return False
+
+    Tag.objects.bulk_create(
+        [Tag(slug=slug, name=name) for slug, name in names.items()],
+        ignore_conflicts=True,
+    )
+    tag_ids = dict(Tag.objects.filter(slug__in=names).values_list('slug', 'pk'))
+    CompetitionTag.objects.bulk_create(
+        [
+            CompetitionTag(competition_id=competition_id, tag_id=tag_ids[slug])
+            for competition_id, labels in wanted.items()
+            for slug in labels
+        ],
+        ignore_conflicts=True,
+    )
+    invalidate_tag_cloud()
+    return True
+
+
+def invalidate_tag_cloud():
+    """Drop every cached tag cloud by moving to a new version."""
+    if not cache_is_shared():
+        return
+    try:
+        cache.incr(TAG_CLOUD_VERSION_KEY)
+    except ValueError:
+        cache.set(TAG_CLOUD_VERSION_KEY, 1, None)
+
+
+def tag_cloud(limit):
+    """
+    Tags used by OPEN competitions with their counts, most used first.
+    Cached only with a shared cache, which every process invalidates.
+    """
+    from .models import Tag
+
+    def count_tags():
+        return list(
+            Tag.objects.filter(
+                competition_links__competition__status='OPEN'
+            ).annotate(
+                count=Count('competition_links')
+            ).order_by('-count', 'slug').values('name', 'slug', 'count')[:limit]
+        )
+
+    if not cache_is_shared():
+        return count_tags()
+    version = cache.get_or_set(TAG_CLOUD_VERSION_KEY, 1, None)
+    key = TAG_CLOUD_CACHE_KEY.format(limit=limit)
+    cloud = cache.get(key, version=version)
+    if cloud is None:
+        cloud = count_tags()
+        cache.set(key, cloud, settings.TAG_CLOUD_CACHE_TIMEOUT, version=version)
+    return cloud
@@ -1,13 +1,15 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.utils import timezone
 from datetime import timedelta
 from accounts.models import User
-from .models import Competition
+from freelance_arena.testing import QueryCountAssertionsMixin, shared_cache, sync_last_seen
+from .models import Competition, CompetitionBookmark, CompetitionStats
 
 
-class CompetitionsTestCase(TestCase):
+@sync_last_seen
+class CompetitionsTestCase(QueryCountAssertionsMixin, TestCase):
     """Test cases for the competitions app."""
 
     def setUp(self):
@@ -144,3 +146,664 @@ class CompetitionsTestCase(TestCase):
             format='json',
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_proposal_count_uses_annotation(self):
+        """Test that the list endpoint does not run a COUNT query per competition."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from proposals.models import Proposal
+
+        for i in range(3):
+            competition = Competition.objects.create(
+                client=self.client_user,
+                title=f'Competition {i}',
+                description='Test',
+                requirements='Test',
+                budget=500,
+                deadline=timezone.now() + timedelta(days=30),
+                submission_deadline=timezone.now() + timedelta(days=20),
+                category='Test',
+                status='OPEN',
+            )
+            Proposal.objects.create(
+                competition=competition,
+                freelancer=self.freelancer_user,
+                title='Proposal',
+                description='Test',
+                proposed_budget=400,
+                estimated_duration=10,
+            )
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client_api.get('/api/competitions/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['data']['results']
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(item['proposal_count'] == 1 for item in results))
+        # Proposal counts are computed inside the list SELECT
+        proposal_queries = [
+            q for q in ctx.captured_queries if 'proposals_proposal' in q['sql']
+        ]
+        self.assertEqual(len(proposal_queries), 1)
+
+    def _make_open_competition(self, index):
+        return Competition.objects.create(
+            client=self.client_user,
+            title=f'Competition {index}',
+            description='Test',
+            requirements='Test',
+            budget=500,
+            deadline=timezone.now() + timedelta(days=30),
+            submission_deadline=timezone.now() + timedelta(days=20),
+            category='Test',
+            status='OPEN',
+        )
+
+    def test_list_query_count_is_constant(self):
+        """Test that the public list runs a fixed number of queries per page."""
+        self.assertConstantQueryCount(
+            self.client_api, '/api/competitions/', self._make_open_competition,
+        )
+
+    def test_bookmark_list_query_count_is_constant(self):
+        """Test that the bookmark list runs a fixed number of queries per page."""
+        self.client_api.force_authenticate(user=self.freelancer_user)
+
+        def make_bookmark(index):
+            CompetitionBookmark.objects.create(
+                competition=self._make_open_competition(index),
+                user=self.freelancer_user,
+            )
+
+        self.assertConstantQueryCount(
+            self.client_api, '/api/competitions/bookmarks/', make_bookmark,
+        )
+
+    def test_stats_counters_follow_writes(self):
+        """Test that CompetitionStats is maintained by bookmark and question writes."""
+        competition = self._make_open_competition(0)
+        self.client_api.force_authenticate(user=self.freelancer_user)
+
+        self.client_api.post(f'/api/competitions/{competition.id}/bookmark/')
+        self.client_api.post(
+            f'/api/competitions/{competition.id}/questions/',
+            {'question': 'Is a mobile version required?'},
+            format='json',
+        )
+        stats = CompetitionStats.objects.get(competition=competition)
+        self.assertEqual(stats.bookmark_count, 1)
+        self.assertEqual(stats.question_count, 1)
+
+        # Toggling the bookmark again removes it
+        self.client_api.post(f'/api/competitions/{competition.id}/bookmark/')
+        stats.refresh_from_db()
+        self.assertEqual(stats.bookmark_count, 0)
+
+    def test_rebuild_competition_stats_command(self):
+        """Test that the rebuild command reconciles drifted counters."""
+        from io import StringIO
+        from django.core.management import call_command
+
+        competition = self._make_open_competition(0)
+        CompetitionBookmark.objects.create(competition=competition, user=self.freelancer_user)
+        CompetitionStats.objects.filter(competition=competition).update(bookmark_count=42)
+
+        out = StringIO()
+        call_command('rebuild_competition_stats', stdout=out)
+        stats = CompetitionStats.objects.get(competition=competition)
+        self.assertEqual(stats.bookmark_count, 1)
+        self.assertIn('1 were missing or out of date', out.getvalue())
+
+    def test_explain_hot_queries_command(self):
+        """Test that every registered hot query is explained and scans are detected."""
+        from io import StringIO
+        from django.core.management import call_command
+        from freelance_arena.query_audit import HOT_QUERIES, find_full_scans
+
+        out = StringIO()
+        call_command('explain_hot_queries', stdout=out)
+        for name in HOT_QUERIES:
+            self.assertIn(name, out.getvalue())
+
+        self.assertEqual(find_full_scans('SCAN competitions_competition', 'sqlite'), ['competitions_competition'])
+        self.assertEqual(find_full_scans('SCAN competitions_competition USING INDEX comp_status_created_idx', 'sqlite'), [])
+        self.assertEqual(find_full_scans('Seq Scan on proposals_proposal  (cost=0.00..1.01)', 'postgresql'), ['proposals_proposal'])
+        self.assertEqual(
+            find_full_scans('{"query_block": {"table": {"table_name": "feedback_review", "access_type": "ALL"}}}', 'mysql'),
+            ['feedback_review'],
+        )
+
+    def test_full_text_search_ranks_by_relevance(self):
+        """Test that ?q= searches the full-text index and orders by relevance."""
+        from .search import _fts5_query, _mysql_boolean_query, parse_search_terms
+
+        logo = self._make_open_competition(0)
+        logo.title = 'Logo design for a bakery'
+        logo.description = 'We need a logo. The logo should feel warm.'
+        logo.save()
+        mobile = self._make_open_competition(1)
+        mobile.title = 'Mobile app'
+        mobile.description = 'A mobile app with a small logo on the splash screen.'
+        mobile.save()
+        self._make_open_competition(2)
+
+        response = self.client_api.get('/api/competitions/', {'q': 'logo'})
+        ids = [row['id'] for row in response.data['data']['results']]
+        self.assertEqual(ids, [str(logo.id), str(mobile.id)])
+
+        response = self.client_api.get('/api/competitions/', {'q': 'logo -mobile'})
+        ids = [row['id'] for row in response.data['data']['results']]
+        self.assertEqual(ids, [str(logo.id)])
+
+        # The index follows updates
+        mobile.title = 'Bakery mobile app'
+        mobile.save()
+        response = self.client_api.get('/api/competitions/', {'q': 'bakery'})
+        self.assertEqual(response.data['data']['count'], 2)
+        response = self.client_api.get('/api/competitions/', {'search': 'splash'})
+        self.assertEqual(response.data['data']['count'], 1)
+
+        # Input the engines would reject is reduced to the same terms for both backends
+        for query in ('logo@bakery', 'logo "bakery', '(logo) ~bakery <>'):
+            response = self.client_api.get('/api/competitions/', {'q': query})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['data']['count'], 2)
+        terms = parse_search_terms('+logo "brand  identity" illustr* -mobile +@ "')
+        self.assertEqual(_mysql_boolean_query(terms), '+logo -mobile')
+        self.assertEqual(_fts5_query(terms), '("logo") NOT "mobile"')
+        terms = parse_search_terms('"brand identity" illustr* -mobile')
+        self.assertEqual(_mysql_boolean_query(terms), '"brand identity" illustr* -mobile')
+        self.assertEqual(_fts5_query(terms), '("brand identity" OR "illustr"*) NOT "mobile"')
+        self.assertIsNone(parse_search_terms('-mobile @ "'))
+
+        # Hyphens inside a word are part of it, not the exclude operator
+        for query, mysql, fts5 in (
+            ('e-commerce', '"e commerce"', '"e commerce"'),
+            ('full-stack', '"full stack"', '"full stack"'),
+            ('front-end developer', '"front end" developer', '"front end" OR "developer"'),
+            ('C++ developer', 'C developer', '"C" OR "developer"'),
+            ('node.js -php', '"node js" -php', '("node js") NOT "php"'),
+        ):
+            terms = parse_search_terms(query)
+            self.assertEqual(_mysql_boolean_query(terms), mysql, query)
+            self.assertEqual(_fts5_query(terms), fts5, query)
+
+        shop = self._make_open_competition(3)
+        shop.title = 'E-commerce storefront'
+        shop.save()
+        response = self.client_api.get('/api/competitions/', {'q': 'e-commerce'})
+        self.assertEqual([row['id'] for row in response.data['data']['results']], [str(shop.id)])
+
+        # Exclusion applies to every optional term, not only the last one:
+        # the mobile app mentions a logo, so it must not come back through `logo`
+        response = self.client_api.get('/api/competitions/', {'q': 'logo bakery -mobile'})
+        self.assertEqual([row['id'] for row in response.data['data']['results']], [str(logo.id)])
+
+    @shared_cache()
+    def test_tag_filters_and_cloud(self):
+        """Test exact tag matching, AND/OR filters and the cached tag cloud."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        web = self._make_open_competition(0)
+        web.tags = 'Django, React'
+        web.save()
+        api = self._make_open_competition(1)
+        api.tags = 'django, Go, go'
+        api.save()
+        cli = self._make_open_competition(2)
+        cli.tags = 'Go'
+        cli.save()
+
+        def ids(params):
+            response = self.client_api.get('/api/competitions/', params)
+            return {row['id'] for row in response.data['data']['results']}
+
+        self.assertEqual(ids({'tags': 'go'}), {str(api.id), str(cli.id)})
+        self.assertEqual(ids({'tags': 'react,go'}), {str(web.id), str(api.id), str(cli.id)})
+        self.assertEqual(ids({'tags_all': 'django,go'}), {str(api.id)})
+
+        response = self.client_api.get('/api/competitions/tags/')
+        cloud = {row['slug']: row['count'] for row in response.data['data']}
+        self.assertEqual(cloud, {'django': 2, 'go': 2, 'react': 1})
+        with CaptureQueriesContext(connection) as ctx:
+            self.client_api.get('/api/competitions/tags/')
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        # Editing tags updates the links and drops the cached cloud
+        cli.tags = 'rust'
+        cli.save()
+        response = self.client_api.get('/api/competitions/tags/')
+        cloud = {row['slug']: row['count'] for row in response.data['data']}
+        self.assertEqual(cloud, {'django': 2, 'go': 1, 'react': 1, 'rust': 1})
+        response = self.client_api.get(f'/api/competitions/{api.id}/')
+        self.assertEqual(
+            [tag['slug'] for tag in response.data['data']['tag_list']], ['django', 'go']
+        )
+
+        # Saves that leave tags and status alone neither re-read the links nor drop the cloud
+        self.client_api.get('/api/competitions/tags/')
+        api = Competition.objects.get(pk=api.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            api.save(update_fields=['updated_at'])
+            api.title = 'Renamed'
+            api.save()
+            self.client_api.get('/api/competitions/tags/')
+        self.assertFalse([q for q in ctx.captured_queries if 'competitions_competitiontag' in q['sql']])
+
+        # A status change moves the competition out of the cloud
+        api.status = 'CANCELLED'
+        api.save(update_fields=['status'])
+        response = self.client_api.get('/api/competitions/tags/')
+        cloud = {row['slug']: row['count'] for row in response.data['data']}
+        self.assertEqual(cloud, {'django': 1, 'react': 1, 'rust': 1})
+
+    def test_tampered_cursor_is_not_found(self):
+        """Test that cursors whose values do not fit the ordering fields return 404, not 500."""
+        import json
+        from base64 import urlsafe_b64encode
+
+        self._make_open_competition(0)
+
+        def cursor(payload):
+            return urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+        now = timezone.now().isoformat()
+        for token in (
+            cursor({'p': ['notadate', 'x'], 'b': False}),
+            cursor({'p': [now, 'not-a-uuid'], 'b': False}),
+            cursor({'p': [1, 2], 'b': False}),
+            cursor([1, 2]),
+            'not-a-cursor',
+        ):
+            response = self.client_api.get('/api/competitions/', {'cursor': token})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, token)
+
+    def test_tags_keep_symbols_and_reject_empty_labels(self):
+        """Test that tags differing only in symbols or script stay distinct and empty ones are rejected."""
+        from .tags import parse_tags
+
+        self.assertEqual(
+            parse_tags('C++, C#, C, .NET, net, Node.js, 日本語, Go, go,  Machine   Learning'),
+            {
+                'c++': 'C++', 'c#': 'C#', 'c': 'C', '.net': '.NET', 'net': 'net',
+                'node.js': 'Node.js', '日本語': '日本語', 'go': 'Go', 'machine learning': 'Machine Learning',
+            },
+        )
+        with self.assertRaises(ValueError):
+            parse_tags('python, \u200b', strict=True)
+
+        cpp = self._make_open_competition(0)
+        cpp.tags = 'C++'
+        cpp.save()
+        plain = self._make_open_competition(1)
+        plain.tags = 'C, .NET'
+        plain.save()
+        response = self.client_api.get('/api/competitions/', {'tags': 'c++'})
+        self.assertEqual([row['id'] for row in response.data['data']['results']], [str(cpp.id)])
+        response = self.client_api.get('/api/competitions/', {'tags': 'net'})
+        self.assertEqual(response.data['data']['results'], [])
+
+        self.client_api.force_authenticate(user=self.client_user)
+        response = self.client_api.post(
+            '/api/competitions/create/', {**self.competition_data, 'tags': 'python, \u200b\u200d'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('tags', response.data['errors'])
+
+    @shared_cache()
+    def test_public_responses_are_cached_and_revalidated(self):
+        """Test the anonymous response cache, 304 revalidation and invalidation on writes."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from competitions.models import CompetitionQuestion
+
+        competition = self._make_open_competition(0)
+        detail_url = f'/api/competitions/{competition.id}/'
+
+        response = self.client_api.get(detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        etag = response['ETag']
+        # Only the version query runs; the body comes from the cache
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client_api.get(detail_url)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response['ETag'], etag)
+        self.client_api.get('/api/competitions/')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client_api.get('/api/competitions/')
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertNotIn('Last-Modified', response)
+
+        response = self.client_api.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        # Second-resolution dates could hide a change made in the same second
+        response = self.client_api.get(
+            '/api/competitions/', HTTP_IF_MODIFIED_SINCE='Fri, 31 Dec 9999 23:59:59 GMT'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Query params are normalized: same params in another order hit the same entry
+        self.client_api.get('/api/competitions/', {'ordering': 'budget', 'page': 1})
+        response = self.client_api.get('/api/competitions/?page=1&ordering=budget')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+        # A new public question expires the detail and question list
+        CompetitionQuestion.objects.create(
+            competition=competition, asked_by=self.freelancer_user,
+            question='Which stack?', is_public=True,
+        )
+        response = self.client_api.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']['questions']), 1)
+
+        # Editing the competition expires the list
+        competition.title = 'Renamed competition'
+        competition.save()
+        response = self.client_api.get('/api/competitions/?ordering=budget&page=1')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['data']['results'][0]['title'], 'Renamed competition')
+
+        # Authenticated requests bypass the cache
+        self.client_api.force_authenticate(user=self.freelancer_user)
+        response = self.client_api.get(detail_url)
+        self.assertNotIn('X-Cache', response)
+
+    def test_public_responses_are_not_cached_per_process(self):
+        """Test that the response cache and tag cloud are bypassed without a shared cache."""
+        competition = self._make_open_competition(0)
+        competition.tags = 'django'
+        competition.save()
+        self.client_api.get('/api/competitions/')
+        response = self.client_api.get('/api/competitions/')
+        self.assertNotIn('X-Cache', response)
+
+        self.client_api.get('/api/competitions/tags/')
+        # Another process's write would not reach this process's cache
+        Competition.objects.filter(pk=competition.pk).update(status='CANCELLED')
+        response = self.client_api.get('/api/competitions/tags/')
+        self.assertEqual(response.data['data'], [])
+
+    def test_detail_questions_are_prefetched_and_paged(self):
+        """Test that detail questions load in constant queries and page with a cursor."""
+        from django.test import override_settings
+        from competitions.models import CompetitionQuestion
+
+        competition = self._make_open_competition(0)
+        self.client_api.force_authenticate(user=self.freelancer_user)
+
+        def ask(index):
+            CompetitionQuestion.objects.create(
+                competition=competition, asked_by=self.freelancer_user,
+                question=f'Question {index}', answer='Yes',
+                answered_by=self.client_user, answered_at=timezone.now(),
+            )
+
+        with override_settings(COMPETITION_DETAIL_QUESTION_LIMIT=2):
+            self.assertConstantQueryCount(
+                self.client_api, f'/api/competitions/{competition.id}/', ask, sizes=(1, 4),
+            )
+            response = self.client_api.get(f'/api/competitions/{competition.id}/')
+            data = response.data['data']
+            self.assertEqual(
+                [q['question'] for q in data['questions']], ['Question 3', 'Question 2'],
+            )
+            self.assertIsNotNone(data['questions_cursor'])
+
+            response = self.client_api.get(
+                f'/api/competitions/{competition.id}/questions/',
+                {'cursor': data['questions_cursor']},
+            )
+            page = response.data['data']
+            self.assertEqual(
+                [q['question'] for q in page['results']], ['Question 1', 'Question 0'],
+            )
+            self.assertIsNone(page['next'])
+
+    def test_close_expired_competitions_command(self):
+        """Test the batched OPEN -> REVIEW close and its single fan-out event."""
+        from io import StringIO
+        from django.core.management import call_command
+        from notifications.models import Notification, NotificationEvent
+        from proposals.models import Proposal
+
+        expired = []
+        for index in range(3):
+            competition = self._make_open_competition(index)
+            competition.submission_deadline = timezone.now() - timedelta(hours=1)
+            competition.save()
+            expired.append(competition)
+            Proposal.objects.create(
+                competition=competition, freelancer=self.freelancer_user,
+                title='P', description='Test', proposed_budget=100, estimated_duration=5,
+            )
+        still_open = self._make_open_competition(3)
+        NotificationEvent.objects.all().delete()
+
+        out = StringIO()
+        call_command('close_expired_competitions', '--dry-run', stdout=out)
+        self.assertIn('3 competition(s) would be moved', out.getvalue())
+        self.assertEqual(Competition.objects.filter(status='REVIEW').count(), 0)
+
+        call_command('close_expired_competitions', '--batch-size', '2', stdout=out)
+        self.assertIn('3 competition(s) moved from OPEN to REVIEW.', out.getvalue())
+        self.assertEqual(
+            set(Competition.objects.filter(status='REVIEW').values_list('pk', flat=True)),
+            {competition.pk for competition in expired},
+        )
+        still_open.refresh_from_db()
+        self.assertEqual(still_open.status, 'OPEN')
+        # One event per batch, not per competition
+        self.assertEqual(
+            NotificationEvent.objects.filter(event_type='competitions_in_review').count(), 2
+        )
+
+        call_command('run_notification_worker', '--once', '--workers', '1', stdout=StringIO())
+        self.assertEqual(
+            Notification.objects.filter(
+                recipient=self.freelancer_user, title='Competition Moved to Review',
+            ).count(),
+            3,
+        )
+
+    def test_remind_deadlines_runs_fixed_queries_and_dedups(self):
+        """Test that reminders come from one anti-join and are never sent twice."""
+        from io import StringIO
+        from django.core.management import call_command
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from notifications.models import Notification
+        from proposals.models import Proposal
+
+        other = User.objects.create_user(
+            email='other@test.com', username='other', password='testpass123', role='FREELANCER',
+        )
+
+        def closing_soon(index):
+            competition = self._make_open_competition(index)
+            competition.submission_deadline = timezone.now() + timedelta(hours=2)
+            competition.save()
+            CompetitionBookmark.objects.create(competition=competition, user=self.freelancer_user)
+            CompetitionBookmark.objects.create(competition=competition, user=other)
+            return competition
+
+        def run():
+            with CaptureQueriesContext(connection) as ctx:
+                call_command('remind_deadlines', stdout=StringIO())
+            return len(ctx.captured_queries)
+
+        first = closing_soon(0)
+        Proposal.objects.create(
+            competition=first, freelancer=self.freelancer_user,
+            title='P', description='Test', proposed_budget=100, estimated_duration=5,
+        )
+        single_run = run()
+        reminders = Notification.objects.filter(notification_type='COMPETITION_DEADLINE_APPROACHING')
+        self.assertEqual(list(reminders.values_list('recipient_id', flat=True)), [other.id])
+
+        for index in range(1, 4):
+            closing_soon(index)
+        self.assertEqual(run(), single_run)
+        self.assertEqual(reminders.count(), 7)
+
+        # Nothing left to send; a duplicate insert is skipped by the dedup key
+        run()
+        self.assertEqual(reminders.count(), 7)
+        from notifications.utils import NotificationService
+        duplicate = reminders.first()
+        self.assertEqual(NotificationService.create_bulk([
+            Notification(
+                recipient_id=duplicate.recipient_id,
+                notification_type=duplicate.notification_type,
+                title='Again', message='Again',
+                related_competition_id=duplicate.related_competition_id,
+                dedup_key=duplicate.dedup_key,
+            ),
+        ], ignore_conflicts=True), 0)
+        self.assertEqual(reminders.count(), 7)
+
+    def test_run_scheduler_wakes_at_deadlines(self):
+        """Test that the scheduler closes and reminds on time and follows deadline changes."""
+        from io import StringIO
+        from django.core.management import call_command
+        from notifications.models import Notification
+        from competitions.scheduler import CLOSE, DeadlineScheduler
+
+        closing = self._make_open_competition(0)
+        closing.submission_deadline = timezone.now() + timedelta(seconds=0.3)
+        closing.save()
+        reminded = self._make_open_competition(1)
+        reminded.submission_deadline = timezone.now() + timedelta(hours=24, seconds=0.4)
+        reminded.save()
+        CompetitionBookmark.objects.create(competition=reminded, user=self.freelancer_user)
+
+        out = StringIO()
+        call_command('run_scheduler', '--max-runtime', '1.0', stdout=out)
+        self.assertIn('Moved 1 competition(s) to REVIEW and sent 1 deadline reminder(s).', out.getvalue())
+        closing.refresh_from_db()
+        self.assertEqual(closing.status, 'REVIEW')
+        self.assertTrue(Notification.objects.filter(
+            recipient=self.freelancer_user,
+            notification_type='COMPETITION_DEADLINE_APPROACHING',
+            related_competition_id=reminded.id,
+        ).exists())
+
+        # Published changes move and drop heap entries without a reload
+        now = timezone.now()
+        scheduler = DeadlineScheduler()
+        scheduler.load(now)
+        moved = now + timedelta(minutes=5)
+        scheduler.apply_change(
+            {'id': str(reminded.id), 'status': 'OPEN', 'submission_deadline': moved.isoformat()}, now,
+        )
+        self.assertEqual(scheduler.next_run_at(), moved)
+        self.assertEqual(scheduler.pop_due(moved), {CLOSE})
+        scheduler.apply_change(
+            {'id': str(reminded.id), 'status': 'OPEN', 'submission_deadline': moved.isoformat()}, now,
+        )
+        scheduler.apply_change(
+            {'id': str(reminded.id), 'status': 'CANCELLED', 'submission_deadline': moved.isoformat()}, now,
+        )
+        self.assertIsNone(scheduler.next_run_at())
+
+    def test_bulk_create_competitions(self):
+        """Test bulk creating competitions from JSON and NDJSON uploads."""
+        import json
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext, override_settings
+        from .models import CompetitionTag
+
+        self.client_api.force_authenticate(user=self.client_user)
+
+        def items(count, prefix):
+            return [
+                {**self.competition_data, 'title': f'{prefix} {i}', 'tags': 'Python, Django'}
+                for i in range(count)
+            ]
+
+        # The query count does not grow with the number of items
+        self.client_api.get('/api/competitions/mine/')
+        counts = []
+        for size in (2, 6):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client_api.post(
+                    '/api/competitions/bulk/', items(size, f'Batch {size}'), format='json'
+                )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response.data['data']['created'], size)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+        created = Competition.objects.filter(title__startswith='Batch 6')
+        self.assertEqual(created.count(), 6)
+        self.assertTrue(all(c.status == 'DRAFT' and c.client_id == self.client_user.pk for c in created))
+        self.assertEqual(CompetitionStats.objects.filter(competition__in=created).count(), 6)
+        self.assertEqual(CompetitionTag.objects.filter(competition__in=created).count(), 12)
+
+        # One invalid item rejects the whole upload and is reported by index
+        invalid = items(3, 'Invalid')
+        invalid[1]['budget'] = '-5'
+        response = self.client_api.post('/api/competitions/bulk/', invalid, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(response.data['errors']['items']), [1])
+        self.assertIn('budget', response.data['errors']['items'][1])
+        self.assertFalse(Competition.objects.filter(title__startswith='Invalid').exists())
+
+        response = self.client_api.post('/api/competitions/bulk/', self.competition_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # NDJSON is consumed in batches; a later failing batch rolls back earlier ones
+        lines = '\n'.join(json.dumps(item) for item in items(5, 'Stream')) + '\n\n'
+        with override_settings(COMPETITION_BULK_BATCH_SIZE=2):
+            response = self.client_api.post(
+                '/api/competitions/bulk/', lines, content_type='application/x-ndjson'
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(Competition.objects.filter(title__startswith='Stream').count(), 5)
+
+            lines = '\n'.join(json.dumps(item) for item in items(3, 'Broken')) + '\n{not json\n'
+            response = self.client_api.post(
+                '/api/competitions/bulk/', lines, content_type='application/x-ndjson'
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('Line 4', response.data['message'] + str(response.data['errors']))
+            self.assertFalse(Competition.objects.filter(title__startswith='Broken').exists())
+
+
+class CompetitionSchedulerTestCase(TransactionTestCase):
+    """The scheduler and the broker read committed rows from other threads, so these tests commit."""
+
+    def test_running_scheduler_follows_changes_from_other_processes(self):
+        """Test that a deadline moved from another thread reschedules a running scheduler."""
+        import threading
+        from django.test import override_settings
+        from competitions.scheduler import DeadlineScheduler
+
+        client = User.objects.create_user(
+            email='client@test.com', username='testclient', password='testpass123', role='CLIENT',
+        )
+        competition = Competition.objects.create(
+            client=client, title='Moved', description='Test', requirements='Test', budget=500,
+            deadline=timezone.now() + timedelta(days=30),
+            submission_deadline=timezone.now() + timedelta(days=20),
+            category='Test', status='OPEN',
+        )
+
+        # Beyond the loaded window, so only the published change can bring it in
+        scheduler = DeadlineScheduler(horizon=60)
+        with override_settings(NOTIFICATION_BROKER_POLL_INTERVAL=0.05):
+            thread = threading.Thread(target=scheduler.run, kwargs={'max_runtime': 3})
+            thread.start()
+            while scheduler.loaded_until is None:
+                thread.join(timeout=0.05)
+            # The broker relays the save through the database, as it would
+            # from a web server; nothing is delivered in-process
+            competition.submission_deadline = timezone.now() + timedelta(seconds=0.5)
+            competition.save()
+            thread.join()
+
+        competition.refresh_from_db()
+        self.assertEqual(competition.status, 'REVIEW')
+        self.assertEqual(scheduler.closed, 1)
@@ -6,8 +6,10 @@ app_name = 'competitions'
 urlpatterns = [
     path('', views.CompetitionListView.as_view(), name='competition-list'),
     path('create/', views.CompetitionCreateView.as_view(), name='competition-create'),
+    path('bulk/', views.CompetitionBulkCreateView.as_view(), name='competition-bulk-create'),
     path('mine/', views.MyCompetitionsView.as_view(), name='my-competitions'),
     path('bookmarks/', views.BookmarkListView.as_view(), name='bookmark-list'),
+    path('tags/', views.TagCloudView.as_view(), name='tag-cloud'),
     path('<uuid:competition_id>/', views.CompetitionDetailView.as_view(), name='competition-detail'),
     path('<uuid:competition_id>/status/', views.CompetitionStatusView.as_view(), name='competition-status'),
     path('<uuid:competition_id>/questions/', views.CompetitionQuestionListCreateView.as_view(), name='competition-questions'),
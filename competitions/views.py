@@ -1,9 +1,18 @@
+from collections.abc import Iterator
 from rest_framework import generics, status, filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from django.db import transaction
 from django.utils import timezone
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
+from freelance_arena.mixins import EagerLoadingViewMixin
+from freelance_arena.pagination import HybridPagination
+from freelance_arena.parsers import NDJSONParser
+from freelance_arena.response_cache import cache_public_response, not_modified_response, version_etag
 from freelance_arena.utils import success_response
 from accounts.permissions import IsClient
 from .models import Competition, CompetitionQuestion, CompetitionBookmark
@@ -17,23 +26,30 @@ from .serializers import (
     CompetitionQuestionReadSerializer,
     CompetitionAnswerSerializer,
     CompetitionBookmarkSerializer,
+    QUESTION_ORDERING,
 )
+from .bulk import import_competitions
 from .filters import CompetitionFilter
+from .lifecycle import CompetitionLifecycleService, LifecycleError
+from .search import CompetitionSearchFilter
+from .tags import tag_cloud
 
 
-class CompetitionListView(generics.ListAPIView):
+class CompetitionListView(EagerLoadingViewMixin, generics.ListAPIView):
     """GET - List all OPEN competitions. Public access."""
     serializer_class = CompetitionListSerializer
     permission_classes = [AllowAny]
     filterset_class = CompetitionFilter
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['title', 'description', 'category']
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, CompetitionSearchFilter]
     ordering_fields = ['budget', 'deadline', 'created_at']
     ordering = ['-created_at']
+    pagination_class = HybridPagination
+    cursor_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
-        return Competition.objects.filter(status='OPEN')
+        return Competition.objects.filter(status='OPEN').with_stats()
 
+    @cache_public_response('competitions')
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
         return success_response(data=response.data, message='Competitions retrieved.')
@@ -56,6 +72,27 @@ class CompetitionCreateView(APIView):
         )
 
 
+class CompetitionBulkCreateView(APIView):
+    """
+    POST - Create many competitions in one transaction. CLIENT only.
+    Accepts a JSON list, or NDJSON (one competition per line) for large
+    imports, which is validated and inserted batch by batch as it is read.
+    """
+    permission_classes = [IsAuthenticated, IsClient]
+    parser_classes = [JSONParser, NDJSONParser]
+
+    def post(self, request):
+        items = request.data
+        if not isinstance(items, (list, Iterator)):
+            raise ValidationError({'items': 'Expected a list of competitions.'})
+        ids = import_competitions(items, context={'request': request})
+        return success_response(
+            data={'created': len(ids), 'ids': ids},
+            message=f'{len(ids)} competitions created successfully.',
+            status_code=status.HTTP_201_CREATED,
+        )
+
+
 class CompetitionDetailView(APIView):
     """GET/PUT/PATCH/DELETE a competition."""
     permission_classes = [AllowAny]
@@ -66,7 +103,28 @@ class CompetitionDetailView(APIView):
         return [AllowAny()]
 
     def get(self, request, competition_id):
-        competition = get_object_or_404(Competition, id=competition_id)
+        version = Competition.objects.detail_version(competition_id)
+        if version is None:
+            raise Http404
+        # is_open also depends on the clock
+        is_open = version['submission_deadline'] > timezone.now()
+        etag = version_etag(version, is_open)
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        response = self.retrieve(request, competition_id=competition_id)
+        response['ETag'] = etag
+        return response
+
+    @cache_public_response('competition:{competition_id}', conditional=False)
+    def retrieve(self, request, competition_id):
+        competition = get_object_or_404(
+            CompetitionDetailSerializer.setup_eager_loading(
+                Competition.objects.with_stats()
+            ),
+            id=competition_id,
+        )
         serializer = CompetitionDetailSerializer(competition)
         return success_response(data=serializer.data, message='Competition detail retrieved.')
 
@@ -143,14 +201,16 @@ class CompetitionStatusView(APIView):
         )
         serializer.is_valid(raise_exception=True)
         competition.status = serializer.validated_data['status']
-        competition.save(update_fields=['status', 'updated_at'])
+        # The status signal queues notifications in the same transaction
+        with transaction.atomic():
+            competition.save(update_fields=['status', 'updated_at'])
         return success_response(
             data=CompetitionDetailSerializer(competition).data,
             message=f'Competition status changed to {competition.status}.',
         )
 
 
-class MyCompetitionsView(generics.ListAPIView):
+class MyCompetitionsView(EagerLoadingViewMixin, generics.ListAPIView):
     """GET - List own competitions. CLIENT only."""
     serializer_class = CompetitionListSerializer
     permission_classes = [IsAuthenticated, IsClient]
@@ -159,7 +219,7 @@ class MyCompetitionsView(generics.ListAPIView):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        queryset = Competition.objects.filter(client=self.request.user)
+        queryset = Competition.objects.filter(client=self.request.user).with_stats()
         status_filter = self.request.query_params.get('status')
         if status_filter:
             queryset = queryset.filter(status=status_filter.upper())
@@ -171,18 +231,32 @@ class MyCompetitionsView(generics.ListAPIView):
 
 
 class CompetitionQuestionListCreateView(APIView):
-    """GET - list public questions. POST - ask a question (FREELANCER only)."""
+    """
+    GET - list public questions, newest first. With `?cursor=` (e.g. the
+    detail's `questions_cursor`) the list is paginated by keyset.
+    POST - ask a question (FREELANCER only).
+    """
+    cursor_ordering = QUESTION_ORDERING
 
     def get_permissions(self):
         if self.request.method == 'POST':
             return [IsAuthenticated()]
         return [AllowAny()]
 
+    @cache_public_response('competition:{competition_id}')
     def get(self, request, competition_id):
         competition = get_object_or_404(Competition, id=competition_id)
-        questions = competition.questions.filter(is_public=True)
-        serializer = CompetitionQuestionReadSerializer(questions, many=True)
-        return success_response(data=serializer.data, message='Questions retrieved.')
+        questions = competition.questions.filter(is_public=True).select_related(
+            'asked_by', 'answered_by'
+        )
+        if HybridPagination.cursor_query_param in request.query_params:
+            paginator = HybridPagination()
+            page = paginator.paginate_queryset(questions, request, view=self)
+            serializer = CompetitionQuestionReadSerializer(page, many=True)
+            data = paginator.get_paginated_response(serializer.data).data
+        else:
+            data = CompetitionQuestionReadSerializer(questions, many=True).data
+        return success_response(data=data, message='Questions retrieved.')
 
     def post(self, request, competition_id):
         competition = get_object_or_404(Competition, id=competition_id)
@@ -233,11 +307,12 @@ class CompetitionAnswerView(APIView):
         question.is_public = serializer.validated_data.get('is_public', True)
         question.answered_by = request.user
         question.answered_at = timezone.now()
-        question.save()
 
-        # Send notification
         from notifications.utils import NotificationService
-        NotificationService.notify_question_answered(question)
+        with transaction.atomic():
+            question.save()
+            # Queue notification
+            NotificationService.notify_question_answered(question)
 
         return success_response(
             data=CompetitionQuestionReadSerializer(question).data,
@@ -251,11 +326,13 @@ class CompetitionBookmarkView(APIView):
 
     def post(self, request, competition_id):
         competition = get_object_or_404(Competition, id=competition_id)
-        bookmark, created = CompetitionBookmark.objects.get_or_create(
-            competition=competition, user=request.user
-        )
+        with transaction.atomic():
+            bookmark, created = CompetitionBookmark.objects.get_or_create(
+                competition=competition, user=request.user
+            )
+            if not created:
+                bookmark.delete()
         if not created:
-            bookmark.delete()
             return success_response(message='Bookmark removed.')
         return success_response(
             message='Competition bookmarked.',
@@ -263,7 +340,7 @@ class CompetitionBookmarkView(APIView):
         )
 
 
-class BookmarkListView(generics.ListAPIView):
+class BookmarkListView(EagerLoadingViewMixin, generics.ListAPIView):
     """GET - List all bookmarked competitions."""
     serializer_class = CompetitionListSerializer
     permission_classes = [IsAuthenticated]
@@ -272,32 +349,33 @@ class BookmarkListView(generics.ListAPIView):
         bookmark_competition_ids = CompetitionBookmark.objects.filter(
             user=self.request.user
         ).values_list('competition_id', flat=True)
-        return Competition.objects.filter(id__in=bookmark_competition_ids)
+        return Competition.objects.filter(id__in=bookmark_competition_ids).with_stats()
 
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
         return success_response(data=response.data, message='Bookmarked competitions retrieved.')
 
 
+class TagCloudView(APIView):
+    """GET - Tags used by open competitions, with counts. Public access, cached."""
+    permission_classes = [AllowAny]
+    default_limit = 50
+    max_limit = 200
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+        return success_response(data=tag_cloud(limit), message='Tags retrieved.')
+
+
 class SelectWinnerView(APIView):
     """POST - Select the winning proposal. CLIENT owner only."""
     permission_classes = [IsAuthenticated, IsClient]
 
     def post(self, request, competition_id):
-        from proposals.models import Proposal
-
-        competition = get_object_or_404(Competition, id=competition_id)
-        if competition.client != request.user:
-            return success_response(
-                data=None, message='You are not the owner of this competition.',
-                status_code=status.HTTP_403_FORBIDDEN,
-            )
-        if competition.status != 'REVIEW':
-            return success_response(
-                data=None, message='Winner can only be selected when competition is in REVIEW status.',
-                status_code=status.HTTP_400_BAD_REQUEST,
-            )
-
         proposal_id = request.data.get('proposal_id')
         if not proposal_id:
             return success_response(
@@ -306,47 +384,11 @@ class SelectWinnerView(APIView):
             )
 
         try:
-            proposal = Proposal.objects.get(id=proposal_id, competition=competition)
-        except Proposal.DoesNotExist:
-            return success_response(
-                data=None, message='Proposal not found for this competition.',
-                status_code=status.HTTP_404_NOT_FOUND,
-            )
-
-        if proposal.status == 'WITHDRAWN':
-            return success_response(
-                data=None, message='Cannot select a withdrawn proposal.',
-                status_code=status.HTTP_400_BAD_REQUEST,
+            competition = CompetitionLifecycleService.select_winner(
+                competition_id, request.user, proposal_id,
             )
-
-        # Set the winner
-        competition.winning_proposal = proposal
-        competition.winner = proposal.freelancer
-        competition.status = 'CLOSED'
-        competition.save(update_fields=['winning_proposal', 'winner', 'status', 'updated_at'])
-
-        # Update proposal statuses
-        proposal.is_winner = True
-        proposal.status = 'ACCEPTED'
-        proposal.save(update_fields=['is_winner', 'status', 'updated_at'])
-
-        # Reject all other proposals
-        competition.proposals.exclude(id=proposal.id).update(status='REJECTED')
-
-        # Create payment record
-        from payments.models import PaymentRecord
-        PaymentRecord.objects.create(
-            competition=competition,
-            client=competition.client,
-            freelancer=proposal.freelancer,
-            amount=competition.budget,
-            currency=competition.currency,
-        )
-
-        # Send notifications
-        from notifications.utils import NotificationService
-        NotificationService.notify_winner_selected(competition, proposal)
-        NotificationService.notify_competition_closed(competition)
+        except LifecycleError as exc:
+            return success_response(data=None, message=exc.message, status_code=exc.status_code)
 
         return success_response(
             data=CompetitionDetailSerializer(competition).data,
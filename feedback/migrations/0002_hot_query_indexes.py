@@ -0,0 +1,20 @@
+# Generated by Django 5.2.11 on 2026-10-18 10:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedback", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["reviewee", "is_public", "-created_at"],
+                name="review_reviewee_public_idx",
+            ),
+        ),
+    ]
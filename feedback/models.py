@@ -38,6 +38,10 @@ class Review(models.Model):
         db_table = 'feedback_review'
         unique_together = ('reviewer', 'competition')
         ordering = ['-created_at']
+        indexes = [
+            # Public profile reviews and rating recalculation
+            models.Index(fields=['reviewee', 'is_public', '-created_at'], name='review_reviewee_public_idx'),
+        ]
 
     def __str__(self):
         return f"Review by {self.reviewer.username} for {self.reviewee.username}"
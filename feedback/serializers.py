@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from django.db import transaction
+from freelance_arena.mixins import EagerLoadingSerializerMixin
 from .models import Review, UserRating
 
 
@@ -66,11 +68,15 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data['reviewer'] = self.context['request'].user
-        return super().create(validated_data)
+        # Review, rating, counters and outbox event commit together
+        with transaction.atomic():
+            return super().create(validated_data)
 
 
-class ReviewDetailSerializer(serializers.ModelSerializer):
+class ReviewDetailSerializer(EagerLoadingSerializerMixin, serializers.ModelSerializer):
     """Full read-only review serializer."""
+    select_related_fields = ('reviewer', 'reviewee')
+
     reviewer_username = serializers.CharField(source='reviewer.username', read_only=True)
     reviewer_profile_picture = serializers.ImageField(
         source='reviewer.profile_picture', read_only=True
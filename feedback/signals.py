@@ -1,5 +1,7 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from competitions.models import CompetitionStats
+from freelance_arena.response_cache import invalidate_responses
 from .models import Review, UserRating
 
 
@@ -7,8 +9,18 @@ from .models import Review, UserRating
 def update_user_rating_on_review(sender, instance, created, **kwargs):
     """Update UserRating whenever a review is created or updated."""
     UserRating.update_for_user(instance.reviewee_id)
+    invalidate_responses(f'reviews:{instance.reviewee_id}')
 
-    # Send notification for new reviews
     if created:
+        CompetitionStats.adjust(instance.competition_id, review_count=1)
+
+        # Send notification for new reviews
         from notifications.utils import NotificationService
         NotificationService.notify_new_review(instance)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Uncount a removed review."""
+    CompetitionStats.adjust(instance.competition_id, review_count=-1)
+    invalidate_responses(f'reviews:{instance.reviewee_id}')
@@ -4,12 +4,14 @@ from rest_framework import status
 from django.utils import timezone
 from datetime import timedelta
 from accounts.models import User
+from freelance_arena.testing import QueryCountAssertionsMixin, sync_last_seen
 from competitions.models import Competition
 from proposals.models import Proposal
 from .models import Review
 
 
-class FeedbackTestCase(TestCase):
+@sync_last_seen
+class FeedbackTestCase(QueryCountAssertionsMixin, TestCase):
     """Test cases for the feedback app."""
 
     def setUp(self):
@@ -102,3 +104,33 @@ class FeedbackTestCase(TestCase):
             '/api/feedback/reviews/', data, format='json'
         )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_user_reviews_query_count_is_constant(self):
+        """Test that public user reviews do not look up reviewers per row."""
+
+        def make_review(index):
+            competition = Competition.objects.create(
+                client=self.client_user,
+                title=f'Competition {index}',
+                description='Test',
+                requirements='Test',
+                budget=1000,
+                deadline=timezone.now() + timedelta(days=30),
+                submission_deadline=timezone.now() + timedelta(days=20),
+                category='Test',
+                status='CLOSED',
+            )
+            Review.objects.create(
+                reviewer=self.client_user,
+                reviewee=self.freelancer_user,
+                competition=competition,
+                rating=5,
+                comment='Great work.',
+                review_type='CLIENT_TO_FREELANCER',
+            )
+
+        self.assertConstantQueryCount(
+            self.client_api,
+            f'/api/feedback/users/{self.freelancer_user.id}/reviews/',
+            make_review,
+        )
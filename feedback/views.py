@@ -2,6 +2,8 @@ from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.shortcuts import get_object_or_404
+from freelance_arena.mixins import EagerLoadingViewMixin
+from freelance_arena.response_cache import cache_public_response
 from freelance_arena.utils import success_response
 from .models import Review, UserRating
 from .serializers import (
@@ -28,7 +30,7 @@ class CreateReviewView(APIView):
         )
 
 
-class UserReviewsView(generics.ListAPIView):
+class UserReviewsView(EagerLoadingViewMixin, generics.ListAPIView):
     """GET - Public reviews for a specific user."""
     serializer_class = ReviewDetailSerializer
     permission_classes = [AllowAny]
@@ -37,6 +39,7 @@ class UserReviewsView(generics.ListAPIView):
         user_id = self.kwargs['user_id']
         return Review.objects.filter(reviewee_id=user_id, is_public=True)
 
+    @cache_public_response('reviews:{user_id}')
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
 
@@ -57,7 +60,7 @@ class UserReviewsView(generics.ListAPIView):
         )
 
 
-class CompetitionReviewsView(generics.ListAPIView):
+class CompetitionReviewsView(EagerLoadingViewMixin, generics.ListAPIView):
     """GET - Reviews for a specific competition. Authenticated."""
     serializer_class = ReviewDetailSerializer
     permission_classes = [IsAuthenticated]
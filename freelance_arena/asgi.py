@@ -2,6 +2,9 @@
 ASGI config for freelance_arena project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server (e.g. ``uvicorn freelance_arena.asgi:application``)
+so the notification stream and long-poll endpoints run without a thread per
+connection.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -8,6 +8,7 @@ from rest_framework.exceptions import (
     NotAuthenticated,
     MethodNotAllowed,
     Throttled,
+    APIException,
 )
 from rest_framework.response import Response
 from rest_framework import status
@@ -15,6 +16,13 @@ from rest_framework import status
 logger = logging.getLogger('freelance_arena')
 
 
+class Conflict(APIException):
+    """The request conflicts with the current state of the resource (409)."""
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'The request conflicts with the current state of the resource.'
+    default_code = 'conflict'
+
+
 def custom_exception_handler(exc, context):
     """
     Custom exception handler that returns consistent JSON error responses.
@@ -45,6 +53,9 @@ def custom_exception_handler(exc, context):
         elif isinstance(exc, MethodNotAllowed):
             custom_response['message'] = 'Method not allowed.'
             custom_response['errors'] = {'detail': str(exc.detail)}
+        elif isinstance(exc, Conflict):
+            custom_response['message'] = 'Conflict.'
+            custom_response['errors'] = {'detail': str(exc.detail)}
         elif isinstance(exc, Throttled):
             custom_response['message'] = 'Request was throttled.'
             custom_response['errors'] = {'detail': str(exc.detail)}
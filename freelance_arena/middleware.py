@@ -1,26 +1,36 @@
-from django.utils import timezone
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 
 
 class UpdateLastSeenMiddleware:
     """
-    Middleware that updates the authenticated user's last_seen field.
-    Only updates if the last seen was more than 5 minutes ago to avoid
-    excessive database writes.
+    Middleware that records the authenticated user's last_seen time.
+    Touches go to an in-memory buffer (accounts.last_seen) that a background
+    thread writes in batches, so no request waits on the UPDATE; a user is
+    touched at most once every LAST_SEEN_INTERVAL seconds.
+    Async-capable so streaming views under ASGI do not hold a thread.
     """
+    sync_capable = True
+    async_capable = True
 
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
         response = self.get_response(request)
+        self.touch_last_seen(request)
+        return response
 
-        if request.user.is_authenticated:
-            now = timezone.now()
-            last_seen = request.user.last_seen
-            # Only update if last_seen is None or more than 5 minutes ago
-            if last_seen is None or (now - last_seen).total_seconds() > 300:
-                # Use update() to avoid triggering signals and save overhead
-                from accounts.models import User
-                User.objects.filter(pk=request.user.pk).update(last_seen=now)
-
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        await sync_to_async(self.touch_last_seen)(request)
         return response
+
+    def touch_last_seen(self, request):
+        if request.user.is_authenticated:
+            from accounts.last_seen import last_seen_buffer
+            # Only the pk: reading last_seen would load a token-snapshot user
+            last_seen_buffer.touch(request.user.pk)
@@ -0,0 +1,33 @@
+class EagerLoadingSerializerMixin:
+    """
+    Serializer mixin declaring the relations a serializer reads.
+    List views apply the spec to their queryset so each relation is
+    fetched once per page instead of once per row.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Apply select_related/prefetch_related for the declared relations."""
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        return queryset
+
+
+class EagerLoadingViewMixin:
+    """
+    Generic view mixin that applies the serializer's eager-load spec
+    to the filtered queryset.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        setup_eager_loading = getattr(
+            self.get_serializer_class(), 'setup_eager_loading', None
+        )
+        if setup_eager_loading is not None:
+            queryset = setup_eager_loading(queryset)
+        return queryset
@@ -0,0 +1,176 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class HybridPagination(PageNumberPagination):
+    """
+    Page-number pagination with two opt-in modes for large lists:
+
+    - `?cursor=` (empty to start) switches to keyset pagination. Rows are
+      ordered by the view's `cursor_ordering` (default newest first on
+      created_at, then id) and each page filters past the last row seen,
+      so deep pages cost the same as the first. `ordering` is ignored.
+    - `?count=false` keeps page numbers but skips the COUNT(*) query.
+
+    Both modes return `count: null` in the usual
+    `{count, next, previous, results}` shape.
+    """
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    default_cursor_ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if self.cursor_query_param in request.query_params:
+            self.mode = 'cursor'
+            return self.paginate_by_cursor(queryset, request, view)
+        if request.query_params.get(self.count_query_param, '').lower() == 'false':
+            self.mode = 'uncounted'
+            return self.paginate_without_count(queryset, request)
+        self.mode = 'page'
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.mode == 'page':
+            return super().get_paginated_response(data)
+        return Response({
+            'count': None,
+            'next': self.next_link,
+            'previous': self.previous_link,
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count']['nullable'] = True
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Keyset cursor; pass an empty value for the first page.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to false to skip the total count.',
+                'schema': {'type': 'boolean'},
+            },
+        ]
+
+    # ─── Page numbers without COUNT(*) ────────────────────────────────────────
+
+    def paginate_without_count(self, queryset, request):
+        page_size = self.get_page_size(request)
+        try:
+            page_number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            page_number = 0
+        if page_number < 1:
+            raise NotFound('Invalid page.')
+
+        offset = (page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and page_number > 1:
+            raise NotFound('Invalid page.')
+
+        url = request.build_absolute_uri()
+        self.next_link = (
+            replace_query_param(url, self.page_query_param, page_number + 1)
+            if len(rows) > page_size else None
+        )
+        if page_number == 1:
+            self.previous_link = None
+        elif page_number == 2:
+            self.previous_link = remove_query_param(url, self.page_query_param)
+        else:
+            self.previous_link = replace_query_param(url, self.page_query_param, page_number - 1)
+        return rows[:page_size]
+
+    # ─── Keyset ───────────────────────────────────────────────────────────────
+
+    def paginate_by_cursor(self, queryset, request, view):
+        page_size = self.get_page_size(request)
+        ordering = list(getattr(view, 'cursor_ordering', self.default_cursor_ordering))
+        position, backwards = self.decode_cursor(request.query_params[self.cursor_query_param], len(ordering))
+        if backwards:
+            ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+        queryset = queryset.order_by(*ordering)
+        try:
+            # Lookups validate their values while filter() builds them
+            if position is not None:
+                queryset = queryset.filter(self.after_position(ordering, position))
+            rows = list(queryset[:page_size + 1])
+        except (DjangoValidationError, TypeError, ValueError):
+            # Position values that do not fit the ordering fields
+            raise NotFound(self.invalid_cursor_message)
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+            ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+        has_next = position is not None if backwards else has_more
+        has_previous = has_more if backwards else position is not None
+        self.next_link = self.cursor_link(rows[-1], ordering, False) if rows and has_next else None
+        self.previous_link = self.cursor_link(rows[0], ordering, True) if rows and has_previous else None
+        return rows
+
+    @staticmethod
+    def after_position(ordering, position):
+        """(a, b) > (x, y) expanded to `a > x OR (a = x AND b > y)`, honouring each field's direction."""
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    @staticmethod
+    def encode_cursor(row, ordering, backwards=False):
+        """Cursor token for the page after (or, backwards, before) `row`."""
+        position = []
+        for field in ordering:
+            value = getattr(row, field.lstrip('-'))
+            # isoformat() keeps microseconds, which the keyset comparison needs
+            position.append(value.isoformat() if isinstance(value, datetime) else str(value))
+        return urlsafe_b64encode(
+            json.dumps({'p': position, 'b': backwards}).encode()
+        ).decode()
+
+    def cursor_link(self, row, ordering, backwards):
+        token = self.encode_cursor(row, ordering, backwards)
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, token, fields):
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(urlsafe_b64decode(token.encode()))
+            position, backwards = payload['p'], bool(payload['b'])
+        except (TypeError, ValueError, KeyError, IndexError):
+            raise NotFound(self.invalid_cursor_message)
+        # encode_cursor only writes strings
+        if (
+            not isinstance(position, list) or len(position) != fields
+            or not all(isinstance(value, str) for value in position)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return position, backwards
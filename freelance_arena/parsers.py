@@ -0,0 +1,29 @@
+import json
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Newline-delimited JSON: one value per line. `request.data` is a lazy
+    iterator over the values, read from the request stream as it is
+    consumed, so a large upload is never held in memory. Blank lines are
+    skipped; a malformed line raises ParseError when it is reached.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+
+        def values():
+            for number, line in enumerate(stream, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line.decode(encoding))
+                except ValueError as exc:
+                    raise ParseError(f'Line {number}: JSON parse error - {exc}')
+
+        return values()
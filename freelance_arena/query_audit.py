@@ -0,0 +1,129 @@
+"""
+Registry of the hot query shapes served by the API, plus helpers to EXPLAIN
+them and detect full table scans. Used by the `explain_hot_queries` command
+so a missing or unusable index shows up before it shows up in production.
+"""
+import json
+import re
+import uuid
+
+from django.db import connection
+
+
+HOT_QUERIES = {}
+
+
+def hot_query(name):
+    """Register a function returning an unevaluated queryset under `name`."""
+    def decorator(func):
+        HOT_QUERIES[name] = func
+        return func
+    return decorator
+
+
+def explain(queryset):
+    """Return the raw plan for `queryset` on the current database."""
+    if connection.vendor == 'mysql':
+        return queryset.explain(format='JSON')
+    return queryset.explain()
+
+
+def find_full_scans(plan, vendor=None):
+    """
+    Return the table names the plan reads with a full scan.
+
+    MySQL reports them as access_type "ALL" in the JSON plan, PostgreSQL as
+    "Seq Scan on <table>", and SQLite as a bare "SCAN <table>" (a scan that
+    walks an index is reported as "SCAN <table> USING [COVERING] INDEX").
+    """
+    vendor = vendor or connection.vendor
+    if vendor == 'mysql':
+        tables = []
+
+        def walk(node):
+            if isinstance(node, dict):
+                if node.get('access_type') == 'ALL':
+                    tables.append(node.get('table_name', '?'))
+                for value in node.values():
+                    walk(value)
+            elif isinstance(node, list):
+                for value in node:
+                    walk(value)
+
+        walk(json.loads(plan))
+        return tables
+    if vendor == 'postgresql':
+        return re.findall(r'Seq Scan on (\w+)', plan)
+    return [
+        match.group(1)
+        for match in re.finditer(r'\bSCAN (\w+)(.*)', plan)
+        # "USING INDEX" walks an index; "VIRTUAL TABLE INDEX" is an FTS5 lookup
+        if 'USING' not in match.group(2) and 'VIRTUAL TABLE' not in match.group(2)
+    ]
+
+
+# ─── Hot queries ──────────────────────────────────────────────────────────────
+# Placeholder ids are fine: EXPLAIN plans the statement without needing a match.
+
+@hot_query('competitions.open_list')
+def _open_competitions():
+    from competitions.models import Competition
+    return Competition.objects.filter(status='OPEN').order_by('-created_at')[:20]
+
+
+@hot_query('competitions.expired_open')
+def _expired_open_competitions():
+    from competitions.lifecycle import CompetitionLifecycleService
+    return CompetitionLifecycleService.expired_open().order_by('submission_deadline')
+
+
+@hot_query('competitions.search')
+def _search_competitions():
+    from competitions.models import Competition
+    from competitions.search import search_competitions
+    return search_competitions(Competition.objects.filter(status='OPEN'), 'logo design')
+
+
+@hot_query('competitions.by_tag')
+def _competitions_by_tag():
+    from competitions.models import Competition, CompetitionTag
+    return Competition.objects.filter(
+        status='OPEN',
+        id__in=CompetitionTag.objects.filter(tag__slug__in=['django']).values('competition_id'),
+    ).order_by('-created_at')[:20]
+
+
+@hot_query('notifications.unread_inbox')
+def _unread_notifications():
+    from notifications.models import Notification
+    return Notification.objects.filter(
+        recipient_id=uuid.uuid4(), is_read=False
+    ).order_by('-created_at')[:20]
+
+
+@hot_query('proposals.active_for_competition')
+def _active_proposals():
+    from proposals.models import Proposal
+    return Proposal.objects.filter(
+        competition_id=uuid.uuid4()
+    ).exclude(status='WITHDRAWN')
+
+
+@hot_query('proposals.mine')
+def _my_proposals():
+    from proposals.models import Proposal
+    return Proposal.objects.filter(freelancer_id=uuid.uuid4()).order_by('-created_at')[:20]
+
+
+@hot_query('feedback.public_reviews')
+def _public_reviews():
+    from feedback.models import Review
+    return Review.objects.filter(
+        reviewee_id=uuid.uuid4(), is_public=True
+    ).order_by('-created_at')[:20]
+
+
+@hot_query('payments.admin_by_status')
+def _payments_by_status():
+    from payments.models import PaymentRecord
+    return PaymentRecord.objects.filter(status='PENDING').order_by('-created_at')[:20]
@@ -0,0 +1,146 @@
+"""
+Response cache for public read endpoints.
+
+Anonymous GETs to a decorated view are cached under the request path and
+its normalized query string. Each cached response belongs to one or more
+scopes (e.g. `competitions`, `competition:<id>`); a scope's version is the
+time it was last invalidated, so `invalidate_responses()` expires every
+response in the scope at once without tracking individual keys. Responses
+carry a content ETag, so clients can revalidate with If-None-Match and get
+a 304. No Last-Modified is sent: HTTP dates have one-second resolution, so
+If-Modified-Since would answer 304 for content changed in the same second.
+
+Authenticated requests bypass the cache. Responses that read data outside
+their scopes (usernames, the is_open deadline check) can be stale for up to
+RESPONSE_CACHE_TIMEOUT seconds.
+
+Nothing is cached unless the cache is shared by every process: with a
+per-process cache (LocMem) a write in one process could not expire the
+responses cached by the others.
+"""
+import hashlib
+import json
+import time
+from functools import wraps
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+from rest_framework.response import Response
+from .utils import cache_is_shared
+
+KEY_PREFIX = 'response-cache'
+
+
+def _scope_key(scope):
+    return f'{KEY_PREFIX}:scope:{scope}'
+
+
+def scope_versions(scopes):
+    """Current version (invalidation time in ns) of each scope, in order."""
+    keys = [_scope_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        # Unknown or evicted scope: start a new version, which no cached response uses
+        now = time.time_ns()
+        for key in missing:
+            cache.add(key, now, None)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key, 0) for key in keys]
+
+
+def invalidate_responses(*scopes):
+    """
+    Expire cached responses in `scopes`. Inside a transaction the scopes are
+    expired again on commit, so a response rendered from the old rows by a
+    concurrent request is not served afterwards.
+    """
+    if not cache_is_shared():
+        return
+
+    def bump():
+        now = time.time_ns()
+        cache.set_many({_scope_key(scope): now for scope in scopes}, None)
+
+    bump()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(bump)
+
+
+def response_cache_key(request, versions):
+    params = sorted(
+        (name, value)
+        for name in request.query_params
+        for value in request.query_params.getlist(name)
+    )
+    url = f'{request.path}?{urlencode(params)}'
+    digest = hashlib.md5(url.encode()).hexdigest()
+    return f'{KEY_PREFIX}:{digest}:' + '.'.join(str(version) for version in versions)
+
+
+def version_etag(*parts):
+    """Strong ETag from JSON-serializable version values (timestamps, counters)."""
+    payload = json.dumps(parts, cls=DjangoJSONEncoder, sort_keys=True)
+    return quote_etag(hashlib.md5(payload.encode()).hexdigest())
+
+
+def not_modified_response(request, etag):
+    """
+    Return a 304 (or 412 for a failed If-Match) if the request's
+    preconditions match `etag`, otherwise None.
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response['ETag'] = etag
+    return response
+
+
+def cache_public_response(*scopes, conditional=True):
+    """
+    Cache anonymous GET responses of a view method.
+
+    `scopes` are format strings filled in from the URL kwargs, e.g.
+    `@cache_public_response('competitions', 'competition:{competition_id}')`.
+    Only 200 responses are cached. Pass `conditional=False` when the view
+    sets its own ETag and handles If-None-Match before calling the method.
+    Does nothing without a shared cache.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if (
+                request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+                or not cache_is_shared()
+            ):
+                return method(view, request, *args, **kwargs)
+
+            versions = scope_versions([scope.format(**kwargs) for scope in scopes])
+            key = response_cache_key(request, versions)
+            entry = cache.get(key)
+            if entry is None:
+                response = method(view, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                payload = json.dumps(response.data, cls=DjangoJSONEncoder, sort_keys=True)
+                entry = {
+                    'data': json.loads(payload),
+                    'etag': quote_etag(hashlib.md5(payload.encode()).hexdigest()),
+                }
+                cache.set(key, entry, settings.RESPONSE_CACHE_TIMEOUT)
+                response['X-Cache'] = 'MISS'
+            else:
+                response = Response(entry['data'])
+                response['X-Cache'] = 'HIT'
+
+            patch_vary_headers(response, ('Authorization',))
+            if not conditional:
+                return response
+            response['ETag'] = entry['etag']
+            return get_conditional_response(request, etag=entry['etag'], response=response)
+        return wrapper
+    return decorator
@@ -3,9 +3,11 @@ Django settings for freelance_arena project.
 FreelanceArena - Competitive Freelancing Platform
 """
 
+import importlib.util
 import os
 from pathlib import Path
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -102,6 +104,37 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
 ]
 
+# Password hashing
+# New hashes use PASSWORD_HASHER: argon2 (needs argon2-cffi), bcrypt (needs
+# bcrypt) or pbkdf2. If the chosen algorithm's library is not installed,
+# pbkdf2 is used. Hashes made with another algorithm or cost still verify
+# and are rehashed with the settings below at the user's next login
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'argon2')
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', 1000000))
+PASSWORD_ARGON2_TIME_COST = int(os.environ.get('PASSWORD_ARGON2_TIME_COST', 2))
+PASSWORD_ARGON2_MEMORY_COST = int(os.environ.get('PASSWORD_ARGON2_MEMORY_COST', 102400))  # KiB
+PASSWORD_ARGON2_PARALLELISM = int(os.environ.get('PASSWORD_ARGON2_PARALLELISM', 8))
+PASSWORD_BCRYPT_ROUNDS = int(os.environ.get('PASSWORD_BCRYPT_ROUNDS', 12))
+
+_CONFIGURABLE_HASHERS = {
+    'argon2': ('accounts.hashers.Argon2PasswordHasher', 'argon2'),
+    'bcrypt': ('accounts.hashers.BCryptSHA256PasswordHasher', 'bcrypt'),
+    'pbkdf2': ('accounts.hashers.PBKDF2PasswordHasher', None),
+}
+if PASSWORD_HASHER not in _CONFIGURABLE_HASHERS:
+    raise ImproperlyConfigured(
+        f"PASSWORD_HASHER is {PASSWORD_HASHER!r}; choose one of: {', '.join(_CONFIGURABLE_HASHERS)}."
+    )
+_preferred_hasher, _hasher_module = _CONFIGURABLE_HASHERS[PASSWORD_HASHER]
+if _hasher_module and importlib.util.find_spec(_hasher_module) is None:
+    _preferred_hasher = _CONFIGURABLE_HASHERS['pbkdf2'][0]
+PASSWORD_HASHERS = [_preferred_hasher] + [
+    path for path, _ in _CONFIGURABLE_HASHERS.values() if path != _preferred_hasher
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -124,7 +157,7 @@ AUTH_USER_MODEL = 'accounts.User'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.SnapshotJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -160,6 +193,89 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
 }
 
+# Access tokens carry the user's role and token_version, so requests are
+# authenticated without loading the user (accounts.authentication). With a
+# shared cache the current token_version is cached for this many seconds
+# (role changes and deactivation drop it right away); with LocMem it is
+# read from the database on every request
+TOKEN_VERSION_CACHE_TIMEOUT = int(os.environ.get('TOKEN_VERSION_CACHE_TIMEOUT', 300))
+
+# Refresh token blacklist
+# Each process keeps a Bloom filter of blacklisted jtis (accounts.blacklist)
+# sized for this many tokens at this false-positive rate; it re-reads new
+# blacklistings when another process reports one or after the sync interval.
+# It needs a shared cache (CACHE_BACKEND); with LocMem every check queries
+# the database
+TOKEN_BLACKLIST_FILTER_CAPACITY = int(os.environ.get('TOKEN_BLACKLIST_FILTER_CAPACITY', 100000))
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = float(os.environ.get('TOKEN_BLACKLIST_FILTER_ERROR_RATE', 0.01))
+TOKEN_BLACKLIST_SYNC_INTERVAL = int(os.environ.get('TOKEN_BLACKLIST_SYNC_INTERVAL', 30))
+
+# Cache
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at Redis or
+# Memcached in production so all workers share the same counters
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'freelance-arena'),
+    }
+}
+
+# Public response cache
+# Seconds an anonymous response to a public read endpoint stays cached.
+# Writes expire the affected responses earlier (freelance_arena.response_cache)
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 60))
+
+# Last seen
+# A user's last_seen is written at most once per LAST_SEEN_INTERVAL seconds.
+# Touches are buffered in memory and written in batches every
+# LAST_SEEN_FLUSH_INTERVAL seconds, or on the request with
+# LAST_SEEN_SYNC_WRITES (tests enable it with override_settings, since the
+# flusher thread's own connection would write outside the test transaction)
+LAST_SEEN_INTERVAL = int(os.environ.get('LAST_SEEN_INTERVAL', 300))
+LAST_SEEN_FLUSH_INTERVAL = int(os.environ.get('LAST_SEEN_FLUSH_INTERVAL', 10))
+LAST_SEEN_SYNC_WRITES = os.environ.get('LAST_SEEN_SYNC_WRITES', 'false').lower() == 'true'
+
+# Freelancer search
+# Ranked results per skill combination are cached for this many seconds;
+# only the first FREELANCER_SEARCH_CACHE_SIZE matches are kept
+FREELANCER_SEARCH_CACHE_TIMEOUT = int(os.environ.get('FREELANCER_SEARCH_CACHE_TIMEOUT', 300))
+FREELANCER_SEARCH_CACHE_SIZE = int(os.environ.get('FREELANCER_SEARCH_CACHE_SIZE', 200))
+
+# Competitions
+# Seconds the tag cloud stays cached; it is also dropped whenever tags change
+TAG_CLOUD_CACHE_TIMEOUT = int(os.environ.get('TAG_CLOUD_CACHE_TIMEOUT', 300))
+# Public questions embedded in a competition detail; the rest are fetched
+# from the question list with the returned `questions_cursor`
+COMPETITION_DETAIL_QUESTION_LIMIT = int(os.environ.get('COMPETITION_DETAIL_QUESTION_LIMIT', 20))
+# Items validated and inserted per batch by the bulk create endpoint
+COMPETITION_BULK_BATCH_SIZE = int(os.environ.get('COMPETITION_BULK_BATCH_SIZE', 500))
+
+# Notifications
+# Rows per INSERT when fanning a notification out to many recipients
+NOTIFICATION_FANOUT_BATCH_SIZE = int(os.environ.get('NOTIFICATION_FANOUT_BATCH_SIZE', 500))
+# Queue notification events in the outbox table for run_notification_worker;
+# set to False to deliver them inline
+NOTIFICATION_OUTBOX_ENABLED = os.environ.get('NOTIFICATION_OUTBOX_ENABLED', 'true').lower() == 'true'
+# Seconds a cached unread count is trusted before it is re-read from the counter
+# table. Only cached with a shared cache; with LocMem the table is read directly
+NOTIFICATION_UNREAD_CACHE_TIMEOUT = int(os.environ.get('NOTIFICATION_UNREAD_CACHE_TIMEOUT', 3600))
+# Pub/sub backend that pushes new notifications to stream/poll clients and
+# schedule changes to run_scheduler, across processes. DatabaseBroker needs
+# no other service; RedisBroker (needs the redis package) does not touch the
+# database and is recommended in production. LocalBroker only reaches the
+# publishing process, so use it only without the outbox worker on one server
+NOTIFICATION_BROKER = os.environ.get('NOTIFICATION_BROKER', 'notifications.pubsub.DatabaseBroker')
+NOTIFICATION_BROKER_URL = os.environ.get('NOTIFICATION_BROKER_URL', 'redis://localhost:6379/0')
+# DatabaseBroker: seconds between polls of each process that has
+# subscribers, and seconds relayed messages are kept
+NOTIFICATION_BROKER_POLL_INTERVAL = float(os.environ.get('NOTIFICATION_BROKER_POLL_INTERVAL', 1))
+NOTIFICATION_BROKER_RETENTION = int(os.environ.get('NOTIFICATION_BROKER_RETENTION', 300))
+# Seconds between SSE keep-alive comments, and maximum SSE connection length
+NOTIFICATION_STREAM_KEEPALIVE = int(os.environ.get('NOTIFICATION_STREAM_KEEPALIVE', 15))
+NOTIFICATION_STREAM_MAX_DURATION = int(os.environ.get('NOTIFICATION_STREAM_MAX_DURATION', 300))
+# Longest a long-poll request may wait for a notification
+NOTIFICATION_LONG_POLL_TIMEOUT = int(os.environ.get('NOTIFICATION_LONG_POLL_TIMEOUT', 25))
+
 # CORS
 CORS_ALLOWED_ORIGINS = [
     'http://localhost:3000',
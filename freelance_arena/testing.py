@@ -0,0 +1,56 @@
+import shutil
+import tempfile
+from contextlib import contextmanager
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+# Class decorator for tests that make requests: last_seen is written on the
+# request, inside the test transaction, rather than by the flusher thread
+sync_last_seen = override_settings(LAST_SEEN_SYNC_WRITES=True)
+
+
+@contextmanager
+def shared_cache():
+    """Run with a cache every process would see (file based), as in production."""
+    location = tempfile.mkdtemp()
+    try:
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': location,
+        }}):
+            yield
+    finally:
+        shutil.rmtree(location, ignore_errors=True)
+
+
+class QueryCountAssertionsMixin:
+    """TestCase mixin for asserting that endpoints do not issue N+1 queries."""
+
+    def assertConstantQueryCount(self, client, url, make_row, sizes=(1, 5), expected=None):
+        """
+        Hit `url` after growing the dataset to each size in `sizes` and
+        assert the number of queries stays the same (after one uncounted
+        warm-up request). `make_row(index)` must
+        create one more row visible to the endpoint. Returns the query count.
+        """
+        counts = []
+        created = 0
+        # Not counted: the first request also does once-per-user work (last_seen)
+        client.get(url)
+        for size in sizes:
+            while created < size:
+                make_row(created)
+                created += 1
+            with CaptureQueriesContext(connection) as ctx:
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(ctx.captured_queries))
+
+        self.assertEqual(
+            len(set(counts)), 1,
+            f'Query count for {url} grows with the result size: '
+            f'{dict(zip(sizes, counts))}',
+        )
+        if expected is not None:
+            self.assertEqual(counts[0], expected)
+        return counts[0]
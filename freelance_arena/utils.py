@@ -1,6 +1,14 @@
+import unicodedata
+from django.conf import settings
 from rest_framework.response import Response
 from rest_framework import status as http_status
 
+# Cache backends whose entries are only visible to the process that wrote them
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.dummy.DummyCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
 
 def success_response(data=None, message='Success', status_code=http_status.HTTP_200_OK):
     """
@@ -13,3 +21,48 @@ def success_response(data=None, message='Success', status_code=http_status.HTTP_
         'data': data,
     }
     return Response(response_data, status=status_code)
+
+
+def normalize_label(text):
+    """
+    Canonical form of a tag or skill label: NFKC-normalized, without control
+    or invisible formatting characters, whitespace collapsed, casefolded.
+    Punctuation and non-ASCII letters are kept, so `C++`, `C#` and `C` (or
+    `.NET` and `net`) stay distinct labels.
+    """
+    text = ''.join(
+        char for char in unicodedata.normalize('NFKC', text)
+        if not unicodedata.category(char).startswith('C') or char.isspace()
+    )
+    return ' '.join(text.split()).casefold()
+
+
+def parse_comma_separated(text, max_length=50, strict=False):
+    """
+    Split a comma-separated list of labels (tags, skills) and normalize it.
+    Returns {slug: name} in input order, without duplicate slugs; the slug
+    is the label's normalize_label() form. Blank entries are skipped. An
+    entry that is not blank but normalizes to nothing (e.g. only invisible
+    characters) raises ValueError if `strict`, and is skipped otherwise.
+    """
+    labels = {}
+    for raw in (text or '').split(','):
+        if not raw.strip():
+            continue
+        slug = normalize_label(raw)[:max_length]
+        if not slug:
+            if strict:
+                raise ValueError(f'{raw!r} is not a valid label.')
+            continue
+        if slug not in labels:
+            labels[slug] = ' '.join(raw.split())[:max_length]
+    return labels
+
+
+def cache_is_shared(alias='default'):
+    """
+    Whether every process sees the same `alias` cache. Per-process caches
+    cannot carry an invalidation from one worker to another, so state that
+    must not go stale across workers is only cached when this is True.
+    """
+    return settings.CACHES[alias]['BACKEND'] not in PROCESS_LOCAL_CACHE_BACKENDS
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification
+from .models import Notification, NotificationEvent, UnreadNotificationCounter
 
 
 @admin.register(Notification)
@@ -17,7 +17,31 @@ class NotificationAdmin(admin.ModelAdmin):
     @admin.action(description='Mark selected notifications as read')
     def mark_all_read(self, request, queryset):
         from django.utils import timezone
-        updated = queryset.filter(is_read=False).update(
-            is_read=True, read_at=timezone.now()
-        )
+        unread = queryset.filter(is_read=False)
+        recipient_ids = list(unread.values_list('recipient_id', flat=True).distinct())
+        updated = unread.update(is_read=True, read_at=timezone.now())
+        UnreadNotificationCounter.reconcile(recipient_ids)
         self.message_user(request, f'{updated} notification(s) marked as read.')
+
+
+@admin.register(NotificationEvent)
+class NotificationEventAdmin(admin.ModelAdmin):
+    list_display = ('event_type', 'status', 'attempts', 'available_at', 'created_at')
+    list_filter = ('status', 'event_type')
+    readonly_fields = ('id', 'created_at', 'locked_at')
+
+    actions = ['requeue']
+
+    @admin.action(description='Re-queue selected events')
+    def requeue(self, request, queryset):
+        from django.utils import timezone
+        updated = queryset.exclude(status='PENDING').update(
+            status='PENDING', attempts=0, available_at=timezone.now(), locked_at=None,
+        )
+        self.message_user(request, f'{updated} event(s) re-queued.')
+
+
+@admin.register(UnreadNotificationCounter)
+class UnreadNotificationCounterAdmin(admin.ModelAdmin):
+    list_display = ('user', 'count', 'updated_at')
+    readonly_fields = ('user', 'count', 'updated_at')
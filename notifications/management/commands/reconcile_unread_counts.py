@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from notifications.models import UnreadNotificationCounter
+
+
+class Command(BaseCommand):
+    help = 'Recalculate cached unread notification counters from live data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of users reconciled per query (default: 1000).',
+        )
+        parser.add_argument(
+            '--user', action='append', dest='user_ids', default=[],
+            help='Only reconcile the given user id (repeatable).',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        users = get_user_model().objects.order_by('pk')
+        if options['user_ids']:
+            users = users.filter(pk__in=options['user_ids'])
+
+        user_ids = list(users.values_list('pk', flat=True))
+        drifted = 0
+        for start in range(0, len(user_ids), batch_size):
+            drifted += UnreadNotificationCounter.reconcile(user_ids[start:start + batch_size])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Reconciled unread counts for {len(user_ids)} user(s); '
+                f'{drifted} were missing or out of date.'
+            )
+        )
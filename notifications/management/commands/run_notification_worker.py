@@ -0,0 +1,87 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from notifications import outbox
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued notification events from the outbox table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Events claimed per batch (default: 100).',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help='Threads delivering events in parallel (default: 4).',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='Seconds to sleep when the outbox is empty (default: 1.0).',
+        )
+        parser.add_argument(
+            '--max-attempts', type=int, default=5,
+            help='Deliveries attempted before an event is marked FAILED (default: 5).',
+        )
+        parser.add_argument(
+            '--stale-after', type=int, default=300,
+            help='Seconds after which PROCESSING events are re-queued (default: 300).',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Drain the outbox once and exit instead of polling.',
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        delivered = failed = 0
+
+        executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            while True:
+                outbox.release_stale(options['stale_after'])
+                events = outbox.claim_batch(options['batch_size'])
+
+                if events:
+                    results = self._process(executor, workers, events, options['max_attempts'])
+                    delivered += results.count(True)
+                    failed += results.count(False)
+                    continue
+
+                if options['once']:
+                    break
+                close_old_connections()
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Delivered {delivered} event(s), {failed} failed.')
+        )
+
+    def _process(self, executor, workers, events, max_attempts):
+        if executor is None:
+            return [outbox.process_event(event, max_attempts) for event in events]
+        # One slice of the batch per thread, so each thread opens and closes
+        # its database connection once per batch rather than once per event
+        slices = [events[index::workers] for index in range(min(workers, len(events)))]
+        return [
+            result
+            for results in executor.map(
+                lambda events: self._process_in_thread(events, max_attempts), slices
+            )
+            for result in results
+        ]
+
+    @staticmethod
+    def _process_in_thread(events, max_attempts):
+        try:
+            return [outbox.process_event(event, max_attempts) for event in events]
+        finally:
+            # Each thread gets its own connection; do not leak it
+            connection.close()
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.11 on 2026-10-18 10:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0002_notificationevent"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["recipient", "is_read", "-created_at"],
+                name="notif_recipient_read_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.11 on 2026-10-18 10:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0004_unreadnotificationcounter"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="dedup_key",
+            field=models.CharField(
+                blank=True, editable=False, max_length=150, null=True, unique=True
+            ),
+        ),
+    ]
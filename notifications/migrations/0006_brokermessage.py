@@ -0,0 +1,37 @@
+# Generated by Django 5.2.11 on 2026-10-18 11:31
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0005_notification_dedup_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BrokerMessage",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("channel", models.CharField(max_length=100)),
+                (
+                    "payload",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "notifications_brokermessage",
+            },
+        ),
+    ]
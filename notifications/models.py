@@ -1,6 +1,11 @@
 import uuid
-from django.db import models
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models import Case, Count, F, Value, When
 from django.conf import settings
+from django.utils import timezone
+from freelance_arena.utils import cache_is_shared
 
 
 class Notification(models.Model):
@@ -32,11 +37,200 @@ class Notification(models.Model):
     read_at = models.DateTimeField(null=True, blank=True)
     related_competition_id = models.UUIDField(null=True, blank=True)
     related_proposal_id = models.UUIDField(null=True, blank=True)
+    # Set for notifications that must be sent at most once (see dedup_key_for);
+    # NULL for everything else, which the unique index does not compare
+    dedup_key = models.CharField(max_length=150, null=True, blank=True, unique=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = 'notifications_notification'
         ordering = ['-created_at']
+        indexes = [
+            # Inbox listing and unread count: recipient, is_read, newest first
+            models.Index(fields=['recipient', 'is_read', '-created_at'], name='notif_recipient_read_idx'),
+        ]
 
     def __str__(self):
         return f"{self.notification_type} for {self.recipient.username}"
+
+    @staticmethod
+    def dedup_key_for(notification_type, recipient_id, related_competition_id):
+        """Key allowing one notification of a type per recipient and competition."""
+        return f'{notification_type}:{related_competition_id}:{recipient_id}'
+
+
+class NotificationEvent(models.Model):
+    """Outbox entry for a notification that is waiting to be delivered."""
+
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('PROCESSING', 'Processing'),
+        ('FAILED', 'Failed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    event_type = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    available_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'notifications_notificationevent'
+        ordering = ['available_at']
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='notif_event_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} ({self.status})"
+
+
+class BrokerMessage(models.Model):
+    """Message relayed to other processes by pubsub.DatabaseBroker; kept briefly."""
+
+    id = models.BigAutoField(primary_key=True)
+    channel = models.CharField(max_length=100)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        db_table = 'notifications_brokermessage'
+
+    def __str__(self):
+        return f"{self.channel} at {self.created_at}"
+
+
+class UnreadNotificationCounter(models.Model):
+    """
+    Denormalized unread notification count per user. With a shared cache
+    the value is served from the cache and this row is the durable fallback
+    it is filled from. With a per-process cache (LocMem) the row is read
+    directly (one primary key lookup): the outbox worker adjusts counts in
+    another process, so a per-process copy would go stale.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='unread_notification_counter',
+        primary_key=True,
+    )
+    count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'notifications_unreadnotificationcounter'
+
+    def __str__(self):
+        return f"{self.count} unread for {self.user_id}"
+
+    @staticmethod
+    def cache_key(user_id):
+        return f'notifications:unread:{user_id}'
+
+    @classmethod
+    def get_count(cls, user_id):
+        """
+        Return the unread count for a user. Reads the cache (if shared), then
+        the counter row, and only counts notifications when the row does not
+        exist yet.
+        """
+        shared = cache_is_shared()
+        key = cls.cache_key(user_id)
+        count = cache.get(key) if shared else None
+        if count is not None:
+            return count
+
+        count = cls.objects.filter(user_id=user_id).values_list('count', flat=True).first()
+        if count is None:
+            counter, _ = cls.objects.get_or_create(
+                user_id=user_id, defaults={'count': cls.live_counts([user_id])[user_id]}
+            )
+            count = counter.count
+        if shared:
+            cache.set(key, count, settings.NOTIFICATION_UNREAD_CACHE_TIMEOUT)
+        return count
+
+    @classmethod
+    def adjust_many(cls, deltas):
+        """
+        Apply {user_id: delta} to the counter rows inside the caller's
+        transaction. Missing rows are left alone; they are created from a
+        live count on first read. The cache is updated once the transaction
+        commits so a rollback never leaks into it.
+        """
+        by_delta = {}
+        for user_id, delta in deltas.items():
+            if delta:
+                by_delta.setdefault(delta, []).append(user_id)
+        if not by_delta:
+            return
+
+        for delta, user_ids in by_delta.items():
+            if delta > 0:
+                new_count = F('count') + delta
+            else:
+                # Never go below zero on the PositiveIntegerField
+                new_count = Case(
+                    When(count__gte=-delta, then=F('count') + delta),
+                    default=Value(0),
+                )
+            cls.objects.filter(user_id__in=user_ids).update(count=new_count)
+
+        changed = {user_id: delta for user_id, delta in deltas.items() if delta}
+        transaction.on_commit(lambda: cls._adjust_cache(changed))
+
+    @classmethod
+    def _adjust_cache(cls, deltas):
+        if not cache_is_shared():
+            return
+        if len(deltas) > 1:
+            # Fan-outs: drop the keys in one call, the next poll reads the row
+            cache.delete_many([cls.cache_key(user_id) for user_id in deltas])
+            return
+        for user_id, delta in deltas.items():
+            key = cls.cache_key(user_id)
+            try:
+                if cache.incr(key, delta) < 0:
+                    cache.delete(key)
+            except ValueError:
+                # Not cached; the next read fills it from the counter row
+                pass
+
+    @staticmethod
+    def live_counts(user_ids):
+        """Count unread notifications for the given users, in one query."""
+        counts = dict(
+            Notification.objects.filter(
+                recipient_id__in=user_ids, is_read=False
+            ).order_by().values('recipient_id').annotate(
+                total=Count('pk')
+            ).values_list('recipient_id', 'total')
+        )
+        return {user_id: counts.get(user_id, 0) for user_id in user_ids}
+
+    @classmethod
+    def reconcile(cls, user_ids):
+        """
+        Overwrite the counter rows of `user_ids` with live counts and drop
+        their cached values. Returns the number of rows that were missing
+        or out of date.
+        """
+        live = cls.live_counts(user_ids)
+        current = dict(
+            cls.objects.filter(user_id__in=user_ids).values_list('user_id', 'count')
+        )
+        drifted = [user_id for user_id in user_ids if current.get(user_id) != live[user_id]]
+        if drifted:
+            cls.objects.bulk_create(
+                [cls(user_id=user_id, count=live[user_id]) for user_id in drifted],
+                update_conflicts=True,
+                unique_fields=['user'],
+                update_fields=['count', 'updated_at'],
+            )
+            cache.delete_many([cls.cache_key(user_id) for user_id in drifted])
+        return len(drifted)
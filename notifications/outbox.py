@@ -0,0 +1,88 @@
+"""
+Transactional outbox for notification delivery.
+
+Write paths call enqueue(), which inserts a NotificationEvent row in the
+caller's transaction, so the event commits (or rolls back) together with
+the business write. The run_notification_worker command claims pending
+events in batches and delivers them off the request path.
+"""
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import NotificationEvent
+
+logger = logging.getLogger('freelance_arena')
+
+
+def enqueue(event_type, **payload):
+    """
+    Record a notification event. When the outbox is disabled the event
+    is delivered inline instead, once the caller's transaction commits.
+    """
+    if not settings.NOTIFICATION_OUTBOX_ENABLED:
+        transaction.on_commit(lambda: deliver(event_type, payload))
+        return None
+    return NotificationEvent.objects.create(event_type=event_type, payload=payload)
+
+
+def deliver(event_type, payload):
+    """Create the notifications for an event."""
+    from .utils import NotificationDelivery
+
+    handler = getattr(NotificationDelivery, event_type, None)
+    if handler is None or event_type.startswith('_'):
+        raise ValueError(f'Unknown notification event type: {event_type}')
+    handler(**payload)
+
+
+def claim_batch(batch_size):
+    """
+    Lock up to batch_size pending events and mark them PROCESSING.
+    Rows locked by another worker are skipped.
+    """
+    with transaction.atomic():
+        events = list(
+            NotificationEvent.objects.select_for_update(skip_locked=True)
+            .filter(status='PENDING', available_at__lte=timezone.now())
+            .order_by('available_at')[:batch_size]
+        )
+        if events:
+            NotificationEvent.objects.filter(
+                id__in=[event.id for event in events]
+            ).update(status='PROCESSING', locked_at=timezone.now())
+    return events
+
+
+def process_event(event, max_attempts):
+    """
+    Deliver one claimed event. Delivered events are deleted; failures
+    are retried with exponential backoff until max_attempts, then left
+    as FAILED.
+    Returns True when the event was delivered.
+    """
+    try:
+        with transaction.atomic():
+            deliver(event.event_type, event.payload)
+            NotificationEvent.objects.filter(id=event.id).delete()
+        return True
+    except Exception as exc:
+        logger.exception(f'Notification event {event.id} ({event.event_type}) failed: {exc}')
+        attempts = event.attempts + 1
+        NotificationEvent.objects.filter(id=event.id).update(
+            status='FAILED' if attempts >= max_attempts else 'PENDING',
+            attempts=attempts,
+            last_error=str(exc),
+            available_at=timezone.now() + timedelta(seconds=2 ** attempts),
+            locked_at=None,
+        )
+        return False
+
+
+def release_stale(stale_after):
+    """Return events stuck in PROCESSING (e.g. after a worker crash) to the queue."""
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    return NotificationEvent.objects.filter(
+        status='PROCESSING', locked_at__lt=cutoff,
+    ).update(status='PENDING', locked_at=None)
@@ -0,0 +1,299 @@
+"""
+Publish/subscribe channel used to push new notifications to connected
+clients, and competition schedule changes to `run_scheduler`. Each user
+has a channel named by `user_channel()`.
+
+Notifications are usually created by the outbox worker and schedule
+changes by the web servers, so messages must reach other processes. The
+default `DatabaseBroker` relays them through the BrokerMessage table,
+polled by one thread per process, and needs nothing but the database.
+`RedisBroker` relays them through Redis pub/sub without touching the
+database and is the recommended production setting. `LocalBroker` keeps
+subscribers in process memory and only reaches the publishing process.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connection
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger('freelance_arena')
+
+
+class Subscription:
+    """A queue of messages for one channel, consumed from an event loop."""
+
+    def __init__(self, broker, channel, loop, max_pending=100):
+        self.broker = broker
+        self.channel = channel
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_pending)
+
+    def deliver(self, message):
+        """Hand a message to the subscriber's loop. Safe to call from any thread."""
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # Loop already closed; the connection is gone
+            self.close()
+
+    def _put(self, message):
+        if self.queue.full():
+            # Slow consumer: drop the oldest message, the client can catch up with `since`
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        """Wait for the next message. Returns None if `timeout` seconds pass first."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class LocalBroker:
+    """In-process broker for a single process that also delivers notifications."""
+    # Other processes' publishes never arrive
+    shared = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, channel):
+        """Subscribe the running event loop to `channel`."""
+        subscription = Subscription(self, channel, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+    def publish(self, channel, message):
+        """Send `message` to every subscriber of `channel`. Returns the subscriber count."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(message)
+        return len(subscribers)
+
+    def publish_many(self, messages):
+        """Publish an iterable of (channel, message) pairs."""
+        for channel, message in messages:
+            self.publish(channel, message)
+
+
+class RelayBroker(LocalBroker):
+    """
+    Base for brokers that relay messages between processes. `publish`
+    hands messages to `send`; a daemon thread, started by the first
+    subscription, runs `listen` and dispatches what arrives to this
+    process's subscribers.
+    """
+    shared = True
+
+    def __init__(self):
+        super().__init__()
+        self._listener = None
+
+    def subscribe(self, channel):
+        subscription = super().subscribe(channel)
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self.listen, name=type(self).__name__, daemon=True
+                )
+                self._listener.start()
+        return subscription
+
+    def has_subscribers(self):
+        return bool(self._subscribers)
+
+    def publish(self, channel, message):
+        self.send([(channel, message)])
+
+    def publish_many(self, messages):
+        messages = list(messages)
+        if messages:
+            self.send(messages)
+
+    def dispatch(self, channel, message):
+        """Deliver a relayed message to this process's subscribers."""
+        return super().publish(channel, message)
+
+    def send(self, messages):
+        """Relay a list of (channel, message) pairs to every process."""
+        raise NotImplementedError
+
+    def listen(self):
+        """Receive relayed messages forever, passing each to `dispatch`."""
+        raise NotImplementedError
+
+
+class DatabaseBroker(RelayBroker):
+    """
+    Relays messages through the BrokerMessage table. The listener reads new
+    rows every NOTIFICATION_BROKER_POLL_INTERVAL seconds, one query per
+    process however many clients are connected, and none while the process
+    has no subscribers. Rows older than NOTIFICATION_BROKER_RETENTION
+    seconds are deleted by publishers.
+    """
+    # Rows committed after newer ones, or stamped by a server whose clock is
+    # slightly behind, are caught by re-reading this window; ids already
+    # dispatched are skipped
+    overlap = timedelta(seconds=5)
+
+    def __init__(self):
+        super().__init__()
+        self._next_prune = None
+
+    def send(self, messages):
+        from .models import BrokerMessage
+
+        now = timezone.now()
+        if self._next_prune is None or now >= self._next_prune:
+            retention = timedelta(seconds=settings.NOTIFICATION_BROKER_RETENTION)
+            self._next_prune = now + retention
+            BrokerMessage.objects.filter(created_at__lt=now - retention).delete()
+        BrokerMessage.objects.bulk_create(
+            [BrokerMessage(channel=channel, payload=message) for channel, message in messages]
+        )
+
+    def listen(self):
+        from .models import BrokerMessage
+
+        seen = {}
+        polling = False
+        active_since = last_poll = timezone.now()
+        while True:
+            time.sleep(settings.NOTIFICATION_BROKER_POLL_INTERVAL)
+            now = timezone.now()
+            if not self.has_subscribers():
+                if polling:
+                    # Going idle; do not hold a connection the server may time out
+                    polling = False
+                    seen.clear()
+                    connection.close()
+                active_since = last_poll = now
+                continue
+            polling = True
+
+            try:
+                rows = list(
+                    BrokerMessage.objects.filter(
+                        created_at__gte=max(active_since, last_poll - self.overlap),
+                    ).order_by('created_at', 'pk').values_list('pk', 'channel', 'payload', 'created_at')
+                )
+            except DatabaseError:
+                logger.exception('Failed to read broker messages')
+                connection.close()
+                continue
+
+            last_poll = now
+            for pk, channel, payload, created_at in rows:
+                if pk not in seen:
+                    seen[pk] = created_at
+                    self.dispatch(channel, payload)
+            seen = {pk: created_at for pk, created_at in seen.items() if created_at >= now - self.overlap}
+
+
+class RedisBroker(RelayBroker):
+    """
+    Relays messages through Redis pub/sub at NOTIFICATION_BROKER_URL (needs
+    the redis package). Publishing and waiting never touch the database.
+    """
+    prefix = 'freelance_arena:'
+
+    def __init__(self):
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured('RedisBroker requires the redis package.')
+        super().__init__()
+        self._errors = redis.RedisError
+        self._client = redis.Redis.from_url(settings.NOTIFICATION_BROKER_URL, decode_responses=True)
+
+    def send(self, messages):
+        with self._client.pipeline(transaction=False) as pipeline:
+            for channel, message in messages:
+                pipeline.publish(self.prefix + channel, json.dumps(message, cls=DjangoJSONEncoder))
+            pipeline.execute()
+
+    def listen(self):
+        while True:
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.psubscribe(self.prefix + '*')
+                for item in pubsub.listen():
+                    if item['type'] == 'pmessage':
+                        self.dispatch(item['channel'][len(self.prefix):], json.loads(item['data']))
+            except self._errors:
+                logger.exception('Lost the connection to the notification broker')
+                time.sleep(1)
+            finally:
+                pubsub.close()
+
+
+_brokers = {}
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the process-wide broker configured by NOTIFICATION_BROKER."""
+    path = settings.NOTIFICATION_BROKER
+    if path not in _brokers:
+        with _broker_lock:
+            if path not in _brokers:
+                _brokers[path] = import_string(path)()
+    return _brokers[path]
+
+
+def user_channel(user_id):
+    return f'notifications:user:{user_id}'
+
+
+def latest_cache_key(user_id):
+    return f'notifications:latest:{user_id}'
+
+
+def publish_notifications(notifications):
+    """
+    Publish serialized notifications to their recipients' channels and
+    remember each recipient's newest created_at, so long-poll requests can
+    tell there is nothing new without querying the database.
+    """
+    from .serializers import NotificationSerializer
+
+    messages = []
+    latest = {}
+    for notification in notifications:
+        message = NotificationSerializer(notification).data
+        messages.append((user_channel(notification.recipient_id), message))
+        latest[latest_cache_key(notification.recipient_id)] = message['created_at']
+    get_broker().publish_many(messages)
+    if latest:
+        cache.set_many(latest, settings.NOTIFICATION_UNREAD_CACHE_TIMEOUT)
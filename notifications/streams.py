@@ -0,0 +1,202 @@
+"""
+Async push endpoints for notifications, served by the ASGI application.
+
+Both endpoints authenticate with the JWT access token in the Authorization
+header (never the query string, which ends up in server and proxy logs)
+the way API requests do (SnapshotJWTAuthentication), so revoked tokens and
+deactivated users are refused, and wait on the pub/sub channel. An open
+stream re-checks the token at every keep-alive and ends once it is revoked.
+The database is only read to catch up on notifications newer than `since`
+when a request starts; after that, clients wait on the broker.
+"""
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from accounts.authentication import SnapshotJWTAuthentication
+from freelance_arena.utils import cache_is_shared
+from .models import Notification
+from .pubsub import get_broker, latest_cache_key, user_channel
+from .serializers import NotificationSerializer
+
+CATCH_UP_LIMIT = 100
+
+
+def _error(message, detail, status):
+    return JsonResponse(
+        {'success': False, 'message': message, 'errors': {'detail': detail}},
+        status=status,
+    )
+
+
+_authentication = SnapshotJWTAuthentication()
+
+
+async def _access_token(request):
+    """The request's validated access token, or None if it is missing, invalid or revoked."""
+    header = request.headers.get('Authorization', '')
+    if not header.startswith('Bearer '):
+        return None
+    raw = header[7:]
+    try:
+        token = _authentication.get_validated_token(raw)
+    except InvalidToken:
+        return None
+    return token if await _is_current(token) else None
+
+
+async def _is_current(token):
+    """Whether the token is not revoked and its user is still active."""
+    try:
+        await sync_to_async(_authentication.get_user)(token)
+    except (AuthenticationFailed, InvalidToken):
+        return False
+    return True
+
+
+def _parse_since(request):
+    """Return (since, error_response). `since` is an ISO 8601 timestamp."""
+    value = request.GET.get('since') or request.headers.get('Last-Event-ID')
+    if not value:
+        return None, None
+    since = parse_datetime(value)
+    if since is None:
+        return None, _error('Validation error.', 'since must be an ISO 8601 datetime.', 400)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since, None
+
+
+async def _catch_up(user_id, since):
+    """
+    Notifications created after `since`, oldest first. With a shared cache,
+    skips the query when the newest published notification is not newer.
+    """
+    if since is None:
+        return []
+    # publish_notifications records the newest created_at in the cache of the
+    # process that delivers it; only a shared cache sees every delivery
+    shared = cache_is_shared()
+    key = latest_cache_key(user_id)
+    if shared:
+        latest = await cache.aget(key)
+        if latest is not None and parse_datetime(latest) <= since:
+            return []
+
+    queryset = Notification.objects.filter(
+        recipient_id=user_id, created_at__gt=since
+    ).order_by('created_at')[:CATCH_UP_LIMIT]
+    notifications = [notification async for notification in queryset]
+    if not notifications and shared:
+        # Nothing newer exists right now; add() never overwrites a fresher value from publish
+        await cache.aadd(key, since.isoformat(), settings.NOTIFICATION_UNREAD_CACHE_TIMEOUT)
+    return NotificationSerializer(notifications, many=True).data
+
+
+def _sse_event(notification):
+    data = json.dumps(notification, cls=DjangoJSONEncoder)
+    return f"id: {notification['created_at']}\nevent: notification\ndata: {data}\n\n"
+
+
+@require_GET
+async def notification_stream(request):
+    """
+    GET - Server-sent events stream of new notifications.
+    Reconnecting clients resume from `Last-Event-ID` (or `?since=`).
+    The stream ends when the token expires or after
+    NOTIFICATION_STREAM_MAX_DURATION seconds; EventSource reconnects.
+    """
+    token = await _access_token(request)
+    if token is None:
+        return _error('Authentication failed.', 'A valid access token is required.', 401)
+    since, error = _parse_since(request)
+    if error:
+        return error
+
+    user_id = token[jwt_settings.USER_ID_CLAIM]
+    lifetime = min(
+        settings.NOTIFICATION_STREAM_MAX_DURATION,
+        token['exp'] - timezone.now().timestamp(),
+    )
+
+    async def events():
+        with get_broker().subscribe(user_channel(user_id)) as subscription:
+            yield 'retry: 5000\n\n'
+            sent = set()
+
+            def send(notification):
+                sent.add(notification['id'])
+                return _sse_event(notification)
+
+            for notification in await _catch_up(user_id, since):
+                yield send(notification)
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + lifetime
+            while (remaining := deadline - loop.time()) > 0:
+                message = await subscription.get(
+                    timeout=min(settings.NOTIFICATION_STREAM_KEEPALIVE, remaining)
+                )
+                if message is None:
+                    if not await _is_current(token):
+                        break
+                    yield ': keepalive\n\n'
+                elif message['id'] not in sent:
+                    yield send(message)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@require_GET
+async def notification_long_poll(request):
+    """
+    GET - Long-poll for notifications newer than `since`.
+    Returns immediately if any exist, otherwise waits up to `timeout`
+    seconds for one to be published. Pass the returned `since` back on
+    the next request.
+    """
+    token = await _access_token(request)
+    if token is None:
+        return _error('Authentication failed.', 'A valid access token is required.', 401)
+    since, error = _parse_since(request)
+    if error:
+        return error
+    try:
+        timeout = float(request.GET.get('timeout', settings.NOTIFICATION_LONG_POLL_TIMEOUT))
+    except ValueError:
+        return _error('Validation error.', 'timeout must be a number of seconds.', 400)
+    timeout = max(0.0, min(timeout, settings.NOTIFICATION_LONG_POLL_TIMEOUT))
+
+    user_id = token[jwt_settings.USER_ID_CLAIM]
+    with get_broker().subscribe(user_channel(user_id)) as subscription:
+        notifications = list(await _catch_up(user_id, since))
+        if not notifications and timeout:
+            message = await subscription.get(timeout=timeout)
+            if message is not None:
+                notifications.append(message)
+                while not subscription.queue.empty():
+                    notifications.append(subscription.queue.get_nowait())
+
+    if notifications:
+        cursor = notifications[-1]['created_at']
+    else:
+        cursor = since.isoformat() if since else timezone.now().isoformat()
+    return JsonResponse(
+        {
+            'success': True,
+            'message': 'Notifications retrieved.',
+            'data': {'notifications': notifications, 'since': cursor},
+        },
+        encoder=DjangoJSONEncoder,
+    )
@@ -1,10 +1,12 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from rest_framework.test import APIClient
 from rest_framework import status
 from accounts.models import User
+from freelance_arena.testing import sync_last_seen
 from .models import Notification
 
 
+@sync_last_seen
 class NotificationsTestCase(TestCase):
     """Test cases for the notifications app."""
 
@@ -45,3 +47,276 @@ class NotificationsTestCase(TestCase):
         self.assertEqual(
             Notification.objects.filter(recipient=self.user, is_read=False).count(), 0
         )
+
+    def test_fan_out_dedupes_and_batches(self):
+        """Test that fan_out renders once, skips duplicate recipients and inserts in chunks."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .utils import NotificationService
+
+        recipients = [self.user]
+        for i in range(4):
+            recipients.append(User.objects.create_user(
+                email=f'fanout{i}@test.com',
+                username=f'fanout{i}',
+                password='testpass123',
+                first_name='Fan',
+                last_name='Out',
+                role='FREELANCER',
+            ))
+        recipient_ids = [user.id for user in recipients] + [self.user.id]
+
+        with CaptureQueriesContext(connection) as ctx:
+            created = NotificationService.fan_out(
+                recipient_ids,
+                notification_type='COMPETITION_CLOSED',
+                title='Competition Closed',
+                template='The competition "{title}" has been closed.',
+                context={'title': 'Logo {design}'},
+                batch_size=2,
+            )
+
+        self.assertEqual(created, 5)
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(
+            Notification.objects.filter(
+                notification_type='COMPETITION_CLOSED',
+                message='The competition "Logo {design}" has been closed.',
+            ).count(),
+            5,
+        )
+
+    def test_outbox_worker_delivers_queued_events(self):
+        """Test that write paths only queue events and the worker delivers them."""
+        from datetime import timedelta
+        from io import StringIO
+        from django.core.management import call_command
+        from django.utils import timezone
+        from competitions.models import Competition
+        from proposals.models import Proposal
+        from .models import NotificationEvent
+
+        freelancer = User.objects.create_user(
+            email='freelancer@test.com',
+            username='testfreelancer',
+            password='testpass123',
+            first_name='Test',
+            last_name='Freelancer',
+            role='FREELANCER',
+        )
+        competition = Competition.objects.create(
+            client=self.user,
+            title='Outbox Competition',
+            description='Test',
+            requirements='Test',
+            budget=500,
+            deadline=timezone.now() + timedelta(days=30),
+            submission_deadline=timezone.now() + timedelta(days=20),
+            category='Test',
+            status='OPEN',
+        )
+        Proposal.objects.create(
+            competition=competition,
+            freelancer=freelancer,
+            title='Queued Proposal',
+            description='Test',
+            proposed_budget=400,
+            estimated_duration=10,
+        )
+
+        self.assertEqual(
+            NotificationEvent.objects.filter(event_type='proposal_received').count(), 1
+        )
+        self.assertFalse(
+            Notification.objects.filter(related_competition_id=competition.id).exists()
+        )
+
+        call_command('run_notification_worker', '--once', '--workers', '1', stdout=StringIO())
+
+        self.assertEqual(NotificationEvent.objects.count(), 0)
+        self.assertTrue(
+            Notification.objects.filter(
+                recipient=self.user,
+                notification_type='PROPOSAL_RECEIVED',
+                related_competition_id=competition.id,
+            ).exists()
+        )
+
+    def test_unread_count_is_served_from_counter(self):
+        """Test that polling uses the cached counter and writes keep it in step."""
+        from io import StringIO
+        from django.core.management import call_command
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from freelance_arena.testing import shared_cache
+        from .models import UnreadNotificationCounter
+        from .utils import NotificationService
+
+        self.client_api.force_authenticate(user=self.user)
+        response = self.client_api.get('/api/notifications/unread-count/')
+        self.assertEqual(response.data['data']['unread_count'], 5)
+
+        # Steady state: the notifications table is not queried, and with a
+        # per-process cache the counter row is read on every poll
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client_api.get('/api/notifications/unread-count/')
+        self.assertEqual(response.data['data']['unread_count'], 5)
+        self.assertFalse(
+            [q for q in ctx.captured_queries if 'notifications_notification"' in q['sql']]
+        )
+        self.assertTrue(
+            [q for q in ctx.captured_queries if 'notifications_unreadnotificationcounter"' in q['sql']]
+        )
+
+        # A count changed by another process (the outbox worker) is seen at once
+        UnreadNotificationCounter.objects.filter(user=self.user).update(count=7)
+        self.assertEqual(UnreadNotificationCounter.get_count(self.user.id), 7)
+        UnreadNotificationCounter.objects.filter(user=self.user).update(count=5)
+
+        # With a shared cache the counter row is not read either
+        with shared_cache():
+            UnreadNotificationCounter.get_count(self.user.id)
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(UnreadNotificationCounter.get_count(self.user.id), 5)
+            self.assertEqual(len(ctx.captured_queries), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.create(
+                recipient=self.user,
+                notification_type='NEW_REVIEW',
+                title='New Review Received',
+                message='You received a new review.',
+            )
+        response = self.client_api.get('/api/notifications/unread-count/')
+        self.assertEqual(response.data['data']['unread_count'], 6)
+
+        ids = list(Notification.objects.filter(recipient=self.user).values_list('id', flat=True)[:2])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client_api.post(
+                '/api/notifications/mark-read/', {'notification_ids': ids}, format='json'
+            )
+        response = self.client_api.get('/api/notifications/')
+        self.assertEqual(response.data['data']['unread_count'], 4)
+
+        # Drift is repaired by the reconcile command
+        UnreadNotificationCounter.objects.filter(user=self.user).update(count=40)
+        out = StringIO()
+        call_command('reconcile_unread_counts', stdout=out)
+        self.assertEqual(UnreadNotificationCounter.get_count(self.user.id), 4)
+        self.assertIn('1 were missing or out of date', out.getvalue())
+
+    def test_long_poll_and_stream_catch_up(self):
+        """Test that long-poll and SSE return missed notifications and idle polls skip the DB."""
+        from datetime import timedelta
+        from asgiref.sync import async_to_sync
+        from django.core.cache import cache
+        from django.db import connection
+        from django.test import override_settings
+        from django.test.utils import CaptureQueriesContext
+        from django.utils import timezone
+        from accounts.tokens import UserRefreshToken
+        from freelance_arena.testing import shared_cache
+        from .pubsub import latest_cache_key
+
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {UserRefreshToken.for_user(self.user).access_token}'}
+        since = (timezone.now() - timedelta(minutes=5)).isoformat()
+
+        response = self.client.get('/api/notifications/poll/', {'since': since, 'timeout': 0}, **auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()['data']
+        self.assertEqual(len(data['notifications']), 5)
+
+        # First empty poll records that nothing is newer; with a shared cache
+        # later idle polls run no queries
+        with shared_cache():
+            self.client.get('/api/notifications/poll/', {'since': data['since'], 'timeout': 0}, **auth)
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(
+                    '/api/notifications/poll/', {'since': data['since'], 'timeout': 0}, **auth
+                )
+        self.assertEqual(response.json()['data']['notifications'], [])
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        # With a per-process cache another process's delivery would go unseen, so nothing is cached
+        cache.delete(latest_cache_key(self.user.id))
+        self.client.get('/api/notifications/poll/', {'since': data['since'], 'timeout': 0}, **auth)
+        self.assertIsNone(cache.get(latest_cache_key(self.user.id)))
+        Notification.objects.create(
+            recipient=self.user, notification_type='NEW_REVIEW', title='From the worker', message='',
+        )
+        response = self.client.get('/api/notifications/poll/', {'since': data['since'], 'timeout': 0}, **auth)
+        self.assertEqual(
+            [n['title'] for n in response.json()['data']['notifications']], ['From the worker']
+        )
+
+        async def read(streaming_content):
+            return b''.join([chunk async for chunk in streaming_content]).decode()
+
+        with override_settings(NOTIFICATION_STREAM_MAX_DURATION=0):
+            response = self.client.get('/api/notifications/stream/', {'since': since}, **auth)
+            body = async_to_sync(read)(response.streaming_content)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(body.count('event: notification'), 6)
+
+        with self.assertLogs('django.request', level='WARNING'):
+            response = self.client.get('/api/notifications/poll/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Tokens in the query string are not accepted
+        with self.assertLogs('django.request', level='WARNING'):
+            response = self.client.get(
+                '/api/notifications/poll/', {'timeout': 0, 'token': auth['HTTP_AUTHORIZATION'][7:]}
+            )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # A role change revokes the token for streams as well
+        self.user.role = 'FREELANCER'
+        self.user.save()
+        with self.assertLogs('django.request', level='WARNING'):
+            response = self.client.get('/api/notifications/poll/', {'timeout': 0}, **auth)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_local_broker_delivers_across_threads(self):
+        """Test that messages published from another thread reach the subscriber."""
+        import threading
+        from .pubsub import LocalBroker
+
+        broker = LocalBroker()
+        with broker.subscribe('notifications:user:1') as subscription:
+            thread = threading.Thread(
+                target=broker.publish, args=('notifications:user:1', {'id': 'a'})
+            )
+            thread.start()
+            thread.join()
+            self.assertEqual(await subscription.get(timeout=1), {'id': 'a'})
+            self.assertIsNone(await subscription.get(timeout=0.01))
+        self.assertEqual(broker.publish('notifications:user:1', {'id': 'b'}), 0)
+
+
+class NotificationBrokerTestCase(TransactionTestCase):
+    """Brokers relay committed rows between processes, so these tests commit."""
+
+    async def test_database_broker_delivers_across_processes(self):
+        """Test that messages published by another process's broker reach subscribers once."""
+        from asgiref.sync import sync_to_async
+        from django.test import override_settings
+        from .models import BrokerMessage
+        from .pubsub import DatabaseBroker
+
+        # Two instances stand in for a web server and the outbox worker
+        web, worker = DatabaseBroker(), DatabaseBroker()
+        with override_settings(NOTIFICATION_BROKER_POLL_INTERVAL=0.05):
+            with web.subscribe('notifications:user:1') as subscription:
+                await sync_to_async(worker.publish_many)([
+                    ('notifications:user:1', {'id': 'a'}),
+                    ('notifications:user:2', {'id': 'b'}),
+                ])
+                self.assertEqual(await subscription.get(timeout=2), {'id': 'a'})
+                # Re-read rows are not delivered twice
+                self.assertIsNone(await subscription.get(timeout=0.3))
+
+            # Publishers delete messages older than the retention period
+            with override_settings(NOTIFICATION_BROKER_RETENTION=0):
+                await sync_to_async(DatabaseBroker().publish)('notifications:user:1', {'id': 'c'})
+        self.assertEqual(await BrokerMessage.objects.acount(), 1)
@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import streams, views
 
 app_name = 'notifications'
 
@@ -8,4 +8,6 @@ urlpatterns = [
     path('mark-read/', views.MarkNotificationsReadView.as_view(), name='mark-read'),
     path('mark-all-read/', views.MarkAllReadView.as_view(), name='mark-all-read'),
     path('unread-count/', views.UnreadCountView.as_view(), name='unread-count'),
+    path('stream/', streams.notification_stream, name='notification-stream'),
+    path('poll/', streams.notification_long_poll, name='notification-poll'),
 ]
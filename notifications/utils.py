@@ -1,39 +1,187 @@
-from .models import Notification
+from collections import Counter
+from itertools import islice
+from django.conf import settings
+from django.db import transaction
+from .models import Notification, UnreadNotificationCounter
+from . import outbox, pubsub
 
 
 class NotificationService:
     """Service class for creating notifications."""
 
+    @staticmethod
+    def create(**fields):
+        """Create a single notification and bump the recipient's unread counter."""
+        with transaction.atomic():
+            notification = Notification.objects.create(**fields)
+            if not notification.is_read:
+                UnreadNotificationCounter.adjust_many({notification.recipient_id: 1})
+            transaction.on_commit(
+                lambda: pubsub.publish_notifications([notification]), robust=True
+            )
+        return notification
+
+    @staticmethod
+    def create_bulk(notifications, batch_size=None, ignore_conflicts=False):
+        """
+        Insert unsaved Notification objects with bulk_create, one INSERT
+        per chunk. Accepts any iterable, so callers can stream rows.
+        Unread counters are bumped with each chunk.
+        With `ignore_conflicts`, rows whose dedup_key already exists are
+        skipped and neither counted nor published.
+        Returns the number of notifications inserted.
+        """
+        batch_size = batch_size or settings.NOTIFICATION_FANOUT_BATCH_SIZE
+        iterator = iter(notifications)
+        total = 0
+        while True:
+            chunk = list(islice(iterator, batch_size))
+            if not chunk:
+                break
+            with transaction.atomic():
+                Notification.objects.bulk_create(chunk, ignore_conflicts=ignore_conflicts)
+                if ignore_conflicts:
+                    # Skipped rows keep the id generated here, which was never stored
+                    inserted = set(
+                        Notification.objects.filter(
+                            pk__in=[n.pk for n in chunk]
+                        ).values_list('pk', flat=True)
+                    )
+                    chunk = [n for n in chunk if n.pk in inserted]
+                UnreadNotificationCounter.adjust_many(
+                    Counter(n.recipient_id for n in chunk if not n.is_read)
+                )
+                transaction.on_commit(
+                    lambda chunk=chunk: pubsub.publish_notifications(chunk), robust=True
+                )
+            total += len(chunk)
+        return total
+
+    @staticmethod
+    def fan_out(recipient_ids, notification_type, title, template, context=None,
+                related_competition_id=None, related_proposal_ids=None, batch_size=None):
+        """
+        Send the same notification to many recipients.
+        Recipients are de-duplicated, the title and message template are
+        rendered once with str.format(**context), and rows are inserted in
+        chunks. `related_proposal_ids` optionally maps recipient id to the
+        proposal the notification refers to.
+        """
+        context = context or {}
+        related_proposal_ids = related_proposal_ids or {}
+        rendered_title = title.format(**context)
+        message = template.format(**context)
+
+        notifications = (
+            Notification(
+                recipient_id=recipient_id,
+                notification_type=notification_type,
+                title=rendered_title,
+                message=message,
+                related_competition_id=related_competition_id,
+                related_proposal_id=related_proposal_ids.get(recipient_id),
+            )
+            for recipient_id in dict.fromkeys(recipient_ids)
+        )
+        return NotificationService.create_bulk(notifications, batch_size=batch_size)
+
     @staticmethod
     def notify_proposal_received(competition, proposal):
         """Notify the client that a new proposal was received."""
-        Notification.objects.create(
-            recipient=competition.client,
+        outbox.enqueue('proposal_received', proposal_id=proposal.id)
+
+    @staticmethod
+    def notify_proposal_scored(proposal):
+        """Notify the freelancer that their proposal was scored."""
+        outbox.enqueue(
+            'proposal_scored', proposal_id=proposal.id, score=proposal.client_score,
+        )
+
+    @staticmethod
+    def notify_winner_selected(competition, winning_proposal):
+        """Notify the winner and all losing freelancers."""
+        outbox.enqueue(
+            'winner_selected',
+            competition_id=competition.id,
+            proposal_id=winning_proposal.id,
+        )
+
+    @staticmethod
+    def notify_question_answered(question):
+        """Notify the freelancer who asked the question."""
+        outbox.enqueue('question_answered', question_id=question.id)
+
+    @staticmethod
+    def notify_competition_closed(competition):
+        """Notify all participating freelancers that the competition is closed."""
+        outbox.enqueue('competition_closed', competition_id=competition.id)
+
+    @staticmethod
+    def notify_competition_opened(competition):
+        """Notify users who bookmarked the competition that it is now open."""
+        outbox.enqueue('competition_opened', competition_id=competition.id)
+
+    @staticmethod
+    def notify_competition_in_review(competition):
+        """Notify participating freelancers that the submission period has ended."""
+        outbox.enqueue('competition_in_review', competition_id=competition.id)
+
+    @staticmethod
+    def notify_competitions_in_review(competition_ids):
+        """Notify participating freelancers of many competitions with one event."""
+        outbox.enqueue(
+            'competitions_in_review',
+            competition_ids=[str(competition_id) for competition_id in competition_ids],
+        )
+
+    @staticmethod
+    def notify_new_review(review):
+        """Notify the reviewee about a new review."""
+        outbox.enqueue('new_review', review_id=review.id)
+
+
+class NotificationDelivery:
+    """
+    Creates the Notification rows for an outbox event.
+    Each method takes the event payload as keyword arguments.
+    """
+
+    @staticmethod
+    def proposal_received(proposal_id):
+        from proposals.models import Proposal
+        proposal = Proposal.objects.select_related('competition').get(id=proposal_id)
+        competition = proposal.competition
+        NotificationService.create(
+            recipient_id=competition.client_id,
             notification_type='PROPOSAL_RECEIVED',
-            title=f'New Proposal Received',
+            title='New Proposal Received',
             message=f'A new proposal "{proposal.title}" has been submitted to your competition "{competition.title}".',
             related_competition_id=competition.id,
             related_proposal_id=proposal.id,
         )
 
     @staticmethod
-    def notify_proposal_scored(proposal):
-        """Notify the freelancer that their proposal was scored."""
-        Notification.objects.create(
-            recipient=proposal.freelancer,
+    def proposal_scored(proposal_id, score):
+        from proposals.models import Proposal
+        proposal = Proposal.objects.select_related('competition').get(id=proposal_id)
+        NotificationService.create(
+            recipient_id=proposal.freelancer_id,
             notification_type='PROPOSAL_SCORED',
             title='Your Proposal Was Scored',
-            message=f'Your proposal "{proposal.title}" for "{proposal.competition.title}" received a score of {proposal.client_score}/5.',
+            message=f'Your proposal "{proposal.title}" for "{proposal.competition.title}" received a score of {score}/5.',
             related_competition_id=proposal.competition_id,
             related_proposal_id=proposal.id,
         )
 
     @staticmethod
-    def notify_winner_selected(competition, winning_proposal):
-        """Notify the winner and all losing freelancers."""
+    def winner_selected(competition_id, proposal_id):
+        from proposals.models import Proposal
+        winning_proposal = Proposal.objects.select_related('competition').get(id=proposal_id)
+        competition = winning_proposal.competition
+
         # Notify the winner
-        Notification.objects.create(
-            recipient=winning_proposal.freelancer,
+        NotificationService.create(
+            recipient_id=winning_proposal.freelancer_id,
             notification_type='WINNER_SELECTED',
             title='Congratulations! You Won!',
             message=f'Your proposal "{winning_proposal.title}" was selected as the winner for "{competition.title}"!',
@@ -42,30 +190,32 @@ class NotificationService:
         )
 
         # Notify losing freelancers
-        from proposals.models import Proposal
-        losing_proposals = Proposal.objects.filter(
-            competition=competition
-        ).exclude(
-            id=winning_proposal.id
-        ).exclude(
-            status='WITHDRAWN'
-        ).select_related('freelancer')
-
-        for proposal in losing_proposals:
-            Notification.objects.create(
-                recipient=proposal.freelancer,
-                notification_type='PROPOSAL_REJECTED',
-                title='Competition Result',
-                message=f'The competition "{competition.title}" has been decided. Unfortunately, your proposal was not selected.',
-                related_competition_id=competition.id,
-                related_proposal_id=proposal.id,
-            )
+        losing_proposals = dict(
+            Proposal.objects.filter(
+                competition_id=competition_id
+            ).exclude(
+                id=winning_proposal.id
+            ).exclude(
+                status='WITHDRAWN'
+            ).values_list('freelancer_id', 'id')
+        )
+
+        NotificationService.fan_out(
+            losing_proposals.keys(),
+            notification_type='PROPOSAL_REJECTED',
+            title='Competition Result',
+            template='The competition "{title}" has been decided. Unfortunately, your proposal was not selected.',
+            context={'title': competition.title},
+            related_competition_id=competition.id,
+            related_proposal_ids=losing_proposals,
+        )
 
     @staticmethod
-    def notify_question_answered(question):
-        """Notify the freelancer who asked the question."""
-        Notification.objects.create(
-            recipient=question.asked_by,
+    def question_answered(question_id):
+        from competitions.models import CompetitionQuestion
+        question = CompetitionQuestion.objects.select_related('competition').get(id=question_id)
+        NotificationService.create(
+            recipient_id=question.asked_by_id,
             notification_type='QUESTION_ANSWERED',
             title='Your Question Was Answered',
             message=f'Your question on "{question.competition.title}" has been answered.',
@@ -73,34 +223,90 @@ class NotificationService:
         )
 
     @staticmethod
-    def notify_competition_closed(competition):
-        """Notify all participating freelancers that the competition is closed."""
+    def competition_closed(competition_id):
+        NotificationDelivery._notify_participants(
+            competition_id,
+            title='Competition Closed',
+            template='The competition "{title}" has been closed.',
+        )
+
+    @staticmethod
+    def competition_in_review(competition_id):
+        NotificationDelivery._notify_participants(
+            competition_id,
+            title='Competition Moved to Review',
+            template='The competition "{title}" submission period has ended and is now under review.',
+        )
+
+    @staticmethod
+    def competitions_in_review(competition_ids):
+        """One joined query for every participant of the batch, inserted in chunks."""
         from proposals.models import Proposal
-        proposals = Proposal.objects.filter(
-            competition=competition
+        participants = Proposal.objects.filter(
+            competition_id__in=competition_ids
         ).exclude(
             status='WITHDRAWN'
-        ).select_related('freelancer')
-
-        notified_users = set()
-        for proposal in proposals:
-            if proposal.freelancer_id not in notified_users:
-                Notification.objects.create(
-                    recipient=proposal.freelancer,
-                    notification_type='COMPETITION_CLOSED',
-                    title='Competition Closed',
-                    message=f'The competition "{competition.title}" has been closed.',
-                    related_competition_id=competition.id,
-                )
-                notified_users.add(proposal.freelancer_id)
+        ).values_list('competition_id', 'freelancer_id', 'competition__title').order_by()
+
+        NotificationService.create_bulk(
+            Notification(
+                recipient_id=freelancer_id,
+                notification_type='COMPETITION_CLOSED',
+                title='Competition Moved to Review',
+                message=f'The competition "{title}" submission period has ended and is now under review.',
+                related_competition_id=competition_id,
+            )
+            for competition_id, freelancer_id, title in participants.iterator(
+                chunk_size=settings.NOTIFICATION_FANOUT_BATCH_SIZE
+            )
+        )
 
     @staticmethod
-    def notify_new_review(review):
-        """Notify the reviewee about a new review."""
-        Notification.objects.create(
-            recipient=review.reviewee,
+    def competition_opened(competition_id):
+        from competitions.models import Competition, CompetitionBookmark
+        competition = Competition.objects.get(id=competition_id)
+        user_ids = CompetitionBookmark.objects.filter(
+            competition_id=competition_id
+        ).values_list('user_id', flat=True)
+
+        NotificationService.fan_out(
+            user_ids,
+            notification_type='COMPETITION_OPENED',
+            title='Competition Now Open: {title}',
+            template='The competition "{title}" you bookmarked is now open for submissions.',
+            context={'title': competition.title},
+            related_competition_id=competition.id,
+        )
+
+    @staticmethod
+    def new_review(review_id):
+        from feedback.models import Review
+        review = Review.objects.select_related('reviewer').get(id=review_id)
+        NotificationService.create(
+            recipient_id=review.reviewee_id,
             notification_type='NEW_REVIEW',
             title='New Review Received',
             message=f'You received a new {review.rating}/5 star review from {review.reviewer.username}.',
             related_competition_id=review.competition_id,
         )
+
+    @staticmethod
+    def _notify_participants(competition_id, title, template):
+        """Send a COMPETITION_CLOSED notification to every non-withdrawn freelancer."""
+        from competitions.models import Competition
+        from proposals.models import Proposal
+        competition = Competition.objects.get(id=competition_id)
+        freelancer_ids = Proposal.objects.filter(
+            competition_id=competition_id
+        ).exclude(
+            status='WITHDRAWN'
+        ).values_list('freelancer_id', flat=True)
+
+        NotificationService.fan_out(
+            freelancer_ids,
+            notification_type='COMPETITION_CLOSED',
+            title=title,
+            template=template,
+            context={'title': competition.title},
+            related_competition_id=competition.id,
+        )
@@ -1,9 +1,11 @@
 from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
 from django.utils import timezone
+from freelance_arena.pagination import HybridPagination
 from freelance_arena.utils import success_response
-from .models import Notification
+from .models import Notification, UnreadNotificationCounter
 from .serializers import NotificationSerializer, MarkReadSerializer
 
 
@@ -11,6 +13,8 @@ class NotificationListView(generics.ListAPIView):
     """GET - List own notifications."""
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = HybridPagination
+    cursor_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         queryset = Notification.objects.filter(recipient=self.request.user)
@@ -26,9 +30,7 @@ class NotificationListView(generics.ListAPIView):
 
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
-        unread_count = Notification.objects.filter(
-            recipient=request.user, is_read=False
-        ).count()
+        unread_count = UnreadNotificationCounter.get_count(request.user.id)
         return success_response(
             data={
                 'notifications': response.data,
@@ -47,11 +49,13 @@ class MarkNotificationsReadView(APIView):
         serializer.is_valid(raise_exception=True)
 
         notification_ids = serializer.validated_data['notification_ids']
-        updated = Notification.objects.filter(
-            id__in=notification_ids,
-            recipient=request.user,
-            is_read=False,
-        ).update(is_read=True, read_at=timezone.now())
+        with transaction.atomic():
+            updated = Notification.objects.filter(
+                id__in=notification_ids,
+                recipient=request.user,
+                is_read=False,
+            ).update(is_read=True, read_at=timezone.now())
+            UnreadNotificationCounter.adjust_many({request.user.id: -updated})
 
         return success_response(
             data={'marked_count': updated},
@@ -64,9 +68,11 @@ class MarkAllReadView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        updated = Notification.objects.filter(
-            recipient=request.user, is_read=False
-        ).update(is_read=True, read_at=timezone.now())
+        with transaction.atomic():
+            updated = Notification.objects.filter(
+                recipient=request.user, is_read=False
+            ).update(is_read=True, read_at=timezone.now())
+            UnreadNotificationCounter.adjust_many({request.user.id: -updated})
         return success_response(
             data={'marked_count': updated},
             message=f'{updated} notification(s) marked as read.',
@@ -78,9 +84,7 @@ class UnreadCountView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        count = Notification.objects.filter(
-            recipient=request.user, is_read=False
-        ).count()
+        count = UnreadNotificationCounter.get_count(request.user.id)
         return success_response(
             data={'unread_count': count},
             message='Unread count retrieved.',
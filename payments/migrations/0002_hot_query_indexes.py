@@ -0,0 +1,19 @@
+# Generated by Django 5.2.11 on 2026-10-18 10:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="paymentrecord",
+            index=models.Index(
+                fields=["status", "-created_at"], name="payment_status_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.11 on 2026-10-18 10:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("competitions", "0004_hot_query_indexes"),
+        ("payments", "0002_hot_query_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="paymentrecord",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="payment_created_idx"
+            ),
+        ),
+    ]
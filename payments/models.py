@@ -47,6 +47,12 @@ class PaymentRecord(models.Model):
     class Meta:
         db_table = 'payments_paymentrecord'
         ordering = ['-created_at']
+        indexes = [
+            # Admin payment list filtered by status, newest first
+            models.Index(fields=['status', '-created_at'], name='payment_status_created_idx'),
+            # Unfiltered admin list and keyset pagination on (created_at, id)
+            models.Index(fields=['-created_at', '-id'], name='payment_created_idx'),
+        ]
 
     def __str__(self):
         return f"Payment for {self.competition.title} - {self.status}"
@@ -1,9 +1,12 @@
 from rest_framework import serializers
+from freelance_arena.mixins import EagerLoadingSerializerMixin
 from .models import PaymentRecord
 
 
-class PaymentRecordSerializer(serializers.ModelSerializer):
+class PaymentRecordSerializer(EagerLoadingSerializerMixin, serializers.ModelSerializer):
     """Full payment detail serializer for admin."""
+    select_related_fields = ('competition', 'client', 'freelancer')
+
     competition_title = serializers.CharField(source='competition.title', read_only=True)
     client_username = serializers.CharField(source='client.username', read_only=True)
     freelancer_username = serializers.CharField(
@@ -21,8 +24,10 @@ class PaymentRecordSerializer(serializers.ModelSerializer):
         ]
 
 
-class ClientPaymentSerializer(serializers.ModelSerializer):
+class ClientPaymentSerializer(EagerLoadingSerializerMixin, serializers.ModelSerializer):
     """Read-only serializer for client payment view."""
+    select_related_fields = ('competition',)
+
     competition_title = serializers.CharField(source='competition.title', read_only=True)
 
     class Meta:
@@ -33,8 +38,10 @@ class ClientPaymentSerializer(serializers.ModelSerializer):
         ]
 
 
-class FreelancerPaymentSerializer(serializers.ModelSerializer):
+class FreelancerPaymentSerializer(EagerLoadingSerializerMixin, serializers.ModelSerializer):
     """Read-only serializer for freelancer payment view."""
+    select_related_fields = ('competition',)
+
     competition_title = serializers.CharField(source='competition.title', read_only=True)
 
     class Meta:
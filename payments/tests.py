@@ -5,12 +5,14 @@ from django.utils import timezone
 from datetime import timedelta
 from decimal import Decimal
 from accounts.models import User
+from freelance_arena.testing import QueryCountAssertionsMixin, sync_last_seen
 from competitions.models import Competition
 from proposals.models import Proposal
 from .models import PaymentRecord
 
 
-class PaymentsTestCase(TestCase):
+@sync_last_seen
+class PaymentsTestCase(QueryCountAssertionsMixin, TestCase):
     """Test cases for the payments app."""
 
     def setUp(self):
@@ -54,6 +56,35 @@ class PaymentsTestCase(TestCase):
             estimated_duration=10,
         )
 
+    def _make_payment(self, index):
+        competition = Competition.objects.create(
+            client=self.client_user,
+            title=f'Competition {index}',
+            description='Test',
+            requirements='Test',
+            budget=Decimal('500.00'),
+            deadline=timezone.now() + timedelta(days=30),
+            submission_deadline=timezone.now() + timedelta(days=20),
+            category='Test',
+            status='CLOSED',
+        )
+        return PaymentRecord.objects.create(
+            competition=competition,
+            client=self.client_user,
+            freelancer=self.freelancer_user,
+            amount=Decimal('500.00'),
+        )
+
+    def _make_admin(self):
+        return User.objects.create_user(
+            email='admin@test.com',
+            username='testadmin',
+            password='testpass123',
+            first_name='Test',
+            last_name='Admin',
+            role='ADMIN',
+        )
+
     def test_payment_created_on_winner_selection(self):
         """Test that a payment record is created when a winner is selected."""
         self.client_api.force_authenticate(user=self.client_user)
@@ -91,3 +122,55 @@ class PaymentsTestCase(TestCase):
         self.client_api.force_authenticate(user=self.client_user)
         response = self.client_api.get('/api/payments/client/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_admin_payment_list_query_count_is_constant(self):
+        """Test that the admin payment list does not look up relations per row."""
+        self.client_api.force_authenticate(user=self._make_admin())
+
+        self.assertConstantQueryCount(
+            self.client_api, '/api/payments/admin/', self._make_payment,
+        )
+
+    def test_admin_payment_list_cursor_and_uncounted_pages(self):
+        """Test keyset pages cover every row once and count=false skips COUNT(*)."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        payments = [self._make_payment(i) for i in range(25)]
+        # Ties on created_at must be broken by id
+        PaymentRecord.objects.filter(
+            pk__in=[payment.pk for payment in payments[:12]]
+        ).update(created_at=timezone.now())
+        self.client_api.force_authenticate(user=self._make_admin())
+
+        seen = []
+        pages = []
+        url = '/api/payments/admin/?cursor='
+        while url:
+            response = self.client_api.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = response.data['data']
+            self.assertIsNone(data['count'])
+            pages.append([row['id'] for row in data['results']])
+            seen.extend(pages[-1])
+            url = data['next']
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+
+        # Going back from the second page returns the first
+        response = self.client_api.get('/api/payments/admin/?cursor=')
+        second = self.client_api.get(response.data['data']['next']).data['data']
+        first = self.client_api.get(second['previous']).data['data']
+        self.assertEqual([row['id'] for row in first['results']], pages[0])
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client_api.get('/api/payments/admin/?count=false&page=2')
+        data = response.data['data']
+        self.assertIsNone(data['count'])
+        self.assertEqual(len(data['results']), 10)
+        self.assertIsNotNone(data['next'])
+        self.assertFalse([q for q in ctx.captured_queries if 'COUNT(' in q['sql']])
+
+        response = self.client_api.get('/api/payments/admin/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
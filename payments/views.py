@@ -3,6 +3,8 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from freelance_arena.mixins import EagerLoadingViewMixin
+from freelance_arena.pagination import HybridPagination
 from freelance_arena.utils import success_response
 from accounts.permissions import IsClient, IsFreelancer, IsAdminRole
 from .models import PaymentRecord
@@ -14,7 +16,7 @@ from .serializers import (
 )
 
 
-class MyClientPaymentsView(generics.ListAPIView):
+class MyClientPaymentsView(EagerLoadingViewMixin, generics.ListAPIView):
     """GET - Client's own payment records."""
     serializer_class = ClientPaymentSerializer
     permission_classes = [IsAuthenticated, IsClient]
@@ -27,7 +29,7 @@ class MyClientPaymentsView(generics.ListAPIView):
         return success_response(data=response.data, message='Client payments retrieved.')
 
 
-class MyFreelancerPaymentsView(generics.ListAPIView):
+class MyFreelancerPaymentsView(EagerLoadingViewMixin, generics.ListAPIView):
     """GET - Freelancer's own payment records received."""
     serializer_class = FreelancerPaymentSerializer
     permission_classes = [IsAuthenticated, IsFreelancer]
@@ -60,13 +62,15 @@ class PaymentDetailView(APIView):
         return success_response(data=serializer.data, message='Payment detail retrieved.')
 
 
-class AdminPaymentListView(generics.ListAPIView):
+class AdminPaymentListView(EagerLoadingViewMixin, generics.ListAPIView):
     """GET - Admin only. All payments with filters."""
     serializer_class = PaymentRecordSerializer
     permission_classes = [IsAuthenticated, IsAdminRole]
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['created_at', 'amount', 'status']
     ordering = ['-created_at']
+    pagination_class = HybridPagination
+    cursor_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         queryset = PaymentRecord.objects.all()
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.11 on 2026-10-18 10:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("proposals", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="proposal",
+            index=models.Index(
+                fields=["competition", "status"], name="proposal_comp_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="proposal",
+            index=models.Index(
+                fields=["freelancer", "-created_at"], name="proposal_freelancer_idx"
+            ),
+        ),
+    ]
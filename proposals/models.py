@@ -1,6 +1,25 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.utils import timezone
+
+
+class ProposalQuerySet(models.QuerySet):
+    """Custom queryset for proposals."""
+
+    def detail_version(self, pk):
+        """
+        Access-control ids plus the values that change whenever the detail
+        of proposal `pk` does (updated_at, the names it shows, attachments),
+        read in one grouped query. Returns None if the proposal does not exist.
+        """
+        return self.filter(pk=pk).values(
+            'freelancer_id', 'competition__client_id', 'updated_at',
+            'freelancer__username', 'competition__title',
+        ).annotate(
+            attachment_count=models.Count('attachments'),
+            last_upload=models.Max('attachments__uploaded_at'),
+        ).order_by('updated_at').first()
 
 
 class Proposal(models.Model):
@@ -38,14 +57,37 @@ class Proposal(models.Model):
     client_note = models.TextField(null=True, blank=True)
     is_winner = models.BooleanField(default=False)
 
+    objects = ProposalQuerySet.as_manager()
+
     class Meta:
         db_table = 'proposals_proposal'
         unique_together = ('competition', 'freelancer')
         ordering = ['-created_at']
+        indexes = [
+            # Blind review list and participant fan-out exclude WITHDRAWN
+            models.Index(fields=['competition', 'status'], name='proposal_comp_status_idx'),
+            # Freelancer's own proposals, newest first
+            models.Index(fields=['freelancer', '-created_at'], name='proposal_freelancer_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.freelancer.username} for {self.competition.title}"
 
+    def withdraw(self):
+        """Mark the proposal as WITHDRAWN and release its competition slot."""
+        from competitions.models import CompetitionStats
+
+        now = timezone.now()
+        with transaction.atomic():
+            updated = Proposal.objects.filter(pk=self.pk).exclude(
+                status='WITHDRAWN'
+            ).update(status='WITHDRAWN', updated_at=now)
+            if updated:
+                CompetitionStats.adjust(self.competition_id, active_proposal_count=-1)
+        self.status = 'WITHDRAWN'
+        self.updated_at = now
+        return bool(updated)
+
 
 class ProposalAttachment(models.Model):
     """File attachments for proposals."""
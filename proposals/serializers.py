@@ -1,6 +1,10 @@
 import os
 from rest_framework import serializers
+from django.db import transaction
 from django.utils import timezone
+from competitions.models import Competition, CompetitionStats
+from freelance_arena.exceptions import Conflict
+from freelance_arena.mixins import EagerLoadingSerializerMixin
 from .models import Proposal, ProposalAttachment, ProposalRevision
 
 
@@ -59,9 +63,17 @@ class ProposalCreateSerializer(serializers.ModelSerializer):
         return value
 
     def validate(self, data):
-        request = self.context.get('request')
-        competition = data.get('competition')
+        # Unlocked pre-check: rejects the common cases without taking the lock
+        self.check_admission(data.get('competition'), self.context['request'].user)
+        return data
 
+    @staticmethod
+    def check_admission(competition, user, stats=None):
+        """
+        Raise if `user` may not submit to `competition`. A full competition
+        raises Conflict (409) rather than a validation error, since the
+        same request may succeed once a slot is freed.
+        """
         # Check competition is OPEN
         if competition.status != 'OPEN':
             raise serializers.ValidationError(
@@ -76,7 +88,7 @@ class ProposalCreateSerializer(serializers.ModelSerializer):
 
         # Check unique proposal
         if Proposal.objects.filter(
-            competition=competition, freelancer=request.user
+            competition=competition, freelancer=user
         ).exists():
             raise serializers.ValidationError(
                 {'competition': 'You have already submitted a proposal for this competition.'}
@@ -84,35 +96,51 @@ class ProposalCreateSerializer(serializers.ModelSerializer):
 
         # Check max_proposals limit
         if competition.max_proposals is not None:
-            current_count = competition.proposals.exclude(status='WITHDRAWN').count()
-            if current_count >= competition.max_proposals:
-                raise serializers.ValidationError(
-                    {'competition': 'Maximum number of proposals has been reached.'}
-                )
-
-        return data
+            stats = stats or CompetitionStats.for_competition(competition)
+            if stats.active_proposal_count >= competition.max_proposals:
+                raise Conflict('Maximum number of proposals has been reached.')
 
     def create(self, validated_data):
         attachments_data = validated_data.pop('attachments', [])
-        validated_data['freelancer'] = self.context['request'].user
-        proposal = Proposal.objects.create(**validated_data)
-
-        for attachment_data in attachments_data:
-            file_obj = attachment_data['file']
-            ProposalAttachment.objects.create(
-                proposal=proposal,
-                file=file_obj,
-                original_filename=file_obj.name,
-                file_size=file_obj.size,
-                file_type=os.path.splitext(file_obj.name)[1].lower().lstrip('.'),
-                description=attachment_data.get('description', ''),
+        user = self.context['request'].user
+        validated_data['freelancer'] = user
+
+        # Proposal insert and CompetitionStats increment commit together
+        with transaction.atomic():
+            # Lock the competition so concurrent submissions take slots one
+            # at a time, then re-check against the locked counters
+            competition = Competition.objects.select_for_update().get(
+                pk=validated_data['competition'].pk
             )
+            stats = None
+            if competition.max_proposals is not None:
+                stats = CompetitionStats.objects.select_for_update().filter(
+                    competition=competition
+                ).first()
+            self.check_admission(competition, user, stats)
+            validated_data['competition'] = competition
+
+            proposal = Proposal.objects.create(**validated_data)
+
+            for attachment_data in attachments_data:
+                file_obj = attachment_data['file']
+                ProposalAttachment.objects.create(
+                    proposal=proposal,
+                    file=file_obj,
+                    original_filename=file_obj.name,
+                    file_size=file_obj.size,
+                    file_type=os.path.splitext(file_obj.name)[1].lower().lstrip('.'),
+                    description=attachment_data.get('description', ''),
+                )
 
         return proposal
 
 
-class ProposalDetailSerializer(serializers.ModelSerializer):
+class ProposalDetailSerializer(EagerLoadingSerializerMixin, serializers.ModelSerializer):
     """Full detail serializer for proposal."""
+    select_related_fields = ('freelancer', 'competition')
+    prefetch_related_fields = ('attachments',)
+
     attachments = ProposalAttachmentSerializer(many=True, read_only=True)
     freelancer_username = serializers.CharField(source='freelancer.username', read_only=True)
     competition_title = serializers.CharField(source='competition.title', read_only=True)
@@ -128,8 +156,10 @@ class ProposalDetailSerializer(serializers.ModelSerializer):
         ]
 
 
-class ProposalListSerializer(serializers.ModelSerializer):
+class ProposalListSerializer(EagerLoadingSerializerMixin, serializers.ModelSerializer):
     """Lightweight list serializer for freelancer's own proposals."""
+    select_related_fields = ('competition',)
+
     competition_title = serializers.CharField(source='competition.title', read_only=True)
 
     class Meta:
@@ -1,5 +1,7 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from competitions.models import CompetitionStats
+from freelance_arena.response_cache import invalidate_responses
 from .models import Proposal
 
 
@@ -7,6 +9,13 @@ from .models import Proposal
 def proposal_post_save(sender, instance, created, **kwargs):
     """Handle proposal creation and score update notifications."""
     if created:
+        CompetitionStats.adjust(
+            instance.competition_id,
+            proposal_count=1,
+            active_proposal_count=0 if instance.status == 'WITHDRAWN' else 1,
+        )
+        # proposal_count is part of the public competition responses
+        invalidate_responses('competitions', f'competition:{instance.competition_id}')
         from notifications.utils import NotificationService
         NotificationService.notify_proposal_received(instance.competition, instance)
 
@@ -15,3 +24,14 @@ def proposal_post_save(sender, instance, created, **kwargs):
     if update_fields and 'client_score' in update_fields and instance.client_score:
         from notifications.utils import NotificationService
         NotificationService.notify_proposal_scored(instance)
+
+
+@receiver(post_delete, sender=Proposal)
+def proposal_post_delete(sender, instance, **kwargs):
+    """Uncount a removed proposal."""
+    CompetitionStats.adjust(
+        instance.competition_id,
+        proposal_count=-1,
+        active_proposal_count=0 if instance.status == 'WITHDRAWN' else -1,
+    )
+    invalidate_responses('competitions', f'competition:{instance.competition_id}')
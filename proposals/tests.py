@@ -1,14 +1,16 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.utils import timezone
 from datetime import timedelta
 from accounts.models import User
-from competitions.models import Competition
+from freelance_arena.testing import QueryCountAssertionsMixin, sync_last_seen
+from competitions.models import Competition, CompetitionStats
 from .models import Proposal
 
 
-class ProposalsTestCase(TestCase):
+@sync_last_seen
+class ProposalsTestCase(QueryCountAssertionsMixin, TestCase):
     """Test cases for the proposals app."""
 
     def setUp(self):
@@ -155,3 +157,238 @@ class ProposalsTestCase(TestCase):
         proposal.refresh_from_db()
         self.assertTrue(proposal.is_winner)
         self.assertEqual(proposal.status, 'ACCEPTED')
+
+    def test_my_proposals_query_count_is_constant(self):
+        """Test that listing own proposals does not fetch each competition separately."""
+        self.client_api.force_authenticate(user=self.freelancer_user)
+
+        def make_proposal(index):
+            competition = Competition.objects.create(
+                client=self.client_user,
+                title=f'Competition {index}',
+                description='Test',
+                requirements='Test',
+                budget=1000,
+                deadline=timezone.now() + timedelta(days=30),
+                submission_deadline=timezone.now() + timedelta(days=20),
+                category='Web Development',
+                status='OPEN',
+            )
+            Proposal.objects.create(
+                competition=competition,
+                freelancer=self.freelancer_user,
+                title=f'Proposal {index}',
+                description='Test',
+                proposed_budget=800,
+                estimated_duration=10,
+            )
+
+        self.assertConstantQueryCount(
+            self.client_api, '/api/proposals/mine/', make_proposal,
+        )
+
+    def test_withdraw_releases_max_proposals_slot(self):
+        """Test that max_proposals is enforced from counters and withdrawal frees a slot."""
+        self.competition.max_proposals = 1
+        self.competition.save()
+
+        self.client_api.force_authenticate(user=self.freelancer_user)
+        response = self.client_api.post(
+            '/api/proposals/submit/', self.proposal_data, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        proposal_id = response.data['data']['id']
+
+        self.client_api.force_authenticate(user=self.freelancer_user2)
+        response = self.client_api.post(
+            '/api/proposals/submit/', self.proposal_data, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        self.client_api.force_authenticate(user=self.freelancer_user)
+        self.client_api.post(f'/api/proposals/{proposal_id}/withdraw/')
+        stats = CompetitionStats.objects.get(competition=self.competition)
+        self.assertEqual(stats.active_proposal_count, 0)
+
+        self.client_api.force_authenticate(user=self.freelancer_user2)
+        response = self.client_api.post(
+            '/api/proposals/submit/', self.proposal_data, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_detail_conditional_get(self):
+        """Test that proposal and competition detail answer If-None-Match with 304 after the access check."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        proposal = Proposal.objects.create(
+            competition=self.competition,
+            freelancer=self.freelancer_user,
+            title='Conditional',
+            description='Test',
+            proposed_budget=800,
+            estimated_duration=14,
+        )
+        url = f'/api/proposals/{proposal.id}/'
+        self.client_api.force_authenticate(user=self.freelancer_user)
+        response = self.client_api.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        # Unchanged: a single version query, no serialization
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client_api.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        selects = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), 1)
+
+        # Other users are refused even with a matching ETag
+        self.client_api.force_authenticate(user=self.freelancer_user2)
+        response = self.client_api.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        # The competition owner scoring the proposal changes the version
+        self.client_api.force_authenticate(user=self.client_user)
+        self.assertEqual(
+            self.client_api.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+        proposal.client_score = 8
+        proposal.save(update_fields=['client_score', 'updated_at'])
+        response = self.client_api.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['client_score'], 8)
+
+        # Competition detail: new proposals change the version through the counter
+        url = f'/api/competitions/{self.competition.id}/'
+        etag = self.client_api.get(url)['ETag']
+        self.assertEqual(
+            self.client_api.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+        Proposal.objects.create(
+            competition=self.competition,
+            freelancer=self.freelancer_user2,
+            title='Second',
+            description='Test',
+            proposed_budget=700,
+            estimated_duration=10,
+        )
+        response = self.client_api.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['proposal_count'], 2)
+
+    def test_select_winner_is_atomic_and_idempotent(self):
+        """Test that winner selection writes everything once and a repeat is refused."""
+        from notifications.models import NotificationEvent
+        from payments.models import PaymentRecord
+
+        proposals = [
+            Proposal.objects.create(
+                competition=self.competition, freelancer=freelancer,
+                title=f'Proposal {index}', description='Test',
+                proposed_budget=800, estimated_duration=10,
+            )
+            for index, freelancer in enumerate([self.freelancer_user, self.freelancer_user2])
+        ]
+        withdrawn_by = User.objects.create_user(
+            email='withdrawn@test.com', username='withdrawn', password='testpass123', role='FREELANCER',
+        )
+        withdrawn = Proposal.objects.create(
+            competition=self.competition, freelancer=withdrawn_by, title='Gone',
+            description='Test', proposed_budget=500, estimated_duration=3,
+        )
+        withdrawn.withdraw()
+        self.competition.status = 'REVIEW'
+        self.competition.save()
+        NotificationEvent.objects.all().delete()
+
+        self.client_api.force_authenticate(user=self.client_user)
+        url = f'/api/competitions/{self.competition.id}/select-winner/'
+        response = self.client_api.post(url, {'proposal_id': str(proposals[0].id)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['winner'], self.freelancer_user.id)
+
+        # A second click finds the competition CLOSED instead of failing on the payment
+        response = self.client_api.post(url, {'proposal_id': str(proposals[1].id)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(PaymentRecord.objects.filter(competition=self.competition).count(), 1)
+        statuses = dict(
+            Proposal.objects.filter(competition=self.competition).values_list('id', 'status')
+        )
+        self.assertEqual(statuses, {
+            proposals[0].id: 'ACCEPTED', proposals[1].id: 'REJECTED', withdrawn.id: 'WITHDRAWN',
+        })
+        self.assertEqual(
+            sorted(NotificationEvent.objects.values_list('event_type', flat=True)),
+            ['competition_closed', 'winner_selected'],
+        )
+
+
+@skipUnlessDBFeature('has_select_for_update')
+@sync_last_seen
+class ProposalAdmissionConcurrencyTestCase(TransactionTestCase):
+    """
+    Concurrent submissions against a real database (MySQL). Each thread
+    uses its own connection, so the row locks are actually contended.
+    Skipped on SQLite, which has no SELECT ... FOR UPDATE.
+    """
+
+    def test_concurrent_submissions_respect_max_proposals(self):
+        """Test that simultaneous submissions never exceed max_proposals."""
+        import threading
+        from django.db import connection
+
+        owner = User.objects.create_user(
+            email='owner@test.com', username='owner', password='testpass123', role='CLIENT',
+        )
+        competition = Competition.objects.create(
+            client=owner,
+            title='Race',
+            description='Test',
+            requirements='Test',
+            budget=1000,
+            deadline=timezone.now() + timedelta(days=30),
+            submission_deadline=timezone.now() + timedelta(days=20),
+            category='Web Development',
+            status='OPEN',
+            max_proposals=3,
+        )
+        freelancers = [
+            User.objects.create_user(
+                email=f'racer{index}@test.com', username=f'racer{index}',
+                password='testpass123', role='FREELANCER',
+            )
+            for index in range(8)
+        ]
+
+        barrier = threading.Barrier(len(freelancers))
+        codes = []
+
+        def submit(user):
+            try:
+                api = APIClient()
+                api.force_authenticate(user=user)
+                barrier.wait()
+                response = api.post('/api/proposals/submit/', {
+                    'competition': str(competition.id),
+                    'title': 'Racing',
+                    'description': 'Test',
+                    'proposed_budget': '800.00',
+                    'estimated_duration': 14,
+                }, format='json')
+                codes.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=submit, args=(user,)) for user in freelancers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(codes.count(status.HTTP_201_CREATED), 3)
+        self.assertEqual(codes.count(status.HTTP_409_CONFLICT), 5)
+        self.assertEqual(Proposal.objects.filter(competition=competition).count(), 3)
+        self.assertEqual(CompetitionStats.objects.get(competition=competition).active_proposal_count, 3)
@@ -1,7 +1,11 @@
 from rest_framework import generics, status, filters
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from freelance_arena.mixins import EagerLoadingViewMixin
+from freelance_arena.response_cache import not_modified_response, version_etag
 from freelance_arena.utils import success_response
 from accounts.permissions import IsFreelancer, IsClient
 from .models import Proposal, ProposalAttachment
@@ -33,7 +37,7 @@ class ProposalCreateView(APIView):
         )
 
 
-class MyProposalsView(generics.ListAPIView):
+class MyProposalsView(EagerLoadingViewMixin, generics.ListAPIView):
     """GET - List own proposals. FREELANCER only."""
     serializer_class = ProposalListSerializer
     permission_classes = [IsAuthenticated, IsFreelancer]
@@ -61,19 +65,33 @@ class ProposalDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, proposal_id):
-        proposal = get_object_or_404(Proposal, id=proposal_id)
+        version = Proposal.objects.detail_version(proposal_id)
+        if version is None:
+            raise Http404
 
         # Access control: freelancer owner or competition client
-        if (proposal.freelancer != request.user and
-                proposal.competition.client != request.user and
+        if (version['freelancer_id'] != request.user.id and
+                version['competition__client_id'] != request.user.id and
                 request.user.role != 'ADMIN'):
             return success_response(
                 data=None, message='You do not have permission to view this proposal.',
                 status_code=status.HTTP_403_FORBIDDEN,
             )
 
+        # Unchanged since the client's copy: skip loading and serializing
+        etag = version_etag(version)
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        proposal = get_object_or_404(
+            ProposalDetailSerializer.setup_eager_loading(Proposal.objects),
+            id=proposal_id,
+        )
         serializer = ProposalDetailSerializer(proposal)
-        return success_response(data=serializer.data, message='Proposal detail retrieved.')
+        response = success_response(data=serializer.data, message='Proposal detail retrieved.')
+        response['ETag'] = etag
+        return response
 
     def put(self, request, proposal_id):
         proposal = get_object_or_404(Proposal, id=proposal_id)
@@ -110,8 +128,7 @@ class ProposalDetailView(APIView):
                 status_code=status.HTTP_403_FORBIDDEN,
             )
 
-        proposal.status = 'WITHDRAWN'
-        proposal.save(update_fields=['status', 'updated_at'])
+        proposal.withdraw()
         return success_response(message='Proposal withdrawn.')
 
 
@@ -211,7 +228,9 @@ class ScoreProposalView(APIView):
 
         proposal.client_score = serializer.validated_data['client_score']
         proposal.client_note = serializer.validated_data.get('client_note', '')
-        proposal.save(update_fields=['client_score', 'client_note', 'updated_at'])
+        # The scoring signal queues a notification in the same transaction
+        with transaction.atomic():
+            proposal.save(update_fields=['client_score', 'client_note', 'updated_at'])
 
         return success_response(
             data=ClientProposalListSerializer(proposal).data,
@@ -237,6 +256,5 @@ class WithdrawProposalView(APIView):
         )
         serializer.is_valid(raise_exception=True)
 
-        proposal.status = 'WITHDRAWN'
-        proposal.save(update_fields=['status', 'updated_at'])
+        proposal.withdraw()
         return success_response(message='Proposal withdrawn.')